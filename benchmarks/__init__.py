@@ -0,0 +1,3 @@
+"""
+SIC-SIT Benchmarks
+"""
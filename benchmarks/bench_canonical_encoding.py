@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+標準化編碼端到端基準測試
+
+比較 FW → PKT → SIG → compliance 管線在有無 encoding_scope() 時的
+序列化次數與耗時
+
+用法:
+    python -m benchmarks.bench_canonical_encoding
+"""
+
+import time
+
+from core import canonical
+from core.canonical import encoding_scope
+from enterprise.semantic_compliance import SemanticComplianceEngine
+from security.semantic_signature import SemanticIntegrity
+from validators.sic_fw import SIC_FW
+from validators.sic_pkt import SIC_PKT_Handler
+
+
+def _payload(fields: int) -> dict:
+    return {
+        "intent": "查詢用戶資料並生成季度合規摘要",
+        "requester": {"id": "user-123", "role": "analyst"},
+        "constraints": {"max_tokens": 1000},
+        "context": {f"field_{i}": f"數值 {i} — retention policy review" for i in range(fields)},
+    }
+
+
+def _pipeline(fw, handler, integrity, compliance, payload):
+    fw.evaluate(payload)
+    pkt = handler.create_packet(payload, dst_model="model-b")
+    handler.validate_packet(pkt)
+    integrity.sign(payload, model_source="model-a")
+    compliance.check_compliance(payload, intent="查詢")
+    compliance.track_lineage(payload, source_model="model-a", intent="查詢")
+
+
+def _run(fields: int, rounds: int, scoped: bool):
+    fw = SIC_FW()
+    handler = SIC_PKT_Handler("model-a")
+    # 關閉語義雜湊快取，避免掩蓋重複序列化的成本
+    integrity = SemanticIntegrity(secret_key="bench-key", cache_bytes=0)
+    compliance = SemanticComplianceEngine()
+    payloads = [_payload(fields) for _ in range(rounds)]
+
+    canonical.reset_stats()
+    start = time.perf_counter()
+    for payload in payloads:
+        if scoped:
+            with encoding_scope():
+                _pipeline(fw, handler, integrity, compliance, payload)
+        else:
+            _pipeline(fw, handler, integrity, compliance, payload)
+    elapsed = (time.perf_counter() - start) / rounds * 1e6
+    return canonical.stats().encodes / rounds, elapsed
+
+
+def main():
+    rounds = 300
+    print(f"{'fields':>8}{'bytes':>9}{'enc/req':>9}{'scoped':>9}{'µs/req':>10}{'scoped µs':>11}{'saved':>8}")
+    for fields in (4, 64, 512):
+        size = canonical.encode(_payload(fields)).size
+        encodes, elapsed = _run(fields, rounds, scoped=False)
+        scoped_encodes, scoped_elapsed = _run(fields, rounds, scoped=True)
+        print(f"{fields:>8}{size:>9}{encodes:>9.1f}{scoped_encodes:>9.1f}"
+              f"{elapsed:>10.1f}{scoped_elapsed:>11.1f}{1 - scoped_elapsed / elapsed:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
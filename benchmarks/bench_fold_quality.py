@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+折疊品質評估基準測試
+
+對串流語料（模擬 1536 維 embedding，具衰減頻譜）以 SemanticFolder.evaluate
+掃描多個目標維度，報告成對餘弦失真分位數與評估成本，
+示範以失真預算決定目標維度
+
+用法:
+    python -m benchmarks.bench_fold_quality [n]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+
+
+ORIGINAL_DIM = 1536
+
+
+def _corpus(n: int, seed: int = 0) -> np.ndarray:
+    """模擬 embedding（低秩語義 + 噪聲）"""
+    rng = np.random.default_rng(seed)
+    mix = np.random.default_rng(1).standard_normal((128, ORIGINAL_DIM)).astype(np.float32)
+    scales = np.linspace(2.0, 0.2, 128, dtype=np.float32)
+    latent = rng.standard_normal((n, 128), dtype=np.float32) * scales
+    return latent @ mix + 0.5 * rng.standard_normal((n, ORIGINAL_DIM), dtype=np.float32)
+
+
+def _stream(pool: np.ndarray, n: int, chunk: int = 20000):
+    """循環讀取語料池模擬串流（避免生成成本計入評估時間）"""
+    for start in range(0, n, chunk):
+        offset = start % len(pool)
+        yield pool[offset:offset + min(chunk, n - start, len(pool) - offset)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    budget = 0.05   # 可接受的 p99 |Δcos|
+    pool = _corpus(100_000)
+    train = _corpus(50_000, seed=3)
+
+    print(f"{n:,} streamed × {ORIGINAL_DIM}, 2048-vector reservoir, 10,000 pairs")
+    print(f"{'method':<20}{'dim':>5}{'mean':>8}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}"
+          f"{'pearson':>9}{'eval ms':>9}")
+    for method in (FoldingMethod.RANDOM_PROJECTION, FoldingMethod.VERY_SPARSE_PROJECTION, FoldingMethod.PCA):
+        chosen = None
+        for dim in (32, 64, 128, 256, 512):
+            folder = SemanticFolder(target_dim=dim, method=method)
+            if method == FoldingMethod.PCA:
+                folder.fit(train)
+            start = time.perf_counter()
+            report = folder.evaluate(_stream(pool, n))
+            elapsed = time.perf_counter() - start
+            q = report.quantiles
+            print(f"{method.value:<20}{dim:>5}{report.mean_abs_error:>8.4f}{q['p50']:>8.4f}"
+                  f"{q['p90']:>8.4f}{q['p99']:>8.4f}{report.max_abs_error:>8.4f}"
+                  f"{report.correlation:>9.4f}{elapsed * 1e3:>9.0f}")
+            if chosen is None and q["p99"] <= budget:
+                chosen = dim
+        print(f"  → smallest dim with p99 ≤ {budget}: {chosen or '> 512'}\n")
+
+
+if __name__ == "__main__":
+    main()
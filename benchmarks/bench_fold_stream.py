@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+串流折疊基準測試
+
+比較 fold_batch（累積全部結果）與 fold_stream + ManifoldStats（固定記憶體）
+的吞吐與峰值記憶體，並驗證 4 個分片的統計合併後與整體一致
+
+用法:
+    python -m benchmarks.bench_fold_stream [n]
+"""
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from folding.manifold import ManifoldStats
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+
+
+ORIGINAL_DIM = 1536
+
+
+def _stream(pool: np.ndarray, n: int, chunk: int = 8192):
+    """循環讀取語料池模擬串流"""
+    for start in range(0, n, chunk):
+        offset = start % len(pool)
+        yield pool[offset:offset + min(chunk, n - start, len(pool) - offset)]
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    pool = np.random.default_rng(0).standard_normal((32_768, ORIGINAL_DIM), dtype=np.float32)
+    folder = SemanticFolder(target_dim=256, method=FoldingMethod.RANDOM_PROJECTION)
+    folder.fold_batch(pool[:10])   # 預先建立投影矩陣
+
+    (batch, manifold), elapsed, peak = _measure(lambda: folder.fold_batch(_stream(pool, n)))
+    print(f"{n:,} × {ORIGINAL_DIM} → 256")
+    print(f"fold_batch            {n / elapsed:>10,.0f} vec/s  peak {peak:>8.1f} MB")
+    del batch
+
+    def consume():
+        stats = ManifoldStats()
+        for _ in folder.fold_stream(_stream(pool, n), stats):
+            pass   # 實務上此處寫入 FoldedVectorStore
+        return stats
+
+    stats, elapsed, peak = _measure(consume)
+    print(f"fold_stream + stats   {n / elapsed:>10,.0f} vec/s  peak {peak:>8.1f} MB")
+
+    # 分片合併
+    shard_rows = n // 4
+    merged = ManifoldStats()
+    for shard in range(4):
+        part = ManifoldStats()
+        for _ in folder.fold_stream(_stream(pool[shard * 8192:], shard_rows), part):
+            pass
+        merged.merge(ManifoldStats.from_dict(part.to_dict()))
+    streamed = stats.manifold(SemanticFolder.S_STAR)
+    print(f"\nexact radius (fold_batch) {manifold.radius:.4f}, streaming bound {streamed.radius:.4f}")
+    print(f"center max |Δ| stream vs batch: "
+          f"{np.abs(np.asarray(streamed.center) - np.asarray(manifold.center)).max():.2e}")
+    print(f"4-shard merge: count {merged.count:,}, radius bound {merged.radius:.4f}, "
+          f"mean squared radius {merged.mean_squared_radius:.4f} vs {stats.mean_squared_radius:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+IVF 索引基準測試
+
+以群聚 embedding 折疊（1536 → 256）後存入 FoldedVectorStore，
+比較不同 nprobe 的 recall@10 與查詢延遲（相對暴力掃描）
+
+用法:
+    python -m benchmarks.bench_ivf_index [n]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from folding.ivf_index import IVFIndex
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+from folding.vector_store import FoldedVectorStore
+
+
+def _chunks(n: int, dim: int, clusters: int, chunk: int = 20000):
+    """逐塊產生群聚分布的模擬 embedding"""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    for start in range(0, n, chunk):
+        rows = min(chunk, n - start)
+        labels = rng.integers(0, clusters, rows)
+        yield centers[labels] + 0.9 * rng.standard_normal((rows, dim), dtype=np.float32)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    original_dim, target_dim, queries, k = 1536, 256, 200, 10
+    nlist = int(4 * np.sqrt(n))
+
+    folder = SemanticFolder(target_dim=target_dim, method=FoldingMethod.RANDOM_PROJECTION)
+    batch, _ = folder.fold_batch(_chunks(n, original_dim, clusters=200))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FoldedVectorStore.create(os.path.join(tmp, "store"), target_dim)
+        store.append(batch)
+
+        index = IVFIndex(store, nlist=nlist)
+        start = time.perf_counter()
+        index.train(iterations=15)
+        index.sync()
+        build = time.perf_counter() - start
+
+        rng = np.random.default_rng(5)
+        query_rows = rng.integers(0, n, queries)
+        # 查詢為加噪的已存向量
+        query_vecs = batch.vectors[query_rows] + 0.02 * rng.standard_normal((queries, target_dim))
+
+        start = time.perf_counter()
+        exact = [set(store.search_rows(q, k=k)[0].tolist()) for q in query_vecs]
+        brute_ms = (time.perf_counter() - start) / queries * 1e3
+
+        sizes = index.list_sizes()
+        print(f"{n:,} × {target_dim}, nlist={nlist}, build {build:.1f}s, "
+              f"list size mean {sizes.mean():.0f} / max {sizes.max()}")
+        print(f"brute force: {brute_ms:.2f} ms/query\n")
+        print(f"{'nprobe':>7}{'recall@10':>11}{'ms/query':>10}{'speedup':>9}")
+        for nprobe in (1, 2, 4, 8, 16, 32, 64):
+            start = time.perf_counter()
+            found = [set(index.search_rows(q, k=k, nprobe=nprobe)[0].tolist()) for q in query_vecs]
+            ms = (time.perf_counter() - start) / queries * 1e3
+            recall = np.mean([len(f & e) / k for f, e in zip(found, exact)])
+            print(f"{nprobe:>7}{recall:>11.3f}{ms:>10.2f}{brute_ms / ms:>8.1f}x")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+乘積量化基準測試
+
+以群聚 embedding 折疊（1536 → 256）後，比較 float32 / INT8 / BINARY 與
+不同子空間數 M 的 PQ 儲存：每向量位元組、壓縮比、編碼吞吐、掃描延遲，
+以及相對 float32 精確結果的 recall@10 與 10@100（真 top-10 落在前 100 的比例）
+
+用法:
+    python -m benchmarks.bench_product_quantization [n]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from folding.product_quantization import ProductQuantizer
+from folding.quantization import QuantizationMode
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+from folding.vector_store import FoldedVectorStore
+
+
+def _chunks(n: int, dim: int, clusters: int, seed: int, chunk: int = 20000):
+    """逐塊產生群聚分布的模擬 embedding"""
+    rng = np.random.default_rng(seed)
+    centers = np.random.default_rng(0).standard_normal((clusters, dim)).astype(np.float32)
+    for start in range(0, n, chunk):
+        rows = min(chunk, n - start)
+        labels = rng.integers(0, clusters, rows)
+        yield centers[labels] + 0.9 * rng.standard_normal((rows, dim), dtype=np.float32)
+
+
+def _recall(store: FoldedVectorStore, queries: np.ndarray, exact, k: int = 10):
+    hits_k = hits_100 = 0
+    start = time.perf_counter()
+    for q, truth in zip(queries, exact):
+        rows, _ = store.search_rows(q, k=100)
+        hits_k += len(truth & set(rows[:k].tolist()))
+        hits_100 += len(truth & set(rows.tolist()))
+    ms = (time.perf_counter() - start) / len(queries) * 1e3
+    return hits_k / (k * len(queries)), hits_100 / (k * len(queries)), ms
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    original_dim, dim, clusters, k = 1536, 256, 200, 10
+
+    folder = SemanticFolder(target_dim=dim, method=FoldingMethod.RANDOM_PROJECTION)
+    batch, _ = folder.fold_batch(_chunks(n, original_dim, clusters, seed=1))
+    queries, _ = folder.fold_batch(_chunks(50, original_dim, clusters, seed=2))
+    queries = queries.vectors
+    exact = [set(np.argsort(-(batch.vectors @ q))[:k].tolist()) for q in queries]
+
+    print(f"{n:,} × {dim}, {len(queries)} held-out queries")
+    print(f"{'encoding':<12}{'B/vec':>7}{'ratio':>7}{'GB @1B':>8}{'encode vec/s':>14}"
+          f"{'scan ms':>9}{'recall@10':>11}{'10@100':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        configs = [("FLOAT32", None, None), ("INT8", QuantizationMode.INT8, None),
+                   ("BINARY", QuantizationMode.BINARY, None)]
+        for subspaces in (16, 32, 64):
+            pq = ProductQuantizer(dim, subspaces=subspaces)
+            start = time.perf_counter()
+            pq.train(batch.vectors[:25_000], iterations=15)
+            print(f"  (PQ M={subspaces} trained on 25,000 in {time.perf_counter() - start:.1f}s)")
+            configs.append((f"PQ M={subspaces}", None, pq))
+
+        for name, mode, pq in configs:
+            path = os.path.join(tmp, name.replace(" ", "").replace("=", ""))
+            with FoldedVectorStore.create(path, dim, mode=mode, quantizer=pq) as store:
+                start = time.perf_counter()
+                store.append(batch)
+                encode_rate = n / (time.perf_counter() - start)
+                bytes_per_vec = store.stride
+            with FoldedVectorStore(path) as store:
+                recall_k, recall_100, ms = _recall(store, queries, exact, k)
+            print(f"{name:<12}{bytes_per_vec:>7}{dim * 4 / bytes_per_vec:>6.0f}x"
+                  f"{bytes_per_vec:>8.0f}{encode_rate:>14,.0f}{ms:>9.1f}{recall_k:>11.3f}{recall_100:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
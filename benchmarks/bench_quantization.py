@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+折疊向量量化基準測試
+
+比較 FLOAT16 / INT8 / BINARY 量化的記憶體、相似度誤差（相對 float32）、
+top-10 召回率與批次相似度計算速度
+
+用法:
+    python -m benchmarks.bench_quantization
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from folding.quantization import QuantizationMode
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+
+
+def _corpus(n: int, dim: int, clusters: int = 50) -> np.ndarray:
+    """群聚分布的模擬 embedding"""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((clusters, dim))
+    labels = rng.integers(0, clusters, n)
+    return (centers[labels] + 0.8 * rng.standard_normal((n, dim))).astype(np.float32)
+
+
+def _boxed_list_bytes(values: list) -> int:
+    """Python list[float] 的實際記憶體"""
+    return sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+
+
+def main():
+    original_dim, target_dim, n, queries = 1536, 256, 20000, 50
+    corpus = _corpus(n, original_dim)
+
+    for method in (FoldingMethod.RANDOM_PROJECTION, FoldingMethod.LOCALITY_SENSITIVE):
+        folder = SemanticFolder(target_dim=target_dim, method=method)
+        batch, _ = folder.fold_batch(corpus)
+        exact = batch.vectors[:queries] @ batch.vectors.T
+        exact_top = np.argsort(-exact, axis=1)[:, :10]
+        list_bytes = _boxed_list_bytes(batch[0].vector)
+
+        print(f"\n{method.value} ({n} × {target_dim}); boxed list: {list_bytes} B/vec, "
+              f"float32: {batch.vectors.nbytes // n} B/vec")
+        print(f"{'mode':<10}{'B/vec':>7}{'vs list':>9}{'vs f32':>8}{'mean |Δ|':>10}"
+              f"{'max |Δ|':>9}{'recall@10':>11}{'scan ms':>9}")
+        for mode in QuantizationMode:
+            quantized = folder.quantize(batch, mode)
+            per_vec = quantized.nbytes / n
+            start = time.perf_counter()
+            approx = np.stack([quantized.similarities(quantized[q]) for q in range(queries)])
+            scan_ms = (time.perf_counter() - start) / queries * 1e3
+
+            error = np.abs(approx - exact)
+            approx_top = np.argsort(-approx, axis=1)[:, :10]
+            recall = np.mean([
+                len(set(a) & set(e)) / 10 for a, e in zip(approx_top, exact_top)
+            ])
+            print(f"{mode.value:<10}{per_vec:>7.0f}{list_bytes / per_vec:>8.0f}x"
+                  f"{batch.vectors.nbytes / quantized.nbytes:>7.1f}x{error.mean():>10.4f}"
+                  f"{error.max():>9.4f}{recall:>11.2f}{scan_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+語義折疊基準測試
+
+比較 NumPy 投影引擎與原本的純 Python 迴圈（List[List[float]] 矩陣），
+以及批次折疊（單次 GEMM）與逐列折疊的吞吐量
+
+用法:
+    python -m benchmarks.bench_semantic_folding
+"""
+
+import time
+
+import numpy as np
+
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+
+
+def _timeit(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def _legacy_fold(projection, vector):
+    """原本的逐列內積"""
+    return [sum(v * p for v, p in zip(vector, row)) for row in projection]
+
+
+def _legacy_unfold(projection, folded, original_dim):
+    """原本的雙層迴圈反投影"""
+    restored = [0.0] * original_dim
+    for i in range(original_dim):
+        for j in range(len(folded)):
+            restored[i] += folded[j] * projection[j][i]
+    return restored
+
+
+def main():
+    original_dim, target_dim = 1536, 256
+    vector = np.random.default_rng(0).standard_normal(original_dim).tolist()
+
+    print(f"{'method':<20}{'fold µs':>12}")
+    for method in FoldingMethod:
+        folder = SemanticFolder(target_dim=target_dim, method=method)
+        folder.fold(vector)  # 預先生成矩陣
+        print(f"{method.value:<20}{_timeit(lambda: folder.fold(vector), 2000):>12.1f}")
+
+    folder = SemanticFolder(target_dim=target_dim, method=FoldingMethod.RANDOM_PROJECTION)
+    folded = folder.fold(vector)
+    legacy_matrix = folder._get_projection_matrix(original_dim).tolist()
+
+    numpy_fold = _timeit(lambda: folder.fold(vector), 2000)
+    legacy_fold = _timeit(lambda: _legacy_fold(legacy_matrix, vector), 5)
+    numpy_unfold = _timeit(lambda: folder.unfold(folded), 2000)
+    legacy_unfold = _timeit(lambda: _legacy_unfold(legacy_matrix, folded.vector, original_dim), 2)
+
+    print(f"\n{original_dim} → {target_dim} RANDOM_PROJECTION")
+    print(f"{'op':<10}{'python µs':>14}{'numpy µs':>12}{'speedup':>10}")
+    print(f"{'fold':<10}{legacy_fold:>14.0f}{numpy_fold:>12.1f}{legacy_fold / numpy_fold:>9.0f}x")
+    print(f"{'unfold':<10}{legacy_unfold:>14.0f}{numpy_unfold:>12.1f}{legacy_unfold / numpy_unfold:>9.0f}x")
+
+    # 批次折疊：逐列 fold 與單次 GEMM
+    n = 20000
+    corpus = np.random.default_rng(1).standard_normal((n, original_dim), dtype=np.float32)
+    rows = corpus[:2000].tolist()
+    start = time.perf_counter()
+    for row in rows:
+        folder.fold(row)
+    per_row = (time.perf_counter() - start) / len(rows)
+    start = time.perf_counter()
+    batch, _ = folder.fold_batch(corpus)
+    gemm = (time.perf_counter() - start) / n
+
+    print(f"\nfold_batch ({n} × {original_dim})")
+    print(f"{'path':<10}{'vec/s':>14}")
+    print(f"{'per-row':<10}{1 / per_row:>14,.0f}")
+    print(f"{'GEMM':<10}{1 / gemm:>14,.0f}   ({per_row / gemm:.0f}x, {batch.vectors.nbytes / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+語義雜湊折疊基準測試
+
+比較舊版語義雜湊（逐值格式化 → SHA-256 → 32 位元組循環填滿目標維度）
+與有號特徵雜湊（各雜湊族）、隨機投影（1536 → 256）：
+
+- 折疊吞吐
+- 相異輸出維度數（舊版最多 32 個）
+- 局部性：近似重複（加 10% 噪聲）折疊後的平均餘弦
+- 成對餘弦失真與 Pearson 相關
+- 相對原始空間 top-10 的 recall@10
+
+用法:
+    python -m benchmarks.bench_semantic_hash [n]
+"""
+
+import hashlib
+import sys
+import time
+
+import numpy as np
+
+from folding.feature_hashing import HashFamily
+from folding.quality import distortion_report
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+
+
+ORIGINAL_DIM = 1536
+TARGET_DIM = 256
+
+
+def _legacy_semantic_hash(matrix: np.ndarray) -> np.ndarray:
+    """舊版 _semantic_hash_fold（逐列，含正規化）"""
+    rows = []
+    for vector in matrix.tolist():
+        vec_str = ','.join(f"{v:.6f}" for v in vector)
+        hash_bytes = np.frombuffer(hashlib.sha256(vec_str.encode()).digest(), dtype=np.uint8)
+        folded = (np.resize(hash_bytes, TARGET_DIM).astype(np.float32) - 128) / 128.0
+        rows.append(folded / max(np.linalg.norm(folded), 1e-10))
+    return np.array(rows, dtype=np.float32)
+
+
+def _corpus(n: int, seed: int = 0) -> np.ndarray:
+    """模擬 embedding（低秩語義 + 噪聲）"""
+    rng = np.random.default_rng(seed)
+    mix = np.random.default_rng(1).standard_normal((128, ORIGINAL_DIM)).astype(np.float32)
+    scales = np.linspace(2.0, 0.2, 128, dtype=np.float32)
+    latent = rng.standard_normal((n, 128), dtype=np.float32) * scales
+    return latent @ mix + 0.5 * rng.standard_normal((n, ORIGINAL_DIM), dtype=np.float32)
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def _recall(original: np.ndarray, folded: np.ndarray, queries: int, k: int = 10) -> float:
+    hits = 0
+    for i in range(queries):
+        truth = np.argsort(-(original @ original[i]))[1:k + 1]
+        found = np.argsort(-(folded @ folded[i]))[1:k + 1]
+        hits += len(set(truth.tolist()) & set(found.tolist()))
+    return hits / (k * queries)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    corpus = _corpus(n)
+    near = corpus + 0.1 * np.linalg.norm(corpus, axis=1, keepdims=True) / np.sqrt(ORIGINAL_DIM) \
+        * np.random.default_rng(2).standard_normal(corpus.shape, dtype=np.float32)
+    unit = _unit(corpus)
+    legacy_rows = min(n, 2000)   # 舊版太慢，只取部分估算吞吐
+
+    print(f"{n:,} × {ORIGINAL_DIM} → {TARGET_DIM}")
+    print(f"{'method':<24}{'vec/s':>12}{'distinct':>10}{'near cos':>10}{'mean |Δ|':>10}"
+          f"{'pearson':>9}{'recall@10':>11}")
+
+    start = time.perf_counter()
+    legacy = _legacy_semantic_hash(corpus[:legacy_rows])
+    rate = legacy_rows / (time.perf_counter() - start)
+    legacy_near = _legacy_semantic_hash(near[:legacy_rows])
+    configs = [("legacy SHA-256", legacy, legacy_near, rate, unit[:legacy_rows])]
+
+    folders = [(f"feature hash {family.value}", SemanticFolder(
+        target_dim=TARGET_DIM, method=FoldingMethod.SEMANTIC_HASH, hash_family=family
+    )) for family in HashFamily]
+    folders.append(("random projection", SemanticFolder(
+        target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION
+    )))
+    for name, folder in folders:
+        folder.fold_batch(corpus[:10])   # 預先建立矩陣
+        start = time.perf_counter()
+        folded, _ = folder.fold_batch(corpus)
+        rate = n / (time.perf_counter() - start)
+        configs.append((name, folded.vectors, folder.fold_batch(near)[0].vectors, rate, unit))
+
+    for name, folded, folded_near, rate, original in configs:
+        distinct = len(np.unique(np.round(folded[0], 6)))
+        near_cos = float(np.einsum("ij,ij->i", folded, folded_near).mean())
+        report = distortion_report(original, folded, 10_000, np.random.default_rng(0))
+        recall = _recall(original, folded, queries=50)
+        print(f"{name:<24}{rate:>12,.0f}{distinct:>10}{near_cos:>10.3f}{report.mean_abs_error:>10.4f}"
+              f"{report.correlation:>9.3f}{recall:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
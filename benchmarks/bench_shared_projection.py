@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+投影矩陣共享基準測試
+
+模擬多行程部署：以 spawn 啟動 N 個 worker，各自建立 HYBRID 折疊器並折疊
+一個向量，比較三種取得矩陣的方式：
+
+- generate: 每個 worker 各自生成（原行為）
+- npy-mmap: matrix_dir 中的 <fold_key>.npy，mmap 唯讀載入
+- shared:   主行程 publish_shared()，worker 附掛共享記憶體
+
+回報每個 worker 取得矩陣＋首次折疊的時間，以及私有記憶體（RssAnon）
+與共享映射（RssFile + RssShmem）的增量
+
+用法:
+    python -m benchmarks.bench_shared_projection [workers] [original_dim] [target_dim]
+"""
+
+import multiprocessing
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+
+
+def _rss_kb():
+    """(RssAnon, RssFile + RssShmem) KB"""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key.startswith("Rss"):
+                fields[key] = int(value.split()[0])
+    return fields.get("RssAnon", 0), fields.get("RssFile", 0) + fields.get("RssShmem", 0)
+
+
+def _worker(args):
+    original_dim, target_dim, matrix_dir, shared = args
+    vector = np.random.default_rng(0).standard_normal(original_dim).astype(np.float32)
+    anon_before, mapped_before = _rss_kb()
+    start = time.perf_counter()
+    folder = SemanticFolder(
+        target_dim=target_dim, method=FoldingMethod.HYBRID, matrix_dir=matrix_dir, shared=shared
+    )
+    folder.fold(vector.tolist())
+    elapsed = time.perf_counter() - start
+    anon_after, mapped_after = _rss_kb()
+    folder.release_shared()
+    return elapsed, (anon_after - anon_before) / 1024, (mapped_after - mapped_before) / 1024
+
+
+def _run(workers, original_dim, target_dim, matrix_dir=None, shared=False):
+    # 每個 worker 只執行一次（全新行程，numpy 匯入不計入量測）
+    with multiprocessing.get_context("spawn").Pool(workers, maxtasksperchild=1) as pool:
+        results = pool.map(_worker, [(original_dim, target_dim, matrix_dir, shared)] * workers, chunksize=1)
+    ms, anon, mapped = (np.array(values) for values in zip(*results))
+    return ms.mean() * 1e3, anon.mean(), mapped.mean()
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    original_dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1536
+    target_dim = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+    matrix_mb = target_dim * original_dim * 4 / 2 ** 20
+
+    print(f"{workers} workers, HYBRID {original_dim} → {target_dim} ({matrix_mb:.1f} MB per matrix)")
+    print(f"{'mode':<10}{'ready ms':>10}{'private MB':>12}{'mapped MB':>11}{'private total':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [("generate", _run(workers, original_dim, target_dim))]
+
+        # 首次生成寫入目錄，之後的 worker 僅映射檔案
+        SemanticFolder(target_dim=target_dim, method=FoldingMethod.HYBRID, matrix_dir=tmp).fold(
+            [0.0] * original_dim
+        )
+        rows.append(("npy-mmap", _run(workers, original_dim, target_dim, matrix_dir=tmp)))
+
+        publisher = SemanticFolder(target_dim=target_dim, method=FoldingMethod.HYBRID)
+        publisher.publish_shared(original_dim)
+        try:
+            rows.append(("shared", _run(workers, original_dim, target_dim, shared=True)))
+        finally:
+            publisher.release_shared()
+
+    for name, (ms, anon, mapped) in rows:
+        print(f"{name:<10}{ms:>10.1f}{anon:>12.1f}{mapped:>11.1f}{anon * workers:>14.1f}M")
+
+
+if __name__ == "__main__":
+    main()
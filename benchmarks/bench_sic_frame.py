@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+SIC 封包二進位訊框基準測試
+
+比較轉發者讀取路由欄位的成本：JSON（須解析整個封包）與二進位訊框
+（只解析標頭，載荷為 memoryview），以及完整轉發（讀標頭 → TTL−1 → 重新編碼）
+
+用法:
+    python -m benchmarks.bench_sic_frame
+"""
+
+import time
+
+from validators.sic_pkt import SIC_Packet, SIC_PKT_Handler, decode_frame
+
+
+def _payload(size: int) -> dict:
+    """約 size 位元組的 SIT State"""
+    records = [{"id": i, "text": "語義狀態 semantic state " * 2} for i in range(max(1, size // 80))]
+    return {"intent": "批次同步", "records": records}
+
+
+def _timeit(fn, budget: float = 0.5) -> float:
+    rounds, start = 0, time.perf_counter()
+    while True:
+        fn()
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > budget:
+            return elapsed / rounds * 1e6
+
+
+def main():
+    handler = SIC_PKT_Handler("router-1")
+    print(f"{'payload':>9}{'json B':>10}{'frame B':>10}{'json hdr µs':>13}{'frame hdr µs':>14}"
+          f"{'json fwd µs':>13}{'frame fwd µs':>14}")
+    for size in (1 << 10, 100 << 10, 1 << 20):
+        pkt = handler.create_packet(_payload(size), dst_model="model-b")
+        text = pkt.to_json()
+        frame_bytes = handler.encode_frame(pkt)
+
+        json_header = _timeit(lambda: SIC_Packet.from_json(text).header.dst_model)
+        frame_header = _timeit(lambda: decode_frame(frame_bytes).header.dst_model)
+
+        def json_forward():
+            parsed = SIC_Packet.from_json(text)
+            return handler.forward_packet(parsed, "model-c").to_json()
+
+        json_forward_us = _timeit(json_forward)
+        frame_forward_us = _timeit(lambda: handler.forward_frame(decode_frame(frame_bytes), "model-c"))
+        print(f"{size >> 10:>7}KB{len(text.encode('utf-8')):>10,}{len(frame_bytes):>10,}"
+              f"{json_header:>13.1f}{frame_header:>14.1f}{json_forward_us:>13.1f}{frame_forward_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
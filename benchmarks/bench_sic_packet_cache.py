@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+SIC 封包編碼快取基準測試
+
+模擬封包經過 4 跳：建立 → 每跳驗證 + 轉發 → 序列化送出。
+比較每次驗證都重新標準化序列化（舊行為）與封包上快取編碼的耗時，
+並分開列出建立封包（含載荷快照）的成本
+
+用法:
+    python -m benchmarks.bench_sic_packet_cache
+"""
+
+import json
+import time
+
+from core import canonical
+from core.canonical import encode
+from validators.sic_pkt import SIC_PKT_Handler
+
+HOPS = 4
+
+
+def _payload(size: int) -> dict:
+    """約 size 位元組的 SIT State"""
+    records = [{"id": i, "text": "語義狀態 semantic state " * 2} for i in range(max(1, size // 80))]
+    return {"intent": "批次同步", "records": records}
+
+
+def _legacy_route(handler, payload):
+    """舊行為：每次驗證與送出都重新序列化載荷"""
+    pkt = handler.create_packet(payload, dst_model="model-b")
+    for hop in range(HOPS):
+        encoding = encode(pkt.payload)
+        assert encoding.hexdigest == pkt.header.SHV
+        assert len(json.dumps(pkt.payload)) <= handler.MAX_PAYLOAD_SIZE
+        handler.forward_packet(pkt, f"model-{hop}")
+    return json.dumps(pkt.to_dict(), ensure_ascii=False)
+
+
+def _cached_route(handler, payload):
+    pkt = handler.create_packet(payload, dst_model="model-b")
+    for hop in range(HOPS):
+        assert handler.validate_packet(pkt) == (True, None)
+        handler.forward_packet(pkt, f"model-{hop}")
+    return pkt.to_json()
+
+
+def _timeit(fn, budget: float = 1.0):
+    canonical.reset_stats()
+    rounds, start = 0, time.perf_counter()
+    while True:
+        fn()
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > budget:
+            return elapsed / rounds * 1e3, canonical.stats().encodes / rounds
+
+
+def main():
+    handler = SIC_PKT_Handler("model-a")
+    print(f"{HOPS} hops per packet")
+    print(f"{'payload':>9}{'legacy ms':>11}{'enc/pkt':>9}{'cached ms':>11}{'enc/pkt':>9}"
+          f"{'create ms':>11}{'speedup':>9}")
+    for size in (1 << 10, 100 << 10, 640 << 10):
+        payload = _payload(size)
+        legacy_ms, legacy_encodes = _timeit(lambda: _legacy_route(handler, payload))
+        cached_ms, cached_encodes = _timeit(lambda: _cached_route(handler, payload))
+        create_ms, _ = _timeit(lambda: handler.create_packet(payload))
+        print(f"{size >> 10:>7}KB{legacy_ms:>11.2f}{legacy_encodes:>9.1f}{cached_ms:>11.2f}"
+              f"{cached_encodes:>9.1f}{create_ms:>11.2f}{legacy_ms / cached_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+SIC 封包串流讀寫基準測試
+
+將約 32 MB 的封包擷取寫入暫存檔（NDJSON 與長度前綴訊框），比較
+整檔載入後逐行解析與 iter_packets 串流讀取的吞吐量與峰值記憶體
+（tracemalloc，另外一輪量測）
+
+用法:
+    python -m benchmarks.bench_sic_stream
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+from validators.sic_pkt import SIC_Packet, SIC_PKT_Handler
+from validators.sic_stream import SIC_StreamFormat, iter_packets, write_packets
+
+CAPTURE_BYTES = 32 << 20
+PAYLOAD_BYTES = 4 << 10
+
+
+def _packets(handler, count: int):
+    text = "語義狀態 semantic state " * (PAYLOAD_BYTES // 30)
+    for i in range(count):
+        yield handler.create_packet({"seq": i, "intent": "擷取重播", "state": text}, dst_model="model-b")
+
+
+def _load_all(path: str) -> int:
+    """基準：整檔載入後逐行解析"""
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    return sum(1 for line in lines if SIC_Packet.from_json(line))
+
+
+def _measure(fn):
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    handler = SIC_PKT_Handler("replay")
+    count = CAPTURE_BYTES // PAYLOAD_BYTES
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for fmt in SIC_StreamFormat:
+            paths[fmt] = os.path.join(tmp, f"capture.{fmt.value}")
+            start = time.perf_counter()
+            with open(paths[fmt], "wb") as f:
+                write_packets(f, _packets(handler, count), fmt)
+            size = os.path.getsize(paths[fmt])
+            print(f"write {fmt.value:<7} {count:,} packets, {size / 2**20:.1f} MB "
+                  f"in {time.perf_counter() - start:.2f}s (incl. create_packet)")
+
+        def stream(fmt, **kwargs):
+            def run():
+                with open(paths[fmt], "rb") as f:
+                    return sum(1 for _ in iter_packets(f, **kwargs))
+            return run
+
+        cases = [
+            ("ndjson load-all", SIC_StreamFormat.NDJSON, lambda: _load_all(paths[SIC_StreamFormat.NDJSON])),
+            ("ndjson stream", SIC_StreamFormat.NDJSON, stream(SIC_StreamFormat.NDJSON)),
+            ("ndjson stream+validate", SIC_StreamFormat.NDJSON, stream(SIC_StreamFormat.NDJSON, handler=handler)),
+            ("framed stream", SIC_StreamFormat.FRAMED, stream(SIC_StreamFormat.FRAMED)),
+            ("framed frames+validate", SIC_StreamFormat.FRAMED,
+             stream(SIC_StreamFormat.FRAMED, decode=False, handler=handler)),
+        ]
+        print(f"\n{'case':<24}{'packets':>9}{'MB/s':>9}{'pkt/s':>10}{'peak MB':>10}")
+        for name, fmt, fn in cases:
+            read, elapsed, peak = _measure(fn)
+            assert read == count
+            size = os.path.getsize(paths[fmt])
+            print(f"{name:<24}{read:>9,}{size / 2**20 / elapsed:>9.0f}{read / elapsed:>10,.0f}"
+                  f"{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
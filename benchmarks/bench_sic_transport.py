@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+SIC 傳輸層迴路負載測試
+
+以 spawn 啟動伺服器子行程（TCP 127.0.0.1 與 Unix socket），主行程以
+run_load 送出封包，比較無管線化（concurrency=1）與管線化 + 連線池的
+每秒封包數與延遲百分位數
+
+用法:
+    python -m benchmarks.bench_sic_transport [packets] [concurrency] [payload_bytes]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from validators.sic_pkt import SIC_PKT_Handler
+from validators.sic_transport import SIC_Client, SIC_Server, SIC_TransportConfig, run_load
+
+
+def _server_main(address, ready):
+    async def serve():
+        server = SIC_Server("bench-server")
+        if isinstance(address, str):
+            await server.start_unix(address)
+        else:
+            await server.start_tcp(*address)
+        ready.put(server.address)
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def _client(address, pool_size: int) -> SIC_Client:
+    config = SIC_TransportConfig(pool_size=pool_size)
+    if isinstance(address, str):
+        return SIC_Client(path=address, config=config)
+    return SIC_Client(*address[:2], config=config)
+
+
+async def _bench(address, packets, concurrency: int, pool_size: int):
+    async with _client(address, pool_size) as client:
+        await run_load(client, packets[:min(len(packets), 200)], concurrency)     # 暖身
+        return await run_load(client, packets, concurrency)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    payload_bytes = int(sys.argv[3]) if len(sys.argv) > 3 else 1024
+
+    handler = SIC_PKT_Handler("bench-client")
+    packets = [
+        handler.create_packet({"seq": i, "state": "x" * payload_bytes}, dst_model="bench-server")
+        for i in range(count)
+    ]
+    print(f"{count:,} packets, {payload_bytes} B payload, cpus={os.cpu_count()}")
+    print(f"{'transport':<10}{'conc':>6}{'pool':>6}{'pkt/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, address in (("tcp", ("127.0.0.1", 0)), ("unix", os.path.join(tmp, "sic.sock"))):
+            ready = ctx.Queue()
+            server = ctx.Process(target=_server_main, args=(address, ready), daemon=True)
+            server.start()
+            try:
+                bound = ready.get(timeout=30)
+                for conc, pool in ((1, 1), (concurrency, 1), (concurrency, 4)):
+                    result = asyncio.run(_bench(bound, packets, conc, pool))
+                    assert result["errors"] == 0
+                    latency = result["latency_ms"]
+                    print(f"{name:<10}{conc:>6}{pool:>6}{result['packets_per_sec']:>10,.0f}"
+                          f"{latency['p50']:>9.2f}{latency['p90']:>9.2f}{latency['p99']:>9.2f}")
+            finally:
+                server.terminate()
+                server.join()
+
+
+if __name__ == "__main__":
+    main()
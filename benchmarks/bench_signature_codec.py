@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+語義簽章二進位編碼基準測試
+
+比較 JSON 與二進位編碼的大小與編解碼速度
+
+用法:
+    python -m benchmarks.bench_signature_codec
+"""
+
+import json
+import time
+
+from security.semantic_signature import SemanticIntegrity
+from security.signature_codec import decode_signature, encode_signature
+
+
+SAMPLES = {
+    "english": (
+        "The quarterly compliance report covers data retention policies, access control "
+        "reviews and incident response metrics for all regional offices. " * 4
+    ),
+    "chinese": "這是一份關於人工智能安全的技術報告，討論了語義完整性的重要性。" * 4,
+    "dict": {"intent": "查詢用戶資料", "requester": {"id": "user-123"}, "constraints": {"max_tokens": 1000}},
+}
+
+
+def _timeit(fn, rounds: int = 20000) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    integrity = SemanticIntegrity(secret_key="bench-key")
+
+    print(f"{'sample':<10}{'json B':>8}{'f16 B':>8}{'ratio':>8}{'fixed ratio':>13}"
+          f"{'json enc µs':>13}{'bin enc µs':>12}{'json dec µs':>13}{'bin dec µs':>12}")
+    for name, content in SAMPLES.items():
+        sig = integrity.sign(content, model_source="claude")
+        json_bytes = json.dumps(sig.to_dict(), ensure_ascii=False).encode("utf-8")
+        binary = encode_signature(sig)
+
+        # 不含自由文字欄位（key_concepts / intent_summary）的固定部分
+        text_json = len(json.dumps(
+            {"key_concepts": sig.key_concepts, "intent_summary": sig.intent_summary},
+            ensure_ascii=False
+        ).encode("utf-8"))
+        text_bin = sum(len(c.encode("utf-8")) + 1 for c in sig.key_concepts) \
+            + len(sig.intent_summary.encode("utf-8")) + 3
+        fixed_ratio = (len(binary) - text_bin) / (len(json_bytes) - text_json)
+
+        json_enc = _timeit(lambda: json.dumps(sig.to_dict(), ensure_ascii=False).encode("utf-8"))
+        bin_enc = _timeit(lambda: encode_signature(sig))
+        json_dec = _timeit(lambda: json.loads(json_bytes))
+        view = memoryview(binary)
+        bin_dec = _timeit(lambda: decode_signature(view))
+
+        print(f"{name:<10}{len(json_bytes):>8}{len(binary):>8}{len(binary) / len(json_bytes):>8.1%}"
+              f"{fixed_ratio:>13.1%}{json_enc:>13.2f}{bin_enc:>12.2f}{json_dec:>13.2f}{bin_dec:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
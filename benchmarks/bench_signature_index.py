@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+近似重複簽章索引基準測試
+
+以合成語料比較 LSH 索引與暴力掃描：
+- precision / recall（以精確 shingle Jaccard 為真值）
+- 查詢延遲（記憶體索引、mmap 索引、暴力草圖掃描）
+
+用法:
+    python -m benchmarks.bench_signature_index [語料數量]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from security.signature_index import MappedSignatureIndex, MinHasher, SignatureIndex
+
+
+THRESHOLD = 0.5
+
+
+def _make_corpus(n: int, rng: random.Random):
+    vocab = [''.join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(5000)]
+    return [' '.join(rng.choices(vocab, k=60)) for _ in range(n)], vocab
+
+
+def _mutate(text: str, vocab, rate: float, rng: random.Random) -> str:
+    words = text.split()
+    for i in range(len(words)):
+        if rng.random() < rate:
+            words[i] = rng.choice(vocab)
+    return ' '.join(words)
+
+
+def main(n: int = 10000, queries: int = 200):
+    rng = random.Random(7)
+    hasher = MinHasher()
+    corpus, vocab = _make_corpus(n, rng)
+
+    start = time.perf_counter()
+    sketches = np.vstack([hasher.sketch_array(doc) for doc in corpus])
+    sketch_time = time.perf_counter() - start
+
+    index = SignatureIndex(num_perm=hasher.num_perm, threshold=THRESHOLD)
+    start = time.perf_counter()
+    index.add_many((str(i), sketches[i]) for i in range(n))
+    build_time = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(), "signatures.idx")
+    index.save(path)
+    mapped = MappedSignatureIndex(path)
+
+    shingles = [None] * n
+    tp = fp = fn = 0
+    lat_mem, lat_map, lat_brute = [], [], []
+    for q in range(queries):
+        source = rng.randrange(n)
+        text = _mutate(corpus[source], vocab, rate=rng.choice([0.02, 0.05, 0.1, 0.2, 0.4]), rng=rng)
+        query = hasher.sketch_array(text)
+        q_shingles = set(hasher.shingle_hashes(text).tolist())
+
+        t0 = time.perf_counter()
+        found = {key for key, _ in index.query(query, k=n)}
+        t1 = time.perf_counter()
+        mapped.query(query, k=n)
+        t2 = time.perf_counter()
+        (sketches == query).mean(axis=1) >= THRESHOLD
+        t3 = time.perf_counter()
+        lat_mem.append(t1 - t0)
+        lat_map.append(t2 - t1)
+        lat_brute.append(t3 - t2)
+
+        # 真值：對全語料計算精確 shingle Jaccard
+        truth = set()
+        for i in range(n):
+            if shingles[i] is None:
+                shingles[i] = set(hasher.shingle_hashes(corpus[i]).tolist())
+            inter = len(q_shingles & shingles[i])
+            if inter and inter / len(q_shingles | shingles[i]) >= THRESHOLD:
+                truth.add(str(i))
+        tp += len(found & truth)
+        fp += len(found - truth)
+        fn += len(truth - found)
+
+    mapped.close()
+    precision = tp / max(tp + fp, 1)
+    recall = tp / max(tp + fn, 1)
+    print(f"corpus={n} queries={queries} num_perm={hasher.num_perm} "
+          f"bands={index.bands} rows={index.rows} threshold={THRESHOLD}")
+    print(f"sketch: {sketch_time / n * 1e6:.1f} µs/doc   build: {build_time:.2f}s   "
+          f"file: {os.path.getsize(path) / 1e6:.1f} MB")
+    print(f"precision: {precision:.3f}   recall: {recall:.3f}")
+    print(f"query latency (median µs): lsh={np.median(lat_mem) * 1e6:.0f}  "
+          f"mmap={np.median(lat_map) * 1e6:.0f}  brute-force={np.median(lat_brute) * 1e6:.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
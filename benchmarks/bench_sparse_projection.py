@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+稀疏隨機投影基準測試
+
+比較 RANDOM_PROJECTION（稠密高斯）、SPARSE_PROJECTION（Achlioptas）
+與 VERY_SPARSE_PROJECTION（Li et al.）的矩陣生成時間、記憶體、
+折疊速度與成對距離失真
+
+用法:
+    python -m benchmarks.bench_sparse_projection
+"""
+
+import math
+import random
+import time
+
+import numpy as np
+
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+
+
+METHODS = [
+    FoldingMethod.RANDOM_PROJECTION,
+    FoldingMethod.SPARSE_PROJECTION,
+    FoldingMethod.VERY_SPARSE_PROJECTION,
+]
+
+
+def _legacy_generate(target_dim: int, original_dim: int, seed: int = 42) -> float:
+    """原本以 random.gauss 逐元素生成的耗時（秒）"""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    [[rng.gauss(0, 1) / math.sqrt(target_dim) for _ in range(original_dim)] for _ in range(target_dim)]
+    return time.perf_counter() - start
+
+
+def _distortion(original: np.ndarray, projected: np.ndarray, pairs: int = 5000) -> tuple:
+    """隨機成對距離比例 |f(x)-f(y)| / |x-y| 的平均與最大偏差"""
+    rng = np.random.default_rng(3)
+    a = rng.integers(0, len(original), pairs)
+    b = (a + rng.integers(1, len(original), pairs)) % len(original)
+    ratio = np.linalg.norm(projected[a] - projected[b], axis=1) \
+        / np.linalg.norm(original[a] - original[b], axis=1)
+    return float(np.abs(ratio - 1).mean()), float(np.abs(ratio - 1).max())
+
+
+def _projected(folder: SemanticFolder, corpus: np.ndarray) -> np.ndarray:
+    """未正規化的投影結果（用於距離失真）"""
+    if folder.method == FoldingMethod.RANDOM_PROJECTION:
+        return folder._random_projection(corpus)
+    return folder._sparse_projection(corpus)
+
+
+def main():
+    original_dim, target_dim, n = 1536, 256, 4000
+    corpus = np.random.default_rng(1).standard_normal((n, original_dim), dtype=np.float32)
+    vector = corpus[0]
+
+    print(f"legacy random.gauss generation: {_legacy_generate(target_dim, original_dim) * 1e3:.0f} ms\n")
+    print(f"{'method':<24}{'gen ms':>8}{'MB':>8}{'density':>9}{'fold µs':>9}"
+          f"{'batch vec/s':>13}{'mean dev':>10}{'max dev':>9}")
+    for method in METHODS:
+        folder = SemanticFolder(target_dim=target_dim, method=method)
+        start = time.perf_counter()
+        if method == FoldingMethod.RANDOM_PROJECTION:
+            matrix = folder._get_projection_matrix(original_dim)
+            nbytes, density = matrix.nbytes, 1.0
+        else:
+            matrix = folder._get_sparse_projection(method, original_dim)
+            nbytes, density = matrix.nbytes, matrix.density
+        gen = time.perf_counter() - start
+
+        rounds = 2000
+        start = time.perf_counter()
+        for _ in range(rounds):
+            folder._fold_rows(vector, vector)
+        fold_us = (time.perf_counter() - start) / rounds * 1e6
+
+        start = time.perf_counter()
+        projected = _projected(folder, corpus)
+        batch_rate = n / (time.perf_counter() - start)
+
+        mean_dev, max_dev = _distortion(corpus, projected)
+        print(f"{method.value:<24}{gen * 1e3:>8.1f}{nbytes / 1e6:>8.2f}{density:>9.3f}{fold_us:>9.1f}"
+              f"{batch_rate:>13,.0f}{mean_dev:>10.3f}{max_dev:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+折疊向量儲存基準測試
+
+各編碼的檔案大小、追加吞吐量、開啟時間、隨機存取延遲與暴力掃描速度
+
+用法:
+    python -m benchmarks.bench_vector_store [n]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from folding.quantization import QuantizationMode
+from folding.vector_store import FoldedVectorStore
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    dim, chunk = 256, 50_000
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(dim).astype(np.float32)
+
+    print(f"{n:,} × {dim}")
+    print(f"{'encoding':<10}{'MB':>9}{'append vec/s':>14}{'open ms':>9}{'get µs':>8}"
+          f"{'scan ms':>9}{'rows/s':>14}{'50M scan s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in [None] + list(QuantizationMode):
+            path = os.path.join(tmp, f"store-{mode.value if mode else 'F32'}")
+            start = time.perf_counter()
+            with FoldedVectorStore.create(path, dim, mode=mode, method="RANDOM_PROJECTION") as store:
+                for offset in range(0, n, chunk):
+                    rows = min(chunk, n - offset)
+                    block = rng.standard_normal((rows, dim)).astype(np.float32)
+                    store.append(block, ids=[f"doc-{offset + i}" for i in range(rows)])
+            append_rate = n / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            store = FoldedVectorStore(path)
+            open_ms = (time.perf_counter() - start) * 1e3
+
+            picks = rng.integers(0, n, 2000)
+            start = time.perf_counter()
+            for row in picks:
+                store.vector(int(row))
+            get_us = (time.perf_counter() - start) / len(picks) * 1e6
+
+            store.search(query, k=10)  # 預熱頁面快取
+            start = time.perf_counter()
+            store.search(query, k=10)
+            scan = time.perf_counter() - start
+            size = os.path.getsize(path) / 1e6
+            store.close()
+
+            print(f"{(mode.value if mode else 'FLOAT32'):<10}{size:>9.1f}{append_rate:>14,.0f}"
+                  f"{open_ms:>9.2f}{get_us:>8.1f}{scan * 1e3:>9.1f}{n / scan:>14,.0f}"
+                  f"{50_000_000 / (n / scan):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """SIC-SIT Core"""
 from .semantic_routing import SIC_Router, SemanticNode, RouteDecision, RoutingStrategy
+from .canonical import CanonicalEncoding, encode, encode_content, encoding_scope
 
 # Alias
 SemanticRouter = SIC_Router
@@ -0,0 +1,152 @@
+"""
+Canonical Encoding — 協議棧共用的標準化 JSON 編碼
+
+USCA 協議棧位置: 跨層共用（L2 SIC-FW / SIC-PKT / SEM-SIG / SEM-COMP）
+類比: ASN.1 DER — 同一份語義狀態只有一種位元組表示
+
+同一份 payload 在 FW → PKT → SIG → compliance 途中會被反覆以
+json.dumps(sort_keys=True, ensure_ascii=False) 序列化。本模組提供
+唯一的標準化編碼（位元組 + SHA-256）。在 encoding_scope() 範圍內
+以物件身分（id）記憶化，呼叫端保證範圍內不修改 payload（例如一次
+請求的處理管線）。
+
+範圍外每次重新編碼 — 一般 dict 無法偵測就地修改，若以身分快取將使
+篡改後的 payload 仍通過 SHV 驗證。能追蹤修改的擁有者（例如
+SIC_Packet 的版本化載荷）自行在物件上保存編碼結果。
+
+編碼格式與既有 json.dumps(sort_keys=True, ensure_ascii=False)
+完全相同，因此既有 SHV 與 content_hash 不受影響。
+
+版本: 1.0.0
+"""
+
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CanonicalEncoding:
+    """標準化編碼結果"""
+    data: bytes                 # UTF-8 位元組
+    digest: bytes               # SHA-256 digest
+    _text: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def hexdigest(self) -> str:
+        return self.digest.hex()
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def text(self) -> str:
+        """標準化 JSON 字串"""
+        if self._text is None:
+            object.__setattr__(self, "_text", self.data.decode("utf-8"))
+        return self._text
+
+
+@dataclass
+class EncodingStats:
+    """編碼指標（供基準測試與監控使用）"""
+    encodes: int = 0            # 實際序列化次數
+    scope_hits: int = 0         # encoding_scope 內的命中
+
+    def to_dict(self) -> Dict:
+        return {
+            "encodes": self.encodes,
+            "scope_hits": self.scope_hits
+        }
+
+
+_scope: ContextVar[Optional[Dict[int, Tuple[Any, CanonicalEncoding]]]] = ContextVar(
+    "canonical_encoding_scope", default=None
+)
+
+_stats = EncodingStats()
+_stats_lock = threading.Lock()     # 多執行緒（如 validate_many 的雜湊池）同時編碼
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """標準化序列化（不記憶化）"""
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def _encode_uncached(obj: Any) -> CanonicalEncoding:
+    text = json.dumps(obj, sort_keys=True, ensure_ascii=False)
+    data = text.encode("utf-8")
+    with _stats_lock:
+        _stats.encodes += 1
+    return CanonicalEncoding(data=data, digest=hashlib.sha256(data).digest(), _text=text)
+
+
+def encode(obj: Any) -> CanonicalEncoding:
+    """
+    取得物件的標準化編碼（encoding_scope 範圍內以物件身分記憶化）
+
+    Args:
+        obj: 可 JSON 序列化的物件
+
+    Returns:
+        CanonicalEncoding
+    """
+    memo = _scope.get()
+    if memo is None:
+        return _encode_uncached(obj)
+
+    entry = memo.get(id(obj))
+    if entry is not None and entry[0] is obj:
+        with _stats_lock:
+            _stats.scope_hits += 1
+        return entry[1]
+    encoding = _encode_uncached(obj)
+    memo[id(obj)] = (obj, encoding)
+    return encoding
+
+
+def encode_content(content: Any) -> CanonicalEncoding:
+    """
+    標準化「內容」：dict 以 JSON 編碼，其他以 str() 表示
+
+    與 SemanticIntegrity / SemanticComplianceEngine 既有的內容標準化一致
+    """
+    if isinstance(content, dict):
+        return encode(content)
+    text = str(content)
+    data = text.encode("utf-8")
+    return CanonicalEncoding(data=data, digest=hashlib.sha256(data).digest(), _text=text)
+
+
+@contextmanager
+def encoding_scope() -> Iterator[None]:
+    """
+    記憶化範圍：範圍內同一物件只序列化一次
+
+    呼叫端保證範圍內不就地修改傳入的 payload；巢狀使用時沿用外層範圍
+    """
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def stats() -> EncodingStats:
+    """取得編碼指標快照"""
+    with _stats_lock:
+        return EncodingStats(**vars(_stats))
+
+
+def reset_stats() -> None:
+    """重設編碼指標"""
+    with _stats_lock:
+        _stats.encodes = _stats.scope_hits = 0
@@ -234,7 +234,7 @@ class SIC_Router:
         - HNSW 索引
         """
         # 將字典轉換為字符串以進行緩存
-        intent_profile_str = json.dumps(intent_profile, sort_keys=True)
+        intent_profile_str = json.dumps(intent_profile, sort_keys=True, default=sorted)
         return self._compute_semantic_distance_cached(intent_profile_str, node.node_id)
 
     @lru_cache(maxsize=1024)
@@ -258,12 +258,6 @@ class SIC_Router:
 
         distance = 0.5  # 基礎距離
 
-        # 領域匹配加分
-        intent_domains = set(intent_profile.get("domain_hints", set()))
-        node_domains = set(node.domains)
-
-        if intent_domains & node_domains:
-            # 有領域交集
         # 領域匹配加分
         intent_domains = set(intent_profile.get("domain_hints", []))
         node_domains = set(node.domains)
@@ -285,7 +279,6 @@ class SIC_Router:
 
         return max(0.0, min(1.0, distance))
 
-        return max(0.0, min(1.0, distance))
     def _meets_requirements(self, node: SemanticNode, required: Optional[List[str]]) -> bool:
         """檢查節點是否滿足需求"""
         if not required:
@@ -18,7 +18,6 @@ USCA 協議棧位置: L2/L3 Audit Layer
 版本: 1.0.0
 """
 
-import json
 import hashlib
 import re
 from datetime import datetime
@@ -26,6 +25,8 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from core.canonical import encode_content
+
 
 class ComplianceFramework(Enum):
     """合規框架"""
@@ -240,10 +241,7 @@ class SemanticComplianceEngine:
         rules_passed = 0
         
         # 標準化內容
-        if isinstance(content, dict):
-            content_str = json.dumps(content, ensure_ascii=False)
-        else:
-            content_str = str(content)
+        content_str = encode_content(content).text
         
         # 1. 資料分級
         classification = self._classify_data(content_str)
@@ -367,12 +365,9 @@ class SemanticComplianceEngine:
         Returns:
             SemanticLineage
         """
-        if isinstance(content, dict):
-            content_str = json.dumps(content, sort_keys=True, ensure_ascii=False)
-        else:
-            content_str = str(content)
-        
-        content_hash = hashlib.sha256(content_str.encode()).hexdigest()
+        encoding = encode_content(content)
+        content_str = encoding.text
+        content_hash = encoding.hexdigest
         lineage_id = hashlib.md5(
             f"{content_hash}{datetime.utcnow().isoformat()}".encode()
         ).hexdigest()[:16]
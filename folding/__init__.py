@@ -1,2 +1,12 @@
 """SIC-SIT Semantic Folding"""
-from .semantic_folding import SemanticFolder
+from .semantic_folding import SemanticFolder, FoldingMethod, FoldedVector, FoldedBatch, SemanticManifold
+from .manifold import ManifoldStats
+from .matrix_store import SharedMatrix
+from .feature_hashing import HashFamily
+from .quantization import QuantizationMode, QuantizedVector, QuantizedBatch
+from .vector_store import FoldedVectorStore
+from .ivf_index import IVFIndex
+from .product_quantization import ProductQuantizer
+from .pca import PCABasis, StreamingPCA
+from .alignment import AlignmentOperator, AlignmentMetrics
+from .quality import DistortionReport
@@ -0,0 +1,132 @@
+"""
+Cross-Model Alignment — 跨模型語義對齊
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+以正交 Procrustes 求模型 B 折疊空間到模型 A 折疊空間的旋轉：
+
+    R = argmin_{RᵀR = I} ‖B R − A‖_F = U Vᵀ，其中 U Σ Vᵀ = SVD(Bᵀ A)
+
+A、B 為錨點對的單位化折疊向量。R 為正交矩陣，對齊後向量範數與
+B 空間內的餘弦關係不變；整批套用只需一次矩陣乘法。
+
+版本: 1.0.0
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms < 1e-10, 1.0, norms)
+
+
+def fit_procrustes(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """
+    正交 Procrustes：回傳使 source @ R ≈ target 的正交矩陣 R
+
+    Args:
+        source: (n, d) 錨點（模型 B）
+        target: (n, d) 對應錨點（模型 A）
+    """
+    source = np.asarray(source, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    if source.shape != target.shape or source.ndim != 2:
+        raise ValueError(f"anchor shapes must match: {source.shape} != {target.shape}")
+    u, _, vt = np.linalg.svd(source.T @ target)
+    return (u @ vt).astype(np.float32)
+
+
+@dataclass
+class AlignmentMetrics:
+    """對齊品質（於留出錨點上評估；無留出時為擬合錨點）"""
+    fit_anchors: int                # 擬合用錨點數
+    eval_anchors: int               # 評估用錨點數
+    held_out: bool                  # 評估錨點是否為留出資料
+    cosine_before: float            # 對齊前錨點對平均餘弦
+    cosine_after: float             # 對齊後錨點對平均餘弦
+    top1_accuracy: float            # 對齊後最近鄰即為配對錨點的比例
+    residual: float                 # 對齊後 ‖B R − A‖_F / √n
+
+    def to_dict(self) -> Dict:
+        return {
+            "fit_anchors": self.fit_anchors,
+            "eval_anchors": self.eval_anchors,
+            "held_out": self.held_out,
+            "cosine_before": self.cosine_before,
+            "cosine_after": self.cosine_after,
+            "top1_accuracy": self.top1_accuracy,
+            "residual": self.residual
+        }
+
+
+def evaluate_alignment(
+    rotation: np.ndarray,
+    source: np.ndarray,
+    target: np.ndarray,
+    fit_anchors: int,
+    held_out: bool
+) -> AlignmentMetrics:
+    """以錨點對評估旋轉的對齊品質"""
+    source = _unit_rows(np.asarray(source, dtype=np.float32))
+    target = _unit_rows(np.asarray(target, dtype=np.float32))
+    aligned = source @ rotation
+    n = len(source)
+    if not n:
+        return AlignmentMetrics(fit_anchors, 0, held_out, 0.0, 0.0, 0.0, 0.0)
+    nearest = np.argmax(aligned @ target.T, axis=1)
+    return AlignmentMetrics(
+        fit_anchors=fit_anchors,
+        eval_anchors=n,
+        held_out=held_out,
+        cosine_before=float(np.einsum("ij,ij->i", source, target).mean()),
+        cosine_after=float(np.einsum("ij,ij->i", aligned, target).mean()),
+        top1_accuracy=float(np.mean(nearest == np.arange(n))),
+        residual=float(np.linalg.norm(aligned - target) / np.sqrt(n))
+    )
+
+
+@dataclass
+class AlignmentOperator:
+    """模型 B → 模型 A 的折疊空間旋轉"""
+    model_a: str
+    model_b: str
+    rotation: np.ndarray                # (d, d) 正交矩陣，右乘套用
+    metrics: AlignmentMetrics
+
+    def apply(self, vectors: np.ndarray) -> np.ndarray:
+        """將模型 B 的折疊向量（單一或 (n, d)）旋轉到模型 A 空間"""
+        return np.asarray(vectors, dtype=np.float32) @ self.rotation
+
+    def save(self, path: str) -> None:
+        """寫入 .npz（不使用 pickle）"""
+        metrics = self.metrics
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                model_a=np.array(self.model_a),
+                model_b=np.array(self.model_b),
+                rotation=self.rotation.astype("<f4"),
+                counts=np.array([metrics.fit_anchors, metrics.eval_anchors, int(metrics.held_out)], dtype="<i8"),
+                scores=np.array([
+                    metrics.cosine_before, metrics.cosine_after, metrics.top1_accuracy, metrics.residual
+                ], dtype="<f8")
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "AlignmentOperator":
+        with np.load(path, allow_pickle=False) as data:
+            fit_anchors, eval_anchors, held_out = (int(v) for v in data["counts"])
+            cosine_before, cosine_after, top1, residual = (float(v) for v in data["scores"])
+            return cls(
+                model_a=str(data["model_a"]),
+                model_b=str(data["model_b"]),
+                rotation=data["rotation"].astype(np.float32),
+                metrics=AlignmentMetrics(
+                    fit_anchors, eval_anchors, bool(held_out),
+                    cosine_before, cosine_after, top1, residual
+                )
+            )
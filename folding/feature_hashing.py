@@ -0,0 +1,116 @@
+"""
+Feature Hashing — 特徵雜湊折疊
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+以有號雜湊（Weinberger et al., 2009；即 count sketch）把第 i 個分量
+加到桶 h(i)，並乘上符號 ξ(i) ∈ {±1}：
+
+    y[h(i)] += ξ(i) · x[i]
+
+E[⟨y, y'⟩] = ⟨x, x'⟩，相近的輸入得到相近的輸出（具局部性）；
+等價於每行恰有一個 ±1 的稀疏投影矩陣，以 SparseProjection 表示
+（SemanticFolder 轉為稠密矩陣走 BLAS，批次折疊比稀疏收集快）。
+折疊結果的符號位（QuantizationMode.BINARY）即為 SimHash 簽章。
+
+h 與 ξ 以分量索引為鍵，可選雜湊族：
+
+- MURMUR3: MurmurHash3 x86_32（4 位元組鍵），以種子為 seed
+- MULTIPLY_SHIFT: ((a·x + b) mod 2⁶⁴) >> 32（Dietzfelbinger，2-獨立）
+- TABULATION: 4 張 256 項隨機表逐位元組 XOR（簡單表格雜湊，3-獨立）
+
+版本: 1.0.0
+"""
+
+from enum import Enum
+
+import numpy as np
+
+from .sparse_projection import SparseProjection
+
+
+class HashFamily(Enum):
+    """特徵雜湊的雜湊族"""
+    MURMUR3 = "MURMUR3"                  # MurmurHash3 x86_32
+    MULTIPLY_SHIFT = "MULTIPLY_SHIFT"    # 乘法移位（2-獨立）
+    TABULATION = "TABULATION"            # 簡單表格雜湊（3-獨立）
+
+
+def _rotl(x: np.ndarray, r: int) -> np.ndarray:
+    return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
+
+
+def _murmur3(keys: np.ndarray, seed: int) -> np.ndarray:
+    k = keys * np.uint32(0xCC9E2D51)
+    k = _rotl(k, 15) * np.uint32(0x1B873593)
+    h = np.uint32(seed & 0xFFFFFFFF) ^ k
+    h = _rotl(h, 13) * np.uint32(5) + np.uint32(0xE6546B64)
+    h ^= np.uint32(4)                    # 鍵長度
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x85EBCA6B)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0xC2B2AE35)
+    h ^= h >> np.uint32(16)
+    return h
+
+
+def _multiply_shift(keys: np.ndarray, seed: int) -> np.ndarray:
+    a, b = np.random.default_rng(seed).integers(0, 2 ** 64, size=2, dtype=np.uint64)
+    return ((keys.astype(np.uint64) * (a | np.uint64(1)) + b) >> np.uint64(32)).astype(np.uint32)
+
+
+def _tabulation(keys: np.ndarray, seed: int) -> np.ndarray:
+    tables = np.random.default_rng(seed).integers(0, 2 ** 32, size=(4, 256), dtype=np.uint32)
+    h = np.zeros_like(keys)
+    for byte in range(4):
+        h ^= tables[byte][(keys >> np.uint32(8 * byte)) & np.uint32(0xFF)]
+    return h
+
+
+_FAMILIES = {
+    HashFamily.MURMUR3: _murmur3,
+    HashFamily.MULTIPLY_SHIFT: _multiply_shift,
+    HashFamily.TABULATION: _tabulation,
+}
+
+
+def hash_indices(keys: np.ndarray, seed: int, family: HashFamily = HashFamily.MURMUR3) -> np.ndarray:
+    """以指定雜湊族向量化雜湊非負整數鍵，回傳 uint32"""
+    keys = np.asarray(keys)
+    if keys.size and (keys.min() < 0 or keys.max() > 0xFFFFFFFF):
+        raise ValueError("hash keys must fit in uint32")
+    return _FAMILIES[family](keys.astype(np.uint32), seed)
+
+
+def feature_hash_projection(
+    target_dim: int,
+    original_dim: int,
+    seed: int = 42,
+    family: HashFamily = HashFamily.MURMUR3
+) -> SparseProjection:
+    """
+    建立特徵雜湊的稀疏投影矩陣（每行一個 ±1）
+
+    桶與符號以兩個獨立種子雜湊：桶取雜湊值高位映射到 [0, target_dim)
+    （乘法縮放，避免取模偏差），符號取另一雜湊值的最高位
+
+    Args:
+        target_dim: 桶數（目標維度）
+        original_dim: 原始維度
+        seed: 雜湊種子
+        family: 雜湊族
+    """
+    if target_dim <= 0 or original_dim <= 0:
+        raise ValueError(f"dimensions must be positive, got {target_dim} × {original_dim}")
+    columns = np.arange(original_dim)
+    buckets = (
+        hash_indices(columns, 2 * seed, family).astype(np.uint64) * np.uint64(target_dim) >> np.uint64(32)
+    ).astype(np.intp)
+    signs = hash_indices(columns, 2 * seed + 1, family) >> np.uint32(31)
+
+    # 依桶排序成 CSR（同桶內保持行順序）
+    order = np.argsort(buckets, kind="stable")
+    data = np.where(signs[order] == 1, np.float32(-1), np.float32(1))
+    indptr = np.zeros(target_dim + 1, dtype=np.int64)
+    np.cumsum(np.bincount(buckets, minlength=target_dim), out=indptr[1:])
+    return SparseProjection(indptr, order.astype(np.intp), data, (target_dim, original_dim))
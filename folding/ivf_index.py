@@ -0,0 +1,268 @@
+"""
+IVF Index — 折疊向量倒排檔索引
+
+USCA 協議棧位置: L1 (Semantic Folding Layer)
+
+以球面 k-means 粗質心將 FoldedVectorStore 的列分入 nlist 個倒排列表；
+查詢時只掃描與查詢最接近的 nprobe 個列表，再以儲存中的向量重排序。
+nprobe 為召回率與延遲的權衡旋鈕（nprobe = nlist 等同暴力掃描）。
+
+索引檔預設存放於儲存旁（<store path>.ivf）：
+
+    header | 質心 (nlist × dim f32) | 列表偏移 ((nlist + 1) u64) | 列號 (count u64)
+
+版本: 1.0.0
+"""
+
+import struct
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .vector_store import FoldedVectorStore, QueryLike
+
+
+IVF_MAGIC = b"SIVF"
+IVF_VERSION = 2                 # 2: 標頭加入 seed
+
+# magic, version, nlist, dim, count, seed
+_IVF_HEADER = struct.Struct("<4sB3xIIQq")
+
+_ASSIGN_ROWS = 65536
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms < 1e-10, 1.0, norms)
+
+
+def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        rows, scores = rows[keep], scores[keep]
+    order = np.argsort(-scores, kind="stable")
+    return rows[order], scores[order]
+
+
+class IVFIndex:
+    """
+    倒排檔索引
+
+    綁定一個 FoldedVectorStore：索引只保存質心與各列表的列號，
+    候選向量由儲存（mmap）讀取並重排序
+    """
+
+    def __init__(self, store: FoldedVectorStore, nlist: int = 1024, seed: int = 42):
+        """
+        初始化索引（尚未訓練）
+
+        Args:
+            store: 折疊向量儲存
+            nlist: 粗質心數量
+            seed: 隨機種子
+        """
+        if nlist <= 0:
+            raise ValueError(f"nlist must be positive, got {nlist}")
+        self.store = store
+        self.nlist = nlist
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._pending: List[List[np.ndarray]] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    # ========== 訓練 ==========
+
+    def train(self, sample: Optional[np.ndarray] = None, iterations: int = 20, sample_size: int = 65536) -> None:
+        """
+        以球面 k-means 訓練粗質心
+
+        Args:
+            sample: 訓練樣本 (n, dim)；未提供時從儲存隨機抽樣
+            iterations: k-means 迭代次數
+            sample_size: 從儲存抽樣的列數上限
+        """
+        rng = np.random.default_rng(self.seed)
+        if sample is None:
+            n = len(self.store)
+            picks = np.sort(rng.choice(n, size=min(n, sample_size), replace=False))
+            sample = self.store.take(picks)
+        sample = _normalize_rows(np.asarray(sample, dtype=np.float32))
+        if len(sample) < self.nlist:
+            raise ValueError(f"need at least nlist={self.nlist} training vectors, got {len(sample)}")
+
+        centroids = sample[rng.choice(len(sample), size=self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = self._assign(sample, centroids)
+            counts = np.bincount(labels, minlength=self.nlist)
+            sums = np.zeros_like(centroids)
+            order = np.argsort(labels, kind="stable")
+            starts = np.searchsorted(labels[order], np.arange(self.nlist))
+            nonempty = counts > 0
+            sums[nonempty] = np.add.reduceat(sample[order], starts[nonempty], axis=0)
+            # 空叢集以隨機樣本重新播種
+            empty = np.flatnonzero(~nonempty)
+            if len(empty):
+                sums[empty] = sample[rng.choice(len(sample), size=len(empty), replace=False)]
+            centroids = _normalize_rows(sums)
+
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self._lists = [np.empty(0, dtype=np.int64) for _ in range(self.nlist)]
+        self._pending = [[] for _ in range(self.nlist)]
+        self._count = 0
+
+    def _assign(self, vectors: np.ndarray, centroids: Optional[np.ndarray] = None) -> np.ndarray:
+        """分塊計算最近質心（內積最大）"""
+        centroids = self.centroids if centroids is None else centroids
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), _ASSIGN_ROWS):
+            labels[start:start + _ASSIGN_ROWS] = np.argmax(
+                vectors[start:start + _ASSIGN_ROWS] @ centroids.T, axis=1
+            )
+        return labels
+
+    # ========== 增量加入 ==========
+
+    def add(self, vectors: np.ndarray, rows: Optional[range] = None) -> None:
+        """
+        將向量分入倒排列表
+
+        Args:
+            vectors: (n, dim) 折疊向量
+            rows: 對應的儲存列號（例如 store.append 的回傳值）；
+                  預設接續目前已索引的列
+        """
+        if not self.is_trained:
+            raise ValueError("index must be trained before adding vectors")
+        vectors = np.asarray(vectors, dtype=np.float32)
+        row_ids = np.arange(self._count, self._count + len(vectors)) if rows is None \
+            else np.asarray(rows, dtype=np.int64)
+        if len(row_ids) != len(vectors):
+            raise ValueError(f"got {len(row_ids)} rows for {len(vectors)} vectors")
+        if not len(vectors):
+            return
+        labels = self._assign(vectors)
+        order = np.argsort(labels, kind="stable")
+        sorted_labels = labels[order]
+        bounds = np.searchsorted(sorted_labels, np.arange(self.nlist + 1))
+        for list_id in np.unique(sorted_labels):
+            self._pending[list_id].append(row_ids[order[bounds[list_id]:bounds[list_id + 1]]])
+        self._count += len(vectors)
+
+    def sync(self, batch_rows: int = _ASSIGN_ROWS) -> int:
+        """
+        索引儲存中尚未加入的列（假設列號連續加入）
+
+        Returns:
+            新加入的列數
+        """
+        start = self._count
+        total = len(self.store)
+        for offset in range(start, total, batch_rows):
+            stop = min(offset + batch_rows, total)
+            self.add(self.store.vectors(offset, stop), range(offset, stop))
+        return total - start
+
+    def _compact(self) -> None:
+        for list_id, chunks in enumerate(self._pending):
+            if chunks:
+                self._lists[list_id] = np.concatenate([self._lists[list_id]] + chunks)
+                self._pending[list_id] = []
+
+    def list_sizes(self) -> np.ndarray:
+        """各倒排列表的大小"""
+        self._compact()
+        return np.array([len(rows) for rows in self._lists], dtype=np.int64)
+
+    # ========== 查詢 ==========
+
+    def search_rows(self, query: QueryLike, k: int = 10, nprobe: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        近似 top-k 查詢
+
+        Args:
+            query: 折疊後的查詢向量
+            k: 回傳筆數
+            nprobe: 掃描的倒排列表數
+
+        Returns:
+            (列號, 相似度) 陣列，依相似度遞減
+        """
+        if not self.is_trained:
+            raise ValueError("index must be trained before searching")
+        self._compact()
+        q = self.store.normalize_query(query)
+        if q is None or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        nprobe = min(max(nprobe, 1), self.nlist)
+        centroid_scores = self.centroids @ q
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        candidates = np.concatenate([self._lists[p] for p in probes])
+        if not len(candidates):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        candidates.sort()
+        return _top_k(candidates, self.store.scores(q, candidates), k)
+
+    def search(self, query: QueryLike, k: int = 10, nprobe: int = 8) -> List[Tuple[str, float]]:
+        """同 search_rows，回傳 [(id, 相似度)]"""
+        rows, scores = self.search_rows(query, k, nprobe)
+        return [(self.store.id(int(r)), float(s)) for r, s in zip(rows, scores)]
+
+    # ========== 持久化 ==========
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        寫入索引檔（預設 <store path>.ivf）
+
+        Returns:
+            索引檔路徑
+        """
+        if not self.is_trained:
+            raise ValueError("index must be trained before saving")
+        self._compact()
+        path = path or self.store.path + ".ivf"
+        offsets = np.zeros(self.nlist + 1, dtype="<u8")
+        np.cumsum([len(rows) for rows in self._lists], out=offsets[1:])
+        with open(path, "wb") as f:
+            f.write(_IVF_HEADER.pack(
+                IVF_MAGIC, IVF_VERSION, self.nlist, self.centroids.shape[1], self._count, self.seed
+            ))
+            f.write(self.centroids.astype("<f4").tobytes())
+            f.write(offsets.tobytes())
+            for rows in self._lists:
+                f.write(rows.astype("<u8").tobytes())
+        return path
+
+    @classmethod
+    def load(cls, store: FoldedVectorStore, path: Optional[str] = None) -> "IVFIndex":
+        """讀取索引檔並綁定到儲存"""
+        path = path or store.path + ".ivf"
+        with open(path, "rb") as f:
+            header = f.read(_IVF_HEADER.size)
+            if len(header) < _IVF_HEADER.size:
+                raise ValueError(f"not an IVF index: {path}")
+            magic, version, nlist, dim, count, seed = _IVF_HEADER.unpack(header)
+            if magic != IVF_MAGIC:
+                raise ValueError(f"not an IVF index: {path}")
+            if version != IVF_VERSION:
+                raise ValueError(f"unsupported IVF index version: {version}")
+            if dim != store.dim:
+                raise ValueError(f"index dim {dim} does not match store dim {store.dim}")
+            centroids = np.fromfile(f, dtype="<f4", count=nlist * dim).reshape(nlist, dim)
+            offsets = np.fromfile(f, dtype="<u8", count=nlist + 1).astype(np.int64)
+            rows = np.fromfile(f, dtype="<u8", count=count).astype(np.int64)
+
+        index = cls(store, nlist=nlist, seed=seed)
+        index.centroids = centroids.astype(np.float32)
+        index._lists = [rows[offsets[i]:offsets[i + 1]] for i in range(nlist)]
+        index._pending = [[] for _ in range(nlist)]
+        index._count = count
+        return index
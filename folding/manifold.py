@@ -0,0 +1,170 @@
+"""
+Semantic Manifold — 語義流形與線上統計
+
+USCA 協議棧位置: L1 (Semantic Folding Layer)
+
+ManifoldStats 以固定記憶體逐塊累積折疊向量的流形統計：
+
+- 數量、中心與散佈矩陣以 Welford / Chan 平行合併公式更新
+  （每塊以一次 GEMM 求塊內散佈，再與累積值合併）
+- 半徑以包圍球維護：每塊以「到目前中心的最大距離」形成一個球，
+  再與累積的球取最小包圍球（兩球的最小包圍球有封閉解）；
+  回報的半徑為包圍球半徑加上球心到中心的距離，是最大距離的上界，
+  單一區塊時即為精確值
+- 不同分片的統計可直接 merge()，亦可經 to_dict() / from_dict() 跨行程傳遞
+
+版本: 1.0.0
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class SemanticManifold:
+    """
+    語義流形
+
+    表示一組語義相關的向量在折疊後的結構
+    用於保持語義拓撲
+    """
+    center: List[float]                 # 流形中心
+    radius: float                       # 流形半徑
+    density: float                      # 語義密度
+    concepts: List[str]                 # 涵蓋的概念
+    count: int = 0                      # 向量數
+
+
+class ManifoldStats:
+    """可合併的線上流形統計"""
+
+    def __init__(self, dim: Optional[int] = None):
+        """
+        Args:
+            dim: 向量維度（None 時由第一個區塊決定）
+        """
+        self.count = 0
+        self.mean: Optional[np.ndarray] = None       # (d,) float64
+        self.scatter: Optional[np.ndarray] = None    # (d, d) Σ (x − μ)(x − μ)ᵀ
+        self._ball_center: Optional[np.ndarray] = None
+        self._ball_radius = 0.0
+        if dim is not None:
+            self._init(dim)
+
+    def _init(self, dim: int) -> None:
+        self.mean = np.zeros(dim, dtype=np.float64)
+        self.scatter = np.zeros((dim, dim), dtype=np.float64)
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self.mean is None else len(self.mean)
+
+    @property
+    def radius(self) -> float:
+        """到中心最大距離的上界"""
+        if not self.count:
+            return 0.0
+        return self._ball_radius + float(np.linalg.norm(self._ball_center - self.mean))
+
+    def _enclose(self, center: np.ndarray, radius: float) -> None:
+        """與另一個球取最小包圍球"""
+        if self._ball_center is None:
+            self._ball_center, self._ball_radius = center.copy(), radius
+            return
+        gap = float(np.linalg.norm(center - self._ball_center))
+        if gap + radius <= self._ball_radius:
+            return
+        if gap + self._ball_radius <= radius:
+            self._ball_center, self._ball_radius = center.copy(), radius
+            return
+        enclosing = (gap + self._ball_radius + radius) / 2
+        self._ball_center = self._ball_center + (center - self._ball_center) * ((enclosing - self._ball_radius) / gap)
+        self._ball_radius = enclosing
+
+    def _combine(self, count: int, mean: np.ndarray, scatter: np.ndarray) -> None:
+        """Chan 平行合併（另一組統計以 count / mean / scatter 表示）"""
+        if self.mean is None:
+            self._init(len(mean))
+        elif len(mean) != len(self.mean):
+            raise ValueError(f"dimension mismatch: {len(mean)} != {len(self.mean)}")
+        total = self.count + count
+        delta = mean - self.mean
+        self.scatter += scatter + np.outer(delta, delta) * (self.count * count / total)
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+
+    def update(self, chunk: np.ndarray) -> "ManifoldStats":
+        """併入一個 (m, d) 區塊"""
+        x = np.asarray(chunk, dtype=np.float64)
+        if x.ndim != 2:
+            raise ValueError(f"expected 2-D chunk, got shape {x.shape}")
+        if not len(x):
+            return self
+        chunk_mean = x.mean(axis=0)
+        centered = x - chunk_mean
+        self._combine(len(x), chunk_mean, centered.T @ centered)
+        diff = x - self.mean
+        self._enclose(self.mean, float(np.sqrt(np.einsum("ij,ij->i", diff, diff).max())))
+        return self
+
+    def merge(self, other: "ManifoldStats") -> "ManifoldStats":
+        """併入另一個分片的統計"""
+        if other.count:
+            self._combine(other.count, other.mean, other.scatter)
+            self._enclose(other._ball_center, other._ball_radius)
+        return self
+
+    def covariance(self) -> np.ndarray:
+        """樣本共變異矩陣"""
+        if self.count < 2:
+            return np.zeros_like(self.scatter) if self.scatter is not None else np.zeros((0, 0))
+        return self.scatter / (self.count - 1)
+
+    @property
+    def mean_squared_radius(self) -> float:
+        """到中心的平均平方距離（共變異矩陣的跡）"""
+        return float(np.trace(self.scatter)) / self.count if self.count else 0.0
+
+    def manifold(self, s_star: float, radius: Optional[float] = None) -> SemanticManifold:
+        """
+        轉為 SemanticManifold
+
+        密度以共變異的跡（平均平方半徑）計算：n / E‖x − μ‖² · S★（上限 10）
+
+        Args:
+            s_star: 語義密度常數
+            radius: 精確半徑（已知時取代上界）
+        """
+        if not self.count:
+            return SemanticManifold(center=[], radius=0.0, density=0.0, concepts=[], count=0)
+        density = self.count / max(self.mean_squared_radius, 0.01)
+        return SemanticManifold(
+            center=self.mean.tolist(),
+            radius=self.radius if radius is None else radius,
+            density=min(density * s_star, 10.0),
+            concepts=[],
+            count=self.count
+        )
+
+    def to_dict(self) -> Dict:
+        empty = self.mean is None
+        return {
+            "count": self.count,
+            "mean": [] if empty else self.mean.tolist(),
+            "scatter": [] if empty else self.scatter.tolist(),
+            "ball_center": [] if self._ball_center is None else self._ball_center.tolist(),
+            "ball_radius": self._ball_radius
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ManifoldStats":
+        stats = cls()
+        if data["count"]:
+            stats.count = int(data["count"])
+            stats.mean = np.asarray(data["mean"], dtype=np.float64)
+            stats.scatter = np.asarray(data["scatter"], dtype=np.float64)
+            stats._ball_center = np.asarray(data["ball_center"], dtype=np.float64)
+            stats._ball_radius = float(data["ball_radius"])
+        return stats
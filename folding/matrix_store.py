@@ -0,0 +1,176 @@
+"""
+Matrix Store — 投影矩陣持久化與共享記憶體
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+投影矩陣由 (原始維度, 目標維度, 種子, 方法) 決定，以 fold_key 命名。
+多行程部署時每個 worker 各自生成一份矩陣既耗時又重複佔用記憶體，
+這裡提供兩種共用方式：
+
+- 檔案：<directory>/<fold_key>.npy，首次生成時原子寫入，之後以
+  mmap 唯讀載入；各行程映射同一檔案，共用作業系統的頁快取
+- 共享記憶體：主行程以 SharedMatrix.publish() 發布到
+  multiprocessing.shared_memory，worker 以 attach() 取得唯讀視圖
+
+共享記憶體區段格式：
+
+    header (16 bytes) | 矩陣 (rows × cols f32)
+
+版本: 1.0.0
+"""
+
+import os
+import struct
+import sys
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+SHM_MAGIC = b"SFSM"
+SHM_VERSION = 1
+SHM_PREFIX = "sfproj-"
+
+# magic, version, rows, cols
+_SHM_HEADER = struct.Struct("<4sB3xII")
+
+# 本行程發布的區段名稱（同行程附掛時不取消 tracker 登記）
+_published = set()
+
+
+def shared_matrix_name(fold_key: str) -> str:
+    """fold_key 對應的共享記憶體區段名稱"""
+    return f"{SHM_PREFIX}{fold_key}"
+
+
+def _check_shape(matrix: np.ndarray, shape: Optional[Tuple[int, int]], source: str) -> None:
+    if shape is not None and matrix.shape != tuple(shape):
+        raise ValueError(f"matrix shape mismatch in {source}: {matrix.shape} != {tuple(shape)}")
+
+
+def save_matrix(path: str, matrix: np.ndarray) -> None:
+    """
+    原子寫入 .npy（先寫暫存檔再改名，並行的行程不會讀到半個檔案）
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype="<f4"), allow_pickle=False)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_matrix(path: str, shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    以 mmap 唯讀載入 .npy
+
+    Raises:
+        ValueError: 型別或形狀不符
+    """
+    matrix = np.load(path, mmap_mode="r", allow_pickle=False)
+    if matrix.dtype != np.float32 or matrix.ndim != 2:
+        raise ValueError(f"expected 2-D float32 matrix in {path}, got {matrix.dtype} {matrix.shape}")
+    _check_shape(matrix, shape, path)
+    # 以一般 ndarray 視圖回傳（映射由 base 持有），運算結果不會是 memmap
+    return matrix.view(np.ndarray)
+
+
+class SharedMatrix:
+    """
+    共享記憶體中的 float32 矩陣
+
+    發布者（owner）負責 unlink()；附掛者只 close()
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        magic, version, rows, cols = _SHM_HEADER.unpack_from(shm.buf)
+        if magic != SHM_MAGIC:
+            raise ValueError(f"not a shared matrix segment: {shm.name}")
+        if version != SHM_VERSION:
+            raise ValueError(f"unsupported shared matrix version: {version}")
+        array = np.ndarray((rows, cols), dtype="<f4", buffer=shm.buf, offset=_SHM_HEADER.size)
+        if not owner:
+            array.flags.writeable = False
+        self.array: Optional[np.ndarray] = array
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def publish(cls, name: str, matrix: np.ndarray) -> "SharedMatrix":
+        """
+        建立區段並複製矩陣
+
+        Raises:
+            FileExistsError: 同名區段已存在
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError(f"expected 2-D matrix, got shape {matrix.shape}")
+        size = _SHM_HEADER.size + matrix.nbytes
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _SHM_HEADER.pack_into(shm.buf, 0, SHM_MAGIC, SHM_VERSION, *matrix.shape)
+        shared = cls(shm, owner=True)
+        shared.array[:] = matrix
+        shared.array.flags.writeable = False
+        _published.add(shm.name)
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, shape: Optional[Tuple[int, int]] = None) -> "SharedMatrix":
+        """
+        附掛既有區段，取得唯讀視圖
+
+        Raises:
+            FileNotFoundError: 區段不存在
+            ValueError: 格式或形狀不符
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            if multiprocessing.parent_process() is None and shm.name not in _published:
+                # 獨立行程有自己的 resource tracker，離開時會 unlink 仍登記的區段；
+                # 附掛者不擁有區段，取消登記（multiprocessing 子行程共用發布者的
+                # tracker，重複登記無害，不可取消）
+                resource_tracker.unregister(shm._name, "shared_memory")
+        try:
+            shared = cls(shm, owner=False)
+        except Exception:
+            shm.close()
+            raise
+        actual = shared.array.shape
+        if shape is not None and actual != tuple(shape):
+            shared.close()
+            raise ValueError(f"matrix shape mismatch in {name}: {actual} != {tuple(shape)}")
+        return shared
+
+    def close(self) -> None:
+        """釋放本行程的映射（須先釋放所有由 array 衍生的視圖）"""
+        if self.array is not None:
+            self.array = None
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """移除區段（僅發布者）"""
+        self.close()
+        if self.owner:
+            self._shm.unlink()
+            _published.discard(self._shm.name)
+            self.owner = False
+
+    def __enter__(self) -> "SharedMatrix":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
@@ -0,0 +1,213 @@
+"""
+Streaming PCA — 串流隨機化 SVD 主成分
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+以「合併後截斷」的增量 SVD 學習主成分，記憶體只保留
+ℓ = n_components + oversample 列的草圖（ℓ × d）與一個輸入區塊：
+
+    M = [diag(S) · Vt ; X_chunk − μ_chunk ; 均值修正列]
+    (S, Vt) ← M 的前 ℓ 個奇異值／右奇異向量（隨機化 SVD）
+
+均值修正列 √(n·m / (n+m)) · (μ_old − μ_chunk) 使合併結果等價於
+對全部資料置中（與 sklearn IncrementalPCA 相同的推導）。
+每個區塊的成本為 O((ℓ + m) · d · ℓ)，與資料總量無關。
+
+版本: 1.0.0
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def _orthonormalize(y: np.ndarray) -> np.ndarray:
+    """
+    列空間正交基底（CholeskyQR2：兩次 Cholesky 分解）
+
+    高瘦矩陣上比 Householder QR 快數倍；Gram 矩陣非正定時退回 np.linalg.qr
+    """
+    q = y
+    try:
+        for _ in range(2):
+            r = np.linalg.cholesky((q.T @ q).astype(np.float64)).T
+            q = q @ np.linalg.inv(r).astype(y.dtype)
+    except np.linalg.LinAlgError:
+        q, _ = np.linalg.qr(y)
+    return q
+
+
+def randomized_svd(
+    matrix: np.ndarray,
+    rank: int,
+    power_iters: int = 1,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    隨機化 SVD（Halko et al.）：回傳前 rank 個奇異值與右奇異向量
+
+    Args:
+        matrix: (r, d) 矩陣
+        rank: 保留的秩
+        power_iters: 冪迭代次數（奇異值衰減慢時提高精度）
+        rng: 隨機數產生器
+
+    Returns:
+        (S, Vt)，形狀 (rank,) 與 (rank, d)
+    """
+    if min(matrix.shape) <= rank:
+        _, s, vt = np.linalg.svd(matrix, full_matrices=False)
+        return s[:rank], vt[:rank]
+    rng = rng or np.random.default_rng()
+    omega = rng.standard_normal((matrix.shape[1], rank)).astype(matrix.dtype)
+    q = _orthonormalize(matrix @ omega)
+    for _ in range(power_iters):
+        z = _orthonormalize(matrix.T @ q)
+        q = _orthonormalize(matrix @ z)
+    _, s, vt = np.linalg.svd(q.T @ matrix, full_matrices=False)
+    return s[:rank], vt[:rank]
+
+
+@dataclass
+class PCABasis:
+    """學習到的投影基底"""
+    components: np.ndarray              # (k, d) 正交列
+    mean: np.ndarray                    # (d,) 置中向量（未置中時為 0）
+    explained_variance: np.ndarray      # (k,) 各成分變異
+    n_samples: int                      # 訓練樣本數
+
+    digest: str = field(init=False)     # 基底指紋（用於折疊金鑰）
+
+    def __post_init__(self):
+        h = hashlib.sha256(np.ascontiguousarray(self.components, dtype="<f4").tobytes())
+        h.update(np.ascontiguousarray(self.mean, dtype="<f4").tobytes())
+        self.digest = h.hexdigest()[:16]
+
+    @property
+    def original_dim(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def n_components(self) -> int:
+        return self.components.shape[0]
+
+    def project(self, x: np.ndarray) -> np.ndarray:
+        """投影到主成分（單次矩陣乘法；置中時減去 mean · Wᵀ）"""
+        projected = x @ self.components.T
+        if self.mean.any():
+            projected -= self.mean @ self.components.T
+        return projected
+
+    def save(self, path: str) -> None:
+        """寫入 .npz（不使用 pickle）"""
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                components=self.components.astype("<f4"),
+                mean=self.mean.astype("<f4"),
+                explained_variance=self.explained_variance.astype("<f8"),
+                n_samples=np.array(self.n_samples, dtype="<i8")
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "PCABasis":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                components=data["components"].astype(np.float32),
+                mean=data["mean"].astype(np.float32),
+                explained_variance=data["explained_variance"],
+                n_samples=int(data["n_samples"])
+            )
+
+
+class StreamingPCA:
+    """以隨機化 SVD 合併草圖的增量 PCA"""
+
+    def __init__(
+        self,
+        n_components: int,
+        oversample: int = 10,
+        power_iters: int = 1,
+        center: bool = True,
+        seed: int = 42
+    ):
+        """
+        Args:
+            n_components: 主成分數
+            oversample: 草圖額外保留的列數（提高截斷精度）
+            power_iters: 每次合併的冪迭代次數
+            center: 是否置中（False 時學習未置中的二階矩基底，保留內積）
+            seed: 隨機種子
+        """
+        if n_components <= 0:
+            raise ValueError(f"n_components must be positive, got {n_components}")
+        self.n_components = n_components
+        self.sketch_rank = n_components + oversample
+        self.power_iters = power_iters
+        self.center = center
+        self._rng = np.random.default_rng(seed)
+        self.n_samples = 0
+        self.mean: Optional[np.ndarray] = None
+        self._singular_values: Optional[np.ndarray] = None
+        self._vt: Optional[np.ndarray] = None
+
+    def partial_fit(self, chunk: np.ndarray) -> "StreamingPCA":
+        """併入一個 (m, d) 區塊"""
+        x = np.asarray(chunk, dtype=np.float32)
+        if x.ndim != 2:
+            raise ValueError(f"expected 2-D chunk, got shape {x.shape}")
+        m = len(x)
+        if not m:
+            return self
+        if self.mean is None:
+            if x.shape[1] < self.n_components:
+                raise ValueError(
+                    f"n_components={self.n_components} exceeds input dimension {x.shape[1]}"
+                )
+            self.mean = np.zeros(x.shape[1], dtype=np.float64)
+        elif x.shape[1] != len(self.mean):
+            raise ValueError(f"dimension mismatch: {x.shape[1]} != {len(self.mean)}")
+
+        parts = []
+        if self._vt is not None:
+            parts.append(self._singular_values[:, None].astype(np.float32) * self._vt)
+        if self.center:
+            chunk_mean = x.mean(axis=0, dtype=np.float64)
+            parts.append(x - chunk_mean.astype(np.float32))
+            if self.n_samples:
+                weight = math.sqrt(self.n_samples * m / (self.n_samples + m))
+                parts.append((weight * (self.mean - chunk_mean)).astype(np.float32)[None, :])
+            self.mean = (self.n_samples * self.mean + m * chunk_mean) / (self.n_samples + m)
+        else:
+            parts.append(x)
+
+        merged = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        self._singular_values, self._vt = randomized_svd(
+            merged, self.sketch_rank, self.power_iters, self._rng
+        )
+        self.n_samples += m
+        return self
+
+    def basis(self) -> PCABasis:
+        """取得目前的主成分基底"""
+        if self._vt is None:
+            raise ValueError("no data has been fitted")
+        if self.n_samples < self.n_components:
+            raise ValueError(
+                f"need at least n_components={self.n_components} samples, got {self.n_samples}"
+            )
+        components = self._vt[:self.n_components].astype(np.float32)
+        # 固定符號（每個成分最大絕對值元素為正），同資料同種子結果一致
+        signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+        components *= np.where(signs == 0, 1, signs)[:, None]
+        variance = self._singular_values[:self.n_components].astype(np.float64) ** 2 \
+            / max(self.n_samples - 1, 1)
+        return PCABasis(
+            components=np.ascontiguousarray(components),
+            mean=self.mean.astype(np.float32),
+            explained_variance=variance,
+            n_samples=self.n_samples
+        )
@@ -0,0 +1,219 @@
+"""
+Product Quantization — 折疊向量乘積量化
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+將 d 維向量切成 M 個 d/M 維子空間，每個子空間以 k-means 訓練 256 個
+子質心；每個向量編碼為 M 個 uint8 子質心編號（M 位元組）。
+
+查詢以非對稱距離計算（ADC）：查詢保持 float，先建查表
+LUT[m, j] = q_m · c_{m,j}，每筆相似度只需 M 次查表相加：
+
+    q · x̂ = Σ_m LUT[m, code_m]
+    ‖x̂‖²  = Σ_m ‖c_{m, code_m}‖²    （子空間正交，範數亦可查表）
+
+碼本檔格式（FoldedVectorStore 以 <path>.pq 存放）：
+
+    header | 碼本 (M × ksub × d/M f32)
+
+版本: 1.0.0
+"""
+
+import struct
+from typing import Optional
+
+import numpy as np
+
+
+PQ_MAGIC = b"SFPQ"
+PQ_VERSION = 1
+
+# magic, version, ksub, dim, subspaces
+_PQ_HEADER = struct.Struct("<4sBxHII")
+
+# 批次編碼的列數（暫存 rows × ksub 距離矩陣）
+_ENCODE_ROWS = 16384
+
+
+class ProductQuantizer:
+    """
+    乘積量化器
+
+    先以 train() 訓練子碼本，再 encode() / decode() / adc_scores()
+    """
+
+    def __init__(self, dim: int, subspaces: int = 32, ksub: int = 256, seed: int = 42):
+        """
+        Args:
+            dim: 向量維度（須可被 subspaces 整除）
+            subspaces: 子空間數 M（即每向量位元組數）
+            ksub: 每個子空間的子質心數（≤ 256，編碼為 uint8）
+            seed: 隨機種子
+        """
+        if subspaces <= 0 or dim % subspaces:
+            raise ValueError(f"dim {dim} is not divisible by subspaces={subspaces}")
+        if not 1 < ksub <= 256:
+            raise ValueError(f"ksub must be in (1, 256], got {ksub}")
+        self.dim = dim
+        self.subspaces = subspaces
+        self.ksub = ksub
+        self.dsub = dim // subspaces
+        self.seed = seed
+        self.codebooks: Optional[np.ndarray] = None      # (M, ksub, dsub)
+        self._centroid_norms: Optional[np.ndarray] = None  # (M, ksub) ‖c‖²
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    @property
+    def code_size(self) -> int:
+        """每向量位元組數"""
+        return self.subspaces
+
+    @property
+    def compression_ratio(self) -> float:
+        """相對 float32 的壓縮比"""
+        return self.dim * 4 / self.code_size
+
+    def _assign(self, matrix: np.ndarray, codebooks: np.ndarray, norms: np.ndarray) -> np.ndarray:
+        """(n, dim) 各子空間最近子質心 → (M, n)"""
+        labels = np.empty((self.subspaces, len(matrix)), dtype=np.intp)
+        for m in range(self.subspaces):
+            # ‖x − c‖² = ‖x‖² − 2 x·c + ‖c‖²，‖x‖² 不影響 argmin
+            distances = matrix[:, m * self.dsub:(m + 1) * self.dsub] @ (-2 * codebooks[m].T)
+            distances += norms[m]
+            labels[m] = distances.argmin(axis=1)
+        return labels
+
+    # ========== 訓練 ==========
+
+    def train(self, sample: np.ndarray, iterations: int = 20) -> None:
+        """
+        各子空間同時以 k-means 訓練子碼本
+
+        Args:
+            sample: (n, dim) 訓練向量，n ≥ ksub
+            iterations: k-means 迭代次數
+        """
+        sample = np.asarray(sample, dtype=np.float32)
+        if sample.ndim != 2 or sample.shape[1] != self.dim:
+            raise ValueError(f"expected (n, {self.dim}) sample, got shape {sample.shape}")
+        n = len(sample)
+        if n < self.ksub:
+            raise ValueError(f"need at least ksub={self.ksub} training vectors, got {n}")
+        rng = np.random.default_rng(self.seed)
+        # (M, n, dsub) 子向量
+        sub = np.ascontiguousarray(sample.reshape(n, self.subspaces, self.dsub).transpose(1, 0, 2))
+        m_index = np.arange(self.subspaces)[:, None]
+
+        picks = np.stack([rng.choice(n, size=self.ksub, replace=False) for _ in range(self.subspaces)])
+        codebooks = sub[m_index, picks]
+        for _ in range(iterations):
+            labels = self._assign(sample, codebooks, np.einsum("mkd,mkd->mk", codebooks, codebooks))
+            # 以 (子空間, 子質心) 攤平編號，bincount 一次求所有子空間的和
+            flat = (labels + m_index * self.ksub).ravel()
+            size = self.subspaces * self.ksub
+            counts = np.bincount(flat, minlength=size).reshape(self.subspaces, self.ksub)
+            sums = np.stack([
+                np.bincount(flat, weights=sub[:, :, j].ravel(), minlength=size)
+                for j in range(self.dsub)
+            ], axis=1).reshape(self.subspaces, self.ksub, self.dsub)
+            nonempty = counts > 0
+            codebooks = np.where(
+                nonempty[:, :, None], sums / np.maximum(counts, 1)[:, :, None], codebooks
+            ).astype(np.float32)
+            # 空子質心以隨機樣本重新播種
+            empty_m, empty_k = np.nonzero(~nonempty)
+            if len(empty_m):
+                codebooks[empty_m, empty_k] = sub[empty_m, rng.integers(0, n, len(empty_m))]
+
+        self._set_codebooks(codebooks)
+
+    def _set_codebooks(self, codebooks: np.ndarray) -> None:
+        self.codebooks = np.ascontiguousarray(codebooks, dtype=np.float32)
+        self._centroid_norms = np.einsum("mkd,mkd->mk", self.codebooks, self.codebooks)
+
+    def _require_trained(self) -> None:
+        if not self.is_trained:
+            raise ValueError("product quantizer must be trained first")
+
+    # ========== 編碼 ==========
+
+    def encode(self, matrix: np.ndarray) -> np.ndarray:
+        """(n, dim) → (n, M) uint8 編碼"""
+        self._require_trained()
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f"expected (n, {self.dim}) vectors, got shape {matrix.shape}")
+        codes = np.empty((len(matrix), self.subspaces), dtype=np.uint8)
+        for start in range(0, len(matrix), _ENCODE_ROWS):
+            block = matrix[start:start + _ENCODE_ROWS]
+            codes[start:start + _ENCODE_ROWS] = self._assign(block, self.codebooks, self._centroid_norms).T
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """(n, M) 編碼 → (n, dim) float32 重建向量"""
+        self._require_trained()
+        codes = np.asarray(codes)
+        parts = self.codebooks[np.arange(self.subspaces), codes]   # (n, M, dsub)
+        return parts.reshape(len(codes), self.dim)
+
+    # ========== ADC 查詢 ==========
+
+    def lookup_table(self, query: np.ndarray) -> np.ndarray:
+        """查詢內積查表 (M, ksub)"""
+        self._require_trained()
+        q = np.asarray(query, dtype=np.float32).reshape(self.subspaces, 1, self.dsub)
+        return np.matmul(q, self.codebooks.transpose(0, 2, 1))[:, 0, :]
+
+    def adc_scores(self, codes: np.ndarray, table: np.ndarray, normalize: bool = True) -> np.ndarray:
+        """
+        以查表計算查詢與編碼向量的相似度
+
+        Args:
+            codes: (n, M) 編碼
+            table: lookup_table() 的結果
+            normalize: 是否除以重建向量範數（單位查詢時即為餘弦）
+        """
+        n = len(codes)
+        columns = np.ascontiguousarray(np.asarray(codes).T)   # 逐子空間連續讀取
+        dots = np.zeros(n, dtype=np.float32)
+        norms = np.zeros(n, dtype=np.float32) if normalize else None
+        for m in range(self.subspaces):
+            dots += table[m].take(columns[m])
+            if normalize:
+                norms += self._centroid_norms[m].take(columns[m])
+        if not normalize:
+            return dots
+        norms = np.sqrt(norms)
+        return np.divide(dots, norms, out=np.zeros(n, dtype=np.float32), where=norms > 1e-10)
+
+    # ========== 持久化 ==========
+
+    def save(self, path: str) -> None:
+        """寫入碼本檔"""
+        self._require_trained()
+        with open(path, "wb") as f:
+            f.write(_PQ_HEADER.pack(PQ_MAGIC, PQ_VERSION, self.ksub, self.dim, self.subspaces))
+            f.write(self.codebooks.astype("<f4").tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "ProductQuantizer":
+        """讀取碼本檔"""
+        with open(path, "rb") as f:
+            header = f.read(_PQ_HEADER.size)
+            if len(header) < _PQ_HEADER.size:
+                raise ValueError(f"not a product quantizer file: {path}")
+            magic, version, ksub, dim, subspaces = _PQ_HEADER.unpack(header)
+            if magic != PQ_MAGIC:
+                raise ValueError(f"not a product quantizer file: {path}")
+            if version != PQ_VERSION:
+                raise ValueError(f"unsupported product quantizer version: {version}")
+            quantizer = cls(dim, subspaces=subspaces, ksub=ksub)
+            count = subspaces * ksub * quantizer.dsub
+            codebooks = np.fromfile(f, dtype="<f4", count=count)
+        if len(codebooks) != count:
+            raise ValueError(f"truncated product quantizer file: {path}")
+        quantizer._set_codebooks(codebooks.reshape(subspaces, ksub, quantizer.dsub))
+        return quantizer
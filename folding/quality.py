@@ -0,0 +1,164 @@
+"""
+Folding Quality — 折疊品質評估
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+以抽樣的向量對比較折疊前後的餘弦相似度，回報失真分布：
+
+    distortion = cos(fold(x), fold(y)) − cos(x, y)
+
+輸入可為串流：以水庫抽樣（Algorithm R，逐塊向量化）保留固定數量的
+樣本，記憶體與語料大小無關；只有樣本需要折疊，成本可控，
+適合放在週期性背景工作中監控或決定目標維度。
+
+版本: 1.0.0
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Reservoir:
+    """固定容量的均勻水庫抽樣（逐塊加入）"""
+
+    def __init__(self, capacity: int, seed: int = 42):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._sample: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return min(self.seen, self.capacity)
+
+    @property
+    def sample(self) -> np.ndarray:
+        """目前的樣本 (≤ capacity, d)"""
+        if self._sample is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._sample[:len(self)]
+
+    def add(self, chunk: np.ndarray) -> None:
+        """加入一個 (m, d) 區塊"""
+        chunk = np.asarray(chunk)
+        m = len(chunk)
+        if not m:
+            return
+        if self._sample is None:
+            self._sample = np.empty((self.capacity, chunk.shape[1]), dtype=chunk.dtype)
+        elif chunk.shape[1] != self._sample.shape[1]:
+            raise ValueError(f"dimension mismatch: {chunk.shape[1]} != {self._sample.shape[1]}")
+
+        # 先填滿水庫
+        fill = min(max(self.capacity - self.seen, 0), m)
+        if fill:
+            self._sample[self.seen:self.seen + fill] = chunk[:fill]
+        # 其餘第 t 筆（全域索引）以機率 capacity / (t + 1) 取代隨機位置；
+        # 同一位置多次命中時以後出現者為準，與逐筆演算法一致
+        if fill < m:
+            positions = np.arange(self.seen + fill, self.seen + m)
+            slots = self._rng.integers(0, positions + 1)
+            accepted = np.flatnonzero(slots < self.capacity)
+            self._sample[slots[accepted]] = chunk[fill + accepted]
+        self.seen += m
+
+
+@dataclass
+class DistortionReport:
+    """折疊後成對餘弦相似度的失真統計"""
+    method: str                         # 折疊方法
+    original_dim: int                   # 原始維度
+    folded_dim: int                     # 折疊維度
+    vectors_seen: int                   # 串流中的向量數
+    sample_size: int                    # 抽樣向量數
+    pairs: int                          # 抽樣向量對數
+    mean_abs_error: float               # 平均 |失真|
+    bias: float                         # 平均有號失真（>0 表示折疊後更相似）
+    correlation: float                  # 折疊前後餘弦的 Pearson 相關
+    quantiles: Dict[str, float]         # |失真| 分位數，如 {"p50": …, "p99": …}
+    max_abs_error: float                # 最大 |失真|
+
+    def to_dict(self) -> Dict:
+        return {
+            "method": self.method,
+            "original_dim": self.original_dim,
+            "folded_dim": self.folded_dim,
+            "vectors_seen": self.vectors_seen,
+            "sample_size": self.sample_size,
+            "pairs": self.pairs,
+            "mean_abs_error": self.mean_abs_error,
+            "bias": self.bias,
+            "correlation": self.correlation,
+            "quantiles": self.quantiles,
+            "max_abs_error": self.max_abs_error
+        }
+
+
+def sample_pairs(n: int, pairs: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """均勻抽樣 i ≠ j 的索引對（可重複）"""
+    if n < 2:
+        raise ValueError(f"need at least 2 vectors to sample pairs, got {n}")
+    left = rng.integers(0, n, pairs)
+    # 在 n − 1 個其他位置中抽樣，避免 i == j
+    right = rng.integers(0, n - 1, pairs)
+    right += right >= left
+    return left, right
+
+
+def pair_cosines(matrix: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """向量化計算抽樣對的餘弦相似度"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1)
+    norms = np.where(norms < 1e-10, 1.0, norms)
+    dots = np.einsum("ij,ij->i", matrix[left], matrix[right])
+    return dots / (norms[left] * norms[right])
+
+
+def distortion_report(
+    original: np.ndarray,
+    folded: np.ndarray,
+    pairs: int,
+    rng: np.random.Generator,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    method: str = "",
+    vectors_seen: Optional[int] = None
+) -> DistortionReport:
+    """
+    比較樣本折疊前後的成對餘弦
+
+    Args:
+        original: (n, D) 原始樣本
+        folded: (n, d) 對應的折疊樣本
+        pairs: 抽樣向量對數
+        rng: 隨機數產生器
+        quantiles: |失真| 分位數（0–1）
+        method: 折疊方法名稱
+        vectors_seen: 串流總數（預設為樣本數）
+    """
+    left, right = sample_pairs(len(original), pairs, rng)
+    before = pair_cosines(original, left, right)
+    after = pair_cosines(folded, left, right)
+    error = after - before
+    abs_error = np.abs(error)
+    spread = float(before.std() * after.std())
+    correlation = float(np.mean((before - before.mean()) * (after - after.mean())) / spread) if spread > 0 else 0.0
+    values = np.quantile(abs_error, quantiles) if len(quantiles) else []
+    return DistortionReport(
+        method=method,
+        original_dim=original.shape[1],
+        folded_dim=folded.shape[1],
+        vectors_seen=len(original) if vectors_seen is None else vectors_seen,
+        sample_size=len(original),
+        pairs=pairs,
+        mean_abs_error=float(abs_error.mean()),
+        bias=float(error.mean()),
+        correlation=correlation,
+        quantiles={f"p{q * 100:g}": float(v) for q, v in zip(quantiles, values)},
+        max_abs_error=float(abs_error.max())
+    )
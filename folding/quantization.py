@@ -0,0 +1,172 @@
+"""
+Folded Vector Quantization — 折疊向量量化
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+折疊向量的緊湊表示與量化域相似度：
+- FLOAT16：半精度，相似度以 float32 計算
+- INT8：逐向量縮放（scale = max|v| / 127），相似度以 int32 內積計算，
+  餘弦相似度中 scale 互相抵消
+- BINARY：1-bit 符號碼（隨機超平面 SimHash），以 popcount 計算 Hamming
+  距離 h，相似度估計為 cos(π·h / d)
+
+版本: 1.0.0
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+
+class QuantizationMode(Enum):
+    """量化模式"""
+    FLOAT16 = "FLOAT16"     # 半精度浮點
+    INT8 = "INT8"           # 逐向量縮放 int8
+    BINARY = "BINARY"       # 1-bit 符號碼
+
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """uint8 陣列逐元素 popcount"""
+    bitwise_count = getattr(np, "bitwise_count", None)  # NumPy >= 2.0
+    if bitwise_count is not None:
+        return bitwise_count(bits)
+    return _POPCOUNT_TABLE[bits]
+
+
+def _encode(matrix: np.ndarray, mode: QuantizationMode):
+    """量化 (n, d) 矩陣，回傳 (codes, scales)"""
+    if mode == QuantizationMode.FLOAT16:
+        return matrix.astype(np.float16), None
+    if mode == QuantizationMode.INT8:
+        peak = np.abs(matrix).max(axis=1)
+        scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+    if mode == QuantizationMode.BINARY:
+        return np.packbits(matrix > 0, axis=1), None
+    raise ValueError(f"unsupported quantization mode: {mode}")
+
+
+def _int8_norms(codes: np.ndarray) -> np.ndarray:
+    wide = codes.astype(np.int32)
+    return np.sqrt(np.einsum("ij,ij->i", wide, wide).astype(np.float64))
+
+
+@dataclass
+class QuantizedVector:
+    """量化後的單一折疊向量"""
+    codes: np.ndarray                   # float16 / int8 / 打包位元 uint8
+    dim: int                            # 折疊維度
+    mode: QuantizationMode              # 量化模式
+    scale: float = 1.0                  # INT8 縮放係數
+
+    @property
+    def nbytes(self) -> int:
+        extra = 4 if self.mode == QuantizationMode.INT8 else 0
+        return self.codes.nbytes + extra
+
+    def dequantize(self) -> np.ndarray:
+        """還原為 float32 向量（BINARY 還原為 ±1/√d）"""
+        if self.mode == QuantizationMode.FLOAT16:
+            return self.codes.astype(np.float32)
+        if self.mode == QuantizationMode.INT8:
+            return self.codes.astype(np.float32) * np.float32(self.scale)
+        signs = np.unpackbits(self.codes, count=self.dim).astype(np.float32) * 2 - 1
+        return signs / np.float32(np.sqrt(self.dim))
+
+    def similarity(self, other: "QuantizedVector") -> float:
+        """量化域餘弦相似度（兩者須為相同模式與維度）"""
+        if self.mode != other.mode or self.dim != other.dim:
+            raise ValueError("quantized vectors must share mode and dimension")
+        if self.mode == QuantizationMode.BINARY:
+            hamming = int(_popcount(np.bitwise_xor(self.codes, other.codes)).sum(dtype=np.int64))
+            return float(np.cos(np.pi * hamming / self.dim))
+        if self.mode == QuantizationMode.INT8:
+            a = self.codes.astype(np.int32)
+            b = other.codes.astype(np.int32)
+            denom = float(np.sqrt(float(a @ a) * float(b @ b)))
+            return float(a @ b) / denom if denom > 0 else 0.0
+        a = self.codes.astype(np.float32)
+        b = other.codes.astype(np.float32)
+        denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return float(a @ b) / denom if denom > 1e-10 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "codes": self.codes.tobytes().hex(),
+            "dim": self.dim,
+            "mode": self.mode.value,
+            "scale": self.scale
+        }
+
+
+@dataclass
+class QuantizedBatch:
+    """量化後的折疊向量矩陣"""
+    codes: np.ndarray                   # (n, d) 或 (n, ⌈d/8⌉)
+    dim: int                            # 折疊維度
+    mode: QuantizationMode              # 量化模式
+    scales: Optional[np.ndarray] = None  # INT8 逐列縮放係數
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    def __getitem__(self, index: int) -> QuantizedVector:
+        scale = float(self.scales[index]) if self.scales is not None else 1.0
+        return QuantizedVector(codes=self.codes[index], dim=self.dim, mode=self.mode, scale=scale)
+
+    def __iter__(self) -> Iterator[QuantizedVector]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def dequantize(self) -> np.ndarray:
+        """還原為 float32 矩陣"""
+        if self.mode == QuantizationMode.FLOAT16:
+            return self.codes.astype(np.float32)
+        if self.mode == QuantizationMode.INT8:
+            return self.codes.astype(np.float32) * self.scales[:, None]
+        signs = np.unpackbits(self.codes, axis=1, count=self.dim).astype(np.float32) * 2 - 1
+        return signs / np.float32(np.sqrt(self.dim))
+
+    def similarities(self, query: QuantizedVector) -> np.ndarray:
+        """批次量化域餘弦相似度"""
+        if query.mode != self.mode or query.dim != self.dim:
+            raise ValueError("query must share mode and dimension with the batch")
+        if self.mode == QuantizationMode.BINARY:
+            hamming = _popcount(np.bitwise_xor(self.codes, query.codes)).sum(axis=1, dtype=np.int64)
+            return np.cos(np.pi * hamming / self.dim)
+        if self.mode == QuantizationMode.INT8:
+            q = query.codes.astype(np.int32)
+            dots = self.codes.astype(np.int32) @ q
+            denom = _int8_norms(self.codes) * np.sqrt(float(q @ q))
+            return np.divide(dots, denom, out=np.zeros(len(self)), where=denom > 0)
+        matrix = self.codes.astype(np.float32)
+        q = query.codes.astype(np.float32)
+        denom = np.linalg.norm(matrix, axis=1) * np.linalg.norm(q)
+        return np.divide(matrix @ q, denom, out=np.zeros(len(self), dtype=np.float32), where=denom > 1e-10)
+
+
+def quantize(vector: np.ndarray, mode: QuantizationMode) -> QuantizedVector:
+    """量化單一向量"""
+    vector = np.asarray(vector, dtype=np.float32)
+    codes, scales = _encode(vector[None, :], mode)
+    scale = float(scales[0]) if scales is not None else 1.0
+    return QuantizedVector(codes=codes[0], dim=len(vector), mode=mode, scale=scale)
+
+
+def quantize_batch(matrix: np.ndarray, mode: QuantizationMode) -> QuantizedBatch:
+    """量化 (n, d) 矩陣"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError(f"expected 2-D matrix, got shape {matrix.shape}")
+    codes, scales = _encode(matrix, mode)
+    return QuantizedBatch(codes=codes, dim=matrix.shape[1], mode=mode, scales=scales)
@@ -18,22 +18,55 @@ USCA 協議棧位置: L1 (Semantic Folding Layer)
 """
 
 import math
+import os
 import random
 import hashlib
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
+import numpy as np
+
+from .alignment import AlignmentOperator, evaluate_alignment, fit_procrustes
+from .feature_hashing import HashFamily, feature_hash_projection
+from .manifold import ManifoldStats, SemanticManifold
+from .matrix_store import SharedMatrix, load_matrix, save_matrix, shared_matrix_name
+from .pca import PCABasis, StreamingPCA
+from .quality import DEFAULT_QUANTILES, DistortionReport, Reservoir, distortion_report
+from .quantization import (
+    QuantizationMode,
+    QuantizedBatch,
+    QuantizedVector,
+    quantize,
+    quantize_batch,
+)
+from .sparse_projection import ACHLIOPTAS_DENSITY, SparseProjection, very_sparse_density
+
 
 class FoldingMethod(Enum):
     """折疊方法"""
     RANDOM_PROJECTION = "RANDOM_PROJECTION"  # 隨機投影
+    SPARSE_PROJECTION = "SPARSE_PROJECTION"  # 稀疏隨機投影（Achlioptas）
+    VERY_SPARSE_PROJECTION = "VERY_SPARSE_PROJECTION"  # 極稀疏隨機投影（Li et al.）
     PCA_LIKE = "PCA_LIKE"                    # 類 PCA 降維
+    PCA = "PCA"                              # 擬合 PCA（需先 fit）
     LOCALITY_SENSITIVE = "LSH"               # 局部敏感雜湊
-    SEMANTIC_HASH = "SEMANTIC_HASH"          # 語義雜湊
+    SEMANTIC_HASH = "SEMANTIC_HASH"          # 語義雜湊（有號特徵雜湊）
     HYBRID = "HYBRID"                        # 混合方法
 
 
+# 以隨機數產生器抽樣矩陣的方法，fold_key 併入產生器版本：
+# 矩陣原以 random.gauss 逐元素生成，改為 numpy 後同一 seed 的空間不同
+_GENERATED_METHODS = frozenset({
+    FoldingMethod.RANDOM_PROJECTION,
+    FoldingMethod.SPARSE_PROJECTION,
+    FoldingMethod.VERY_SPARSE_PROJECTION,
+    FoldingMethod.LOCALITY_SENSITIVE,
+    FoldingMethod.HYBRID,
+})
+_PROJECTION_GENERATOR = "numpy-pcg64-v1"    # 變更抽樣方式時遞增
+
+
 @dataclass
 class FoldedVector:
     """折疊後的向量"""
@@ -62,17 +95,54 @@ class FoldedVector:
 
 
 @dataclass
-class SemanticManifold:
+class FoldedBatch:
     """
-    語義流形
-    
-    表示一組語義相關的向量在折疊後的結構
-    用於保持語義拓撲
+    批次折疊結果（以陣列儲存，不為每列建立 FoldedVector）
+
+    vectors 形狀為 (n, folded_dim)，float32；索引取出單列時才建立 FoldedVector
     """
-    center: List[float]                 # 流形中心
-    radius: float                       # 流形半徑
-    density: float                      # 語義密度
-    concepts: List[str]                 # 涵蓋的概念
+    vectors: np.ndarray                 # 折疊後的向量矩陣
+    preservation_scores: np.ndarray     # 各列語義保留度
+    original_dim: int                   # 原始維度
+    method: FoldingMethod               # 使用的方法
+    fold_key: str = ""                  # 折疊金鑰
+
+    @property
+    def folded_dim(self) -> int:
+        return self.vectors.shape[1]
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.original_dim / self.folded_dim if self.folded_dim else 0.0
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def __getitem__(self, index: int) -> FoldedVector:
+        return FoldedVector(
+            vector=self.vectors[index].tolist(),
+            original_dim=self.original_dim,
+            folded_dim=self.folded_dim,
+            method=self.method,
+            preservation_score=float(self.preservation_scores[index]),
+            compression_ratio=self.compression_ratio,
+            fold_key=self.fold_key
+        )
+
+    def __iter__(self) -> Iterator[FoldedVector]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_dict(self) -> Dict:
+        return {
+            "vectors": self.vectors.tolist(),
+            "original_dim": self.original_dim,
+            "folded_dim": self.folded_dim,
+            "method": self.method.value,
+            "preservation_scores": self.preservation_scores.tolist(),
+            "compression_ratio": self.compression_ratio,
+            "fold_key": self.fold_key
+        }
 
 
 class SemanticFolder:
@@ -89,13 +159,17 @@ class SemanticFolder:
     
     # 預設配置
     DEFAULT_TARGET_DIM = 256
+    DEFAULT_BATCH_ROWS = 8192   # 單次 GEMM 的最大列數（限制暫存記憶體）
     S_STAR = 2.76  # 語義密度常數（來自安安的 SIP 協議）
     
     def __init__(
         self,
         target_dim: int = DEFAULT_TARGET_DIM,
         method: FoldingMethod = FoldingMethod.HYBRID,
-        seed: int = 42
+        seed: int = 42,
+        matrix_dir: Optional[str] = None,
+        shared: bool = False,
+        hash_family: HashFamily = HashFamily.MURMUR3
     ):
         """
         初始化折疊器
@@ -104,14 +178,30 @@ class SemanticFolder:
             target_dim: 目標維度
             method: 折疊方法
             seed: 隨機種子（確保可重現）
+            matrix_dir: 投影矩陣目錄（<fold_key>.npy，首次生成時寫入，之後 mmap 載入）
+            shared: 是否優先附掛主行程以 publish_shared() 發布的共享記憶體矩陣
+            hash_family: 語義雜湊（特徵雜湊）使用的雜湊族
         """
         self.target_dim = target_dim
         self.method = method
         self.seed = seed
         self.random = random.Random(seed)
-        
-        # 投影矩陣快取
-        self._projection_cache: Dict[int, List[List[float]]] = {}
+        self.matrix_dir = matrix_dir
+        self.shared = shared
+        self.hash_family = hash_family
+        
+        # 投影矩陣快取（float32 連續矩陣，形狀 target_dim × original_dim）
+        self._projection_cache: Dict[int, np.ndarray] = {}
+        # 由投影矩陣衍生的線性算子快取（PCA_LIKE / HYBRID / SEMANTIC_HASH）
+        self._operator_cache: Dict[Tuple[FoldingMethod, int], np.ndarray] = {}
+        # 稀疏投影矩陣快取（CSR）
+        self._sparse_cache: Dict[Tuple[FoldingMethod, int], SparseProjection] = {}
+        # 擬合的 PCA 基底（依原始維度）
+        self._pca_bases: Dict[int, PCABasis] = {}
+        # 跨模型對齊算子（依 (模型 A, 模型 B)）
+        self._alignments: Dict[Tuple[str, str], AlignmentOperator] = {}
+        # 共享記憶體矩陣（依 fold_key；發布或附掛）
+        self._shared_matrices: Dict[str, SharedMatrix] = {}
     
     def fold(
         self,
@@ -141,29 +231,19 @@ class SemanticFolder:
                 compression_ratio=1.0
             )
         
-        # 根據方法選擇折疊策略
-        if self.method == FoldingMethod.RANDOM_PROJECTION:
-            folded = self._random_projection(vector)
-        elif self.method == FoldingMethod.PCA_LIKE:
-            folded = self._pca_like_fold(vector)
-        elif self.method == FoldingMethod.LOCALITY_SENSITIVE:
-            folded = self._lsh_fold(vector)
-        elif self.method == FoldingMethod.SEMANTIC_HASH:
-            folded = self._semantic_hash_fold(vector)
-        else:  # HYBRID
-            folded = self._hybrid_fold(vector)
-        
-        # 正規化
-        folded = self._normalize(folded)
+        x = np.asarray(vector, dtype=np.float32)
+        
+        # 根據方法選擇折疊策略並正規化
+        folded = self._normalize(self._fold_rows(x))
         
         # 計算保留度
-        preservation = self._estimate_preservation(vector, folded)
+        preservation = self._estimate_preservation(x, folded)
         
         # 生成折疊金鑰
         fold_key = self._generate_fold_key(original_dim, self.target_dim)
         
         return FoldedVector(
-            vector=folded,
+            vector=folded.tolist(),
             original_dim=original_dim,
             folded_dim=len(folded),
             method=self.method,
@@ -193,247 +273,653 @@ class SemanticFolder:
             return folded.vector.copy()
         
         # 使用轉置投影矩陣進行反投影
-        projection = self._get_projection_matrix(folded.original_dim)
-        
-        # 反投影
-        restored = [0.0] * folded.original_dim
-        for i in range(folded.original_dim):
-            for j in range(folded.folded_dim):
-                restored[i] += folded.vector[j] * projection[j][i]
+        folded_vec = np.asarray(folded.vector, dtype=np.float32)
+        if folded.method in (FoldingMethod.SPARSE_PROJECTION, FoldingMethod.VERY_SPARSE_PROJECTION):
+            restored = self._get_sparse_projection(folded.method, folded.original_dim).rmatvec(folded_vec)
+        elif folded.method == FoldingMethod.PCA:
+            # 投影回主子空間（置中基底時為去均值後的方向）
+            restored = folded_vec @ self._get_pca_basis(folded.original_dim).components
+        elif folded.method == FoldingMethod.SEMANTIC_HASH:
+            restored = folded_vec @ self._get_operator(FoldingMethod.SEMANTIC_HASH, folded.original_dim)
+        else:
+            restored = folded_vec @ self._get_projection_matrix(folded.original_dim)
         
         # 如果有提示向量，進行混合
         if hint_vector and len(hint_vector) == folded.original_dim:
             alpha = 0.3  # 提示權重
-            restored = [
-                (1 - alpha) * r + alpha * h
-                for r, h in zip(restored, hint_vector)
-            ]
+            restored = (1 - alpha) * restored + alpha * np.asarray(hint_vector, dtype=np.float32)
         
-        return self._normalize(restored)
+        return self._normalize(restored).tolist()
     
     def compute_similarity(
         self,
-        folded1: FoldedVector,
-        folded2: FoldedVector
+        folded1: Union[FoldedVector, QuantizedVector],
+        folded2: Union[FoldedVector, QuantizedVector]
     ) -> float:
         """
         計算折疊向量的相似度
         
         這是語義折疊的核心保證：
         折疊後的相似度應該近似原始相似度
+        
+        兩者皆為相同模式的量化向量時直接在量化域計算
+        （INT8 以整數內積、BINARY 以 popcount Hamming 距離）；
+        混合時將量化向量還原後以浮點計算
         """
-        if len(folded1.vector) != len(folded2.vector):
+        if isinstance(folded1, QuantizedVector) and isinstance(folded2, QuantizedVector):
+            if folded1.mode != folded2.mode or folded1.dim != folded2.dim:
+                return 0.0
+            return folded1.similarity(folded2)
+        
+        v1 = folded1.dequantize() if isinstance(folded1, QuantizedVector) else folded1.vector
+        v2 = folded2.dequantize() if isinstance(folded2, QuantizedVector) else folded2.vector
+        if len(v1) != len(v2):
             return 0.0
         
-        return self._cosine_similarity(folded1.vector, folded2.vector)
+        return self._cosine_similarity(v1, v2)
+    
+    def quantize(
+        self,
+        folded: Union[FoldedVector, FoldedBatch],
+        mode: QuantizationMode = QuantizationMode.INT8
+    ) -> Union[QuantizedVector, QuantizedBatch]:
+        """
+        將折疊結果量化為緊湊表示
+        
+        Args:
+            folded: FoldedVector 或 FoldedBatch
+            mode: 量化模式（FLOAT16 / INT8 / BINARY）
+        
+        Returns:
+            QuantizedVector 或 QuantizedBatch
+        """
+        if isinstance(folded, FoldedBatch):
+            return quantize_batch(folded.vectors, mode)
+        return quantize(np.asarray(folded.vector, dtype=np.float32), mode)
     
     def fold_batch(
         self,
-        vectors: List[List[float]],
-        preserve_topology: bool = True
-    ) -> Tuple[List[FoldedVector], SemanticManifold]:
+        vectors: Union[np.ndarray, Sequence[Sequence[float]], Iterable[np.ndarray]],
+        preserve_topology: bool = True,
+        batch_rows: int = DEFAULT_BATCH_ROWS
+    ) -> Tuple[FoldedBatch, SemanticManifold]:
         """
         批次折疊並計算語義流形
         
+        每個區塊以單次矩陣乘法（GEMM）折疊，正規化、保留度與流形統計皆向量化
+        
         Args:
-            vectors: 向量列表
+            vectors: 2-D 陣列 / 向量列表，或逐塊產生 2-D 陣列的迭代器
             preserve_topology: 是否保留拓撲
+            batch_rows: 單次 GEMM 的最大列數
         
         Returns:
-            (折疊向量列表, 語義流形)
+            (FoldedBatch, 語義流形)
         """
-        if not vectors:
-            return [], SemanticManifold(
-                center=[], radius=0.0, density=0.0, concepts=[]
+        stats = ManifoldStats()
+        parts = list(self.fold_stream(vectors, stats, batch_rows))
+        original_dim = parts[-1].original_dim if parts else None
+        
+        if not stats.count:
+            dim = original_dim if original_dim and original_dim <= self.target_dim else self.target_dim
+            empty = FoldedBatch(
+                vectors=np.empty((0, dim), dtype=np.float32),
+                preservation_scores=np.empty(0, dtype=np.float32),
+                original_dim=original_dim or 0,
+                method=self.method
             )
+            return empty, stats.manifold(self.S_STAR)
+        
+        folded_all = np.concatenate([p.vectors for p in parts]) if len(parts) > 1 else parts[0].vectors
+        batch = FoldedBatch(
+            vectors=folded_all,
+            preservation_scores=np.concatenate([p.preservation_scores for p in parts]),
+            original_dim=original_dim,
+            method=self.method,
+            fold_key=parts[0].fold_key
+        )
+        
+        # 已持有全部向量，以精確半徑取代串流上界
+        return batch, stats.manifold(self.S_STAR, radius=self._max_distance(folded_all, stats.mean, batch_rows))
+    
+    def fold_stream(
+        self,
+        vectors: Union[np.ndarray, Sequence[Sequence[float]], Iterable[np.ndarray]],
+        stats: Optional[ManifoldStats] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS
+    ) -> Iterator[FoldedBatch]:
+        """
+        串流折疊：逐塊產生 FoldedBatch，並線上更新流形統計
+        
+        記憶體與語料大小無關；各 worker 的 stats 可以 ManifoldStats.merge 合併，
+        最後以 stats.manifold(SemanticFolder.S_STAR) 取得流形
+        
+        Args:
+            vectors: 2-D 陣列 / 向量列表，或逐塊產生 2-D 陣列的迭代器
+            stats: 要更新的流形統計（None 表示不累積）
+            batch_rows: 單次 GEMM 的最大列數
+        
+        Yields:
+            每個區塊的 FoldedBatch
+        """
+        fold_key = None
+        for chunk in self._iter_chunks(vectors, batch_rows):
+            original_dim = chunk.shape[1]
+            if fold_key is None:
+                fold_key = (
+                    self._generate_fold_key(original_dim, self.target_dim)
+                    if original_dim > self.target_dim else ""
+                )
+            folded, preservation = self._fold_chunk(chunk)
+            if stats is not None:
+                stats.update(folded)
+            yield FoldedBatch(
+                vectors=folded,
+                preservation_scores=preservation,
+                original_dim=original_dim,
+                method=self.method,
+                fold_key=fold_key
+            )
+    
+    def evaluate(
+        self,
+        vectors: Union[np.ndarray, Sequence[Sequence[float]], Iterable[np.ndarray]],
+        pairs: int = 10000,
+        sample_size: int = 2048,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        batch_rows: int = DEFAULT_BATCH_ROWS
+    ) -> DistortionReport:
+        """
+        評估折疊品質：成對餘弦相似度的失真分布
+        
+        以水庫抽樣從（可為串流的）輸入保留 sample_size 筆，只折疊樣本，
+        再抽樣 pairs 對比較折疊前後的餘弦；成本與語料大小無關
+        
+        Args:
+            vectors: 2-D 陣列 / 向量列表，或逐塊產生 2-D 陣列的迭代器
+            pairs: 抽樣向量對數
+            sample_size: 水庫容量
+            quantiles: |失真| 分位數（0–1）
+            batch_rows: 讀取區塊的最大列數
+        
+        Returns:
+            DistortionReport
+        """
+        if pairs <= 0:
+            raise ValueError(f"pairs must be positive, got {pairs}")
+        reservoir = Reservoir(sample_size, seed=self.seed)
+        for chunk in self._iter_chunks(vectors, batch_rows):
+            reservoir.add(chunk)
+        sample = reservoir.sample
+        folded, _ = self._fold_chunk(sample)
+        return distortion_report(
+            sample, folded, pairs, np.random.default_rng(self.seed), quantiles,
+            method=self.method.value, vectors_seen=reservoir.seen
+        )
+    
+    def fit(
+        self,
+        vectors: Union[np.ndarray, Sequence[Sequence[float]], Iterable[np.ndarray]],
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        center: bool = False,
+        oversample: int = 10,
+        power_iters: int = 1
+    ) -> PCABasis:
+        """
+        以串流隨機化 SVD 學習 PCA 基底（供 FoldingMethod.PCA 使用）
         
-        # 折疊所有向量
-        folded_list = [self.fold(v, preserve_topology) for v in vectors]
-        
-        # 計算流形中心
-        dim = len(folded_list[0].vector)
-        center = [0.0] * dim
-        for fv in folded_list:
-            for i, val in enumerate(fv.vector):
-                center[i] += val
-        center = [c / len(folded_list) for c in center]
-        
-        # 計算半徑（最大距離）
-        max_dist = 0.0
-        for fv in folded_list:
-            dist = sum((a - b) ** 2 for a, b in zip(fv.vector, center)) ** 0.5
-            max_dist = max(max_dist, dist)
-        
-        # 計算密度
-        density = len(folded_list) / max(max_dist ** 2, 0.01)
-        
-        manifold = SemanticManifold(
-            center=center,
-            radius=max_dist,
-            density=min(density * self.S_STAR, 10.0),  # 使用 S★ 常數
-            concepts=[]
+        記憶體只保留 (target_dim + oversample) × d 的草圖與一個區塊，
+        可逐塊串流數百萬筆向量
+        
+        Args:
+            vectors: 2-D 陣列 / 向量列表，或逐塊產生 2-D 陣列的迭代器
+            batch_rows: 每次合併的最大列數
+            center: 是否置中；預設不置中，學習二階矩基底以保留內積／餘弦
+            oversample: 草圖額外保留的列數
+            power_iters: 每次合併的冪迭代次數
+        
+        Returns:
+            學習到的基底（已註冊，可由 save_basis 持久化）
+        """
+        pca = StreamingPCA(
+            self.target_dim, oversample=oversample, power_iters=power_iters,
+            center=center, seed=self.seed
         )
+        for chunk in self._iter_chunks(vectors, batch_rows):
+            if chunk.shape[1] <= self.target_dim:
+                raise ValueError(
+                    f"input dimension {chunk.shape[1]} does not exceed target_dim {self.target_dim}"
+                )
+            pca.partial_fit(chunk)
+        basis = pca.basis()
+        self._pca_bases[basis.original_dim] = basis
+        return basis
+    
+    def save_basis(self, directory: str) -> List[str]:
+        """
+        將擬合的基底寫入 <directory>/<fold_key>.npz
         
-        return folded_list, manifold
+        Returns:
+            寫入的檔案路徑
+        """
+        paths = []
+        for original_dim, basis in sorted(self._pca_bases.items()):
+            fold_key = self._generate_fold_key(original_dim, self.target_dim, FoldingMethod.PCA)
+            path = os.path.join(directory, f"{fold_key}.npz")
+            basis.save(path)
+            paths.append(path)
+        return paths
+    
+    def load_basis(self, directory: str, fold_key: str) -> PCABasis:
+        """
+        讀取 save_basis 寫入的基底並註冊
+        
+        Raises:
+            ValueError: 基底與目標維度／種子不符（金鑰不一致）
+        """
+        basis = PCABasis.load(os.path.join(directory, f"{fold_key}.npz"))
+        if basis.n_components != self.target_dim:
+            raise ValueError(
+                f"basis has {basis.n_components} components, folder target_dim is {self.target_dim}"
+            )
+        expected = self._generate_fold_key(
+            basis.original_dim, basis.n_components, FoldingMethod.PCA, basis
+        )
+        if expected != fold_key:
+            raise ValueError(f"fold key mismatch: file {fold_key}, basis {expected}")
+        self._pca_bases[basis.original_dim] = basis
+        return basis
     
     def align_across_models(
         self,
-        vectors_a: List[List[float]],
-        vectors_b: List[List[float]],
-        anchor_pairs: List[Tuple[int, int]]
-    ) -> Tuple[List[FoldedVector], List[FoldedVector]]:
+        vectors_a: Union[np.ndarray, Sequence[Sequence[float]]],
+        vectors_b: Union[np.ndarray, Sequence[Sequence[float]]],
+        anchor_pairs: Sequence[Tuple[int, int]],
+        model_a: str = "A",
+        model_b: str = "B",
+        holdout: float = 0.2
+    ) -> Tuple[FoldedBatch, FoldedBatch]:
         """
         跨模型語義對齊
         
-        使用錨點對來對齊不同模型的語義空間
+        兩批向量各自以 fold_batch 折疊，再以錨點對擬合正交 Procrustes 旋轉，
+        將模型 B 的折疊向量整批旋轉到模型 A 的空間（不修改輸入）
         
         Args:
             vectors_a: 模型 A 的向量
             vectors_b: 模型 B 的向量
-            anchor_pairs: 已知對應的索引對
+            anchor_pairs: 已知對應的索引對 (A 索引, B 索引)
+            model_a: 模型 A 名稱（對齊算子的快取鍵）
+            model_b: 模型 B 名稱
+            holdout: 留作品質評估的錨點比例
         
         Returns:
-            對齊後的折疊向量
+            (模型 A 折疊批次, 對齊後的模型 B 折疊批次)
         """
-        # 先各自折疊
-        folded_a = [self.fold(v) for v in vectors_a]
-        folded_b = [self.fold(v) for v in vectors_b]
+        batch_a, _ = self.fold_batch(vectors_a)
+        batch_b, _ = self.fold_batch(vectors_b)
+        if not len(anchor_pairs):
+            return batch_a, batch_b
+        
+        pairs = np.asarray(anchor_pairs, dtype=np.int64).reshape(-1, 2)
+        if (pairs < 0).any() or (pairs[:, 0] >= len(batch_a)).any() or (pairs[:, 1] >= len(batch_b)).any():
+            raise ValueError("anchor pair index out of range")
+        self.fit_alignment(
+            batch_a.vectors[pairs[:, 0]], batch_b.vectors[pairs[:, 1]], model_a, model_b, holdout
+        )
+        return batch_a, self.apply_alignment(batch_b, model_a, model_b)
+    
+    def fit_alignment(
+        self,
+        anchors_a: np.ndarray,
+        anchors_b: np.ndarray,
+        model_a: str,
+        model_b: str,
+        holdout: float = 0.2
+    ) -> AlignmentOperator:
+        """
+        以已折疊的錨點對擬合模型 B → 模型 A 的對齊算子並快取
         
-        if not anchor_pairs:
-            return folded_a, folded_b
+        Args:
+            anchors_a: (n, d) 模型 A 錨點折疊向量
+            anchors_b: (n, d) 對應的模型 B 錨點折疊向量
+            model_a: 模型 A 名稱
+            model_b: 模型 B 名稱
+            holdout: 留作品質評估的錨點比例（錨點少於 2 時不留出）
+        """
+        if not 0 <= holdout < 1:
+            raise ValueError(f"holdout must be in [0, 1), got {holdout}")
+        anchors_a = np.asarray(anchors_a, dtype=np.float32)
+        anchors_b = np.asarray(anchors_b, dtype=np.float32)
+        n = len(anchors_a)
+        if not n or anchors_a.shape != anchors_b.shape:
+            raise ValueError(f"anchor shapes must match and be non-empty: {anchors_a.shape}, {anchors_b.shape}")
+        
+        order = np.random.default_rng(self.seed).permutation(n)
+        n_eval = min(int(round(holdout * n)), n - 1)
+        fit_rows, eval_rows = order[n_eval:], order[:n_eval]
+        rotation = fit_procrustes(anchors_b[fit_rows], anchors_a[fit_rows])
+        eval_rows = eval_rows if n_eval else fit_rows
+        metrics = evaluate_alignment(
+            rotation, anchors_b[eval_rows], anchors_a[eval_rows], len(fit_rows), held_out=bool(n_eval)
+        )
+        operator = AlignmentOperator(model_a=model_a, model_b=model_b, rotation=rotation, metrics=metrics)
+        self._alignments[(model_a, model_b)] = operator
+        return operator
+    
+    def alignment(self, model_a: str, model_b: str) -> Optional[AlignmentOperator]:
+        """取得快取的對齊算子（含品質指標）"""
+        return self._alignments.get((model_a, model_b))
+    
+    def apply_alignment(
+        self,
+        vectors: Union[FoldedBatch, np.ndarray],
+        model_a: str,
+        model_b: str
+    ) -> Union[FoldedBatch, np.ndarray]:
+        """以快取的對齊算子將模型 B 折疊向量整批旋轉到模型 A 空間"""
+        operator = self.alignment(model_a, model_b)
+        if operator is None:
+            raise ValueError(f"no alignment fitted for {model_a!r} <- {model_b!r}")
+        if isinstance(vectors, FoldedBatch):
+            return replace(vectors, vectors=np.ascontiguousarray(operator.apply(vectors.vectors)))
+        return operator.apply(vectors)
+    
+    def save_alignments(self, directory: str) -> List[str]:
+        """
+        將快取的對齊算子寫入 <directory>/align-<key>.npz
         
-        # 計算對齊變換
-        # 簡化版：計算錨點的平均偏移
-        offset = [0.0] * self.target_dim
-        for idx_a, idx_b in anchor_pairs:
-            if idx_a < len(folded_a) and idx_b < len(folded_b):
-                for i in range(self.target_dim):
-                    offset[i] += folded_a[idx_a].vector[i] - folded_b[idx_b].vector[i]
+        Returns:
+            寫入的檔案路徑
+        """
+        paths = []
+        for (model_a, model_b), operator in sorted(self._alignments.items()):
+            path = os.path.join(directory, f"align-{self._alignment_key(model_a, model_b)}.npz")
+            operator.save(path)
+            paths.append(path)
+        return paths
+    
+    def load_alignment(self, directory: str, model_a: str, model_b: str) -> AlignmentOperator:
+        """讀取 save_alignments 寫入的對齊算子並快取"""
+        path = os.path.join(directory, f"align-{self._alignment_key(model_a, model_b)}.npz")
+        operator = AlignmentOperator.load(path)
+        if (operator.model_a, operator.model_b) != (model_a, model_b):
+            raise ValueError(f"alignment file {path} is for {operator.model_a!r} <- {operator.model_b!r}")
+        if operator.rotation.shape != (self.target_dim, self.target_dim):
+            raise ValueError(f"alignment dim {operator.rotation.shape[0]} does not match target_dim {self.target_dim}")
+        self._alignments[(model_a, model_b)] = operator
+        return operator
+    
+    # ========== 矩陣共享 ==========
+    
+    def publish_shared(self, original_dim: int, method: Optional[FoldingMethod] = None) -> str:
+        """
+        將折疊用的稠密矩陣發布到共享記憶體（主行程呼叫一次）
         
-        if anchor_pairs:
-            offset = [o / len(anchor_pairs) for o in offset]
+        worker 以 SemanticFolder(..., shared=True) 建立折疊器即會附掛同一份矩陣；
+        發布者須在 worker 結束後呼叫 release_shared() 移除區段
         
-        # 對齊 B 到 A 的空間
-        for fv in folded_b:
-            fv.vector = [v + o for v, o in zip(fv.vector, offset)]
+        Returns:
+            區段名稱
         
-        return folded_a, folded_b
+        Raises:
+            ValueError: 方法沒有稠密投影矩陣（稀疏投影、擬合 PCA）
+        """
+        method = method or self.method
+        key = self._matrix_key(method, original_dim)
+        shared = self._shared_matrices.get(key)
+        if shared is None:
+            if method in (FoldingMethod.RANDOM_PROJECTION, FoldingMethod.LOCALITY_SENSITIVE):
+                matrix = self._get_projection_matrix(original_dim)
+            else:
+                matrix = self._get_operator(method, original_dim)
+            shared = SharedMatrix.publish(shared_matrix_name(key), matrix)
+            self._shared_matrices[key] = shared
+        return shared.name
+    
+    def release_shared(self) -> None:
+        """釋放共享記憶體矩陣（發布者一併移除區段）"""
+        # 快取可能持有區段的視圖，先清除再關閉映射
+        self._projection_cache.clear()
+        self._operator_cache.clear()
+        for shared in self._shared_matrices.values():
+            shared.unlink()
+        self._shared_matrices.clear()
     
     # ========== 內部方法 ==========
     
-    def _random_projection(self, vector: List[float]) -> List[float]:
+    def _fold_rows(self, x: np.ndarray) -> np.ndarray:
+        """依方法折疊（x 為單一向量或 (n, d) 矩陣，皆以矩陣乘法處理）"""
+        if self.method == FoldingMethod.RANDOM_PROJECTION:
+            return self._random_projection(x)
+        if self.method in (FoldingMethod.SPARSE_PROJECTION, FoldingMethod.VERY_SPARSE_PROJECTION):
+            return self._sparse_projection(x)
+        if self.method == FoldingMethod.PCA_LIKE:
+            return self._pca_like_fold(x)
+        if self.method == FoldingMethod.PCA:
+            return self._get_pca_basis(x.shape[-1]).project(x)
+        if self.method == FoldingMethod.LOCALITY_SENSITIVE:
+            return self._lsh_fold(x)
+        if self.method == FoldingMethod.SEMANTIC_HASH:
+            return self._semantic_hash_fold(x)
+        return self._hybrid_fold(x)
+    
+    def _iter_chunks(
+        self,
+        vectors: Union[np.ndarray, Sequence[Sequence[float]], Iterable[np.ndarray]],
+        batch_rows: int
+    ) -> Iterator[np.ndarray]:
+        """將輸入切成至多 batch_rows 列的 2-D 區塊（並檢查維度一致）"""
+        if batch_rows <= 0:
+            raise ValueError(f"batch_rows must be positive, got {batch_rows}")
+        
+        if isinstance(vectors, (np.ndarray, list, tuple)):
+            matrix = np.asarray(vectors)
+            chunks: Iterable[np.ndarray] = [matrix] if len(matrix) else []
+        else:
+            chunks = vectors
+        
+        original_dim = None
+        for chunk in chunks:
+            chunk = np.asarray(chunk)
+            if chunk.ndim != 2:
+                raise ValueError(f"expected 2-D chunk, got shape {chunk.shape}")
+            if original_dim is None:
+                original_dim = chunk.shape[1]
+            elif chunk.shape[1] != original_dim:
+                raise ValueError(f"dimension mismatch: {chunk.shape[1]} != {original_dim}")
+            for start in range(0, len(chunk), batch_rows):
+                yield chunk[start:start + batch_rows]
+    
+    def _fold_chunk(self, chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """折疊一個區塊，回傳 (正規化後向量, 保留度)"""
+        x = chunk.astype(np.float32, copy=False)
+        if x.shape[1] <= self.target_dim:
+            # 不需要折疊
+            return np.ascontiguousarray(x), np.ones(len(x), dtype=np.float32)
+        folded = np.ascontiguousarray(self._normalize(self._fold_rows(x)), dtype=np.float32)
+        return folded, self._estimate_preservation(x, folded)
+    
+    def _max_distance(self, folded: np.ndarray, center: np.ndarray, batch_rows: int) -> float:
+        """到中心的最大距離（分塊以限制暫存記憶體）"""
+        max_sq = 0.0
+        for start in range(0, len(folded), batch_rows):
+            diff = folded[start:start + batch_rows] - center
+            max_sq = max(max_sq, float(np.einsum("ij,ij->i", diff, diff).max()))
+        return math.sqrt(max_sq)
+    
+    def _random_projection(self, vector: np.ndarray) -> np.ndarray:
         """隨機投影降維"""
-        projection = self._get_projection_matrix(len(vector))
-        
-        result = []
-        for row in projection:
-            val = sum(v * p for v, p in zip(vector, row))
-            result.append(val)
-        
-        return result
+        return vector @ self._get_projection_matrix(vector.shape[-1]).T
+    
+    def _sparse_projection(self, vector: np.ndarray) -> np.ndarray:
+        """稀疏隨機投影降維（CSR 稀疏矩陣乘法）"""
+        projection = self._get_sparse_projection(self.method, vector.shape[-1])
+        if vector.ndim == 1:
+            return projection.matvec(vector)
+        return projection.matmat(vector)
     
-    def _pca_like_fold(self, vector: List[float]) -> List[float]:
+    def _pca_like_fold(self, vector: np.ndarray) -> np.ndarray:
         """類 PCA 折疊（簡化版）"""
-        # 將向量分成塊，每塊取加權和
-        original_dim = len(vector)
-        chunk_size = original_dim // self.target_dim
-        
-        result = []
-        for i in range(self.target_dim):
-            start = i * chunk_size
-            end = start + chunk_size if i < self.target_dim - 1 else original_dim
-            
-            # 加權和，中間權重更高
-            chunk = vector[start:end]
-            weights = [1.0 + 0.5 * math.sin(math.pi * j / len(chunk)) for j in range(len(chunk))]
-            val = sum(v * w for v, w in zip(chunk, weights)) / sum(weights)
-            result.append(val)
-        
-        return result
+        return vector @ self._get_operator(FoldingMethod.PCA_LIKE, vector.shape[-1]).T
     
-    def _lsh_fold(self, vector: List[float]) -> List[float]:
+    def _lsh_fold(self, vector: np.ndarray) -> np.ndarray:
         """局部敏感雜湊折疊"""
-        # 使用隨機超平面
-        projection = self._get_projection_matrix(len(vector))
-        
-        result = []
-        for row in projection:
-            dot = sum(v * p for v, p in zip(vector, row))
-            # 保留符號和幅度信息
-            result.append(math.tanh(dot))
-        
-        return result
+        # 使用隨機超平面，保留符號和幅度信息
+        return np.tanh(vector @ self._get_projection_matrix(vector.shape[-1]).T)
     
-    def _semantic_hash_fold(self, vector: List[float]) -> List[float]:
-        """語義雜湊折疊"""
-        # 將向量轉為位元串，然後雜湊
-        vec_str = ','.join(f"{v:.6f}" for v in vector)
-        hash_bytes = hashlib.sha256(vec_str.encode()).digest()
-        
-        # 將雜湊轉為浮點向量
-        result = []
-        for i in range(self.target_dim):
-            idx = i % len(hash_bytes)
-            val = (hash_bytes[idx] - 128) / 128.0
-            result.append(val)
-        
-        return result
+    def _semantic_hash_fold(self, vector: np.ndarray) -> np.ndarray:
+        """語義雜湊折疊（有號特徵雜湊，保留內積與局部性）"""
+        return vector @ self._get_operator(FoldingMethod.SEMANTIC_HASH, vector.shape[-1]).T
     
-    def _hybrid_fold(self, vector: List[float]) -> List[float]:
-        """混合折疊（綜合多種方法）"""
-        # 使用隨機投影作為基礎
-        rp_result = self._random_projection(vector)
-        
-        # 加入 PCA-like 的塊信息
-        pca_result = self._pca_like_fold(vector)
-        
-        # 混合
-        alpha = 0.7
-        result = [
-            alpha * r + (1 - alpha) * p
-            for r, p in zip(rp_result, pca_result)
-        ]
-        
-        return result
+    def _hybrid_fold(self, vector: np.ndarray) -> np.ndarray:
+        """混合折疊（隨機投影與 PCA-like 合併為單一矩陣）"""
+        return vector @ self._get_operator(FoldingMethod.HYBRID, vector.shape[-1]).T
     
-    def _get_projection_matrix(self, original_dim: int) -> List[List[float]]:
+    def _get_projection_matrix(self, original_dim: int) -> np.ndarray:
         """取得或生成投影矩陣"""
-        if original_dim in self._projection_cache:
-            return self._projection_cache[original_dim]
-        
-        # 生成高斯隨機投影矩陣
-        self.random.seed(self.seed)
-        matrix = []
-        for _ in range(self.target_dim):
-            row = [self.random.gauss(0, 1) / math.sqrt(self.target_dim) for _ in range(original_dim)]
-            matrix.append(row)
-        
+        matrix = self._projection_cache.get(original_dim)
+        if matrix is not None:
+            return matrix
+        
+        def generate() -> np.ndarray:
+            # 生成高斯隨機投影矩陣（同一 seed 結果固定）
+            rng = np.random.default_rng(self.seed)
+            matrix = rng.standard_normal((self.target_dim, original_dim), dtype=np.float32)
+            matrix /= np.float32(math.sqrt(self.target_dim))
+            return matrix
+        
+        matrix = self._load_matrix(
+            self._matrix_key(FoldingMethod.RANDOM_PROJECTION, original_dim), original_dim, generate
+        )
         self._projection_cache[original_dim] = matrix
         return matrix
     
-    def _normalize(self, vector: List[float]) -> List[float]:
-        """L2 正規化"""
-        norm = sum(v * v for v in vector) ** 0.5
+    def _matrix_key(self, method: FoldingMethod, original_dim: int) -> str:
+        """稠密矩陣的 fold_key（LSH 與隨機投影共用同一矩陣）"""
+        if method == FoldingMethod.LOCALITY_SENSITIVE:
+            method = FoldingMethod.RANDOM_PROJECTION
+        if method not in (
+            FoldingMethod.RANDOM_PROJECTION, FoldingMethod.PCA_LIKE, FoldingMethod.HYBRID, FoldingMethod.SEMANTIC_HASH
+        ):
+            raise ValueError(f"no dense projection matrix for {method}")
+        return self._generate_fold_key(original_dim, self.target_dim, method)
+    
+    def _load_matrix(self, key: str, original_dim: int, generate: Any) -> np.ndarray:
+        """依序自共享記憶體、矩陣目錄取得矩陣，皆無時生成（有目錄時寫入）"""
+        shape = (self.target_dim, original_dim)
+        if self.shared:
+            shared = self._shared_matrices.get(key)
+            if shared is None:
+                try:
+                    shared = SharedMatrix.attach(shared_matrix_name(key), shape)
+                except FileNotFoundError:
+                    shared = None
+                else:
+                    self._shared_matrices[key] = shared
+            if shared is not None:
+                return shared.array
+        if self.matrix_dir is None:
+            return generate()
+        path = os.path.join(self.matrix_dir, f"{key}.npy")
+        if not os.path.exists(path):
+            save_matrix(path, generate())
+        return load_matrix(path, shape)
+    
+    def _get_sparse_projection(self, method: FoldingMethod, original_dim: int) -> SparseProjection:
+        """取得或生成稀疏投影矩陣"""
+        key = (method, original_dim)
+        projection = self._sparse_cache.get(key)
+        if projection is not None:
+            return projection
+        
+        if method == FoldingMethod.SPARSE_PROJECTION:
+            density = ACHLIOPTAS_DENSITY
+        else:
+            density = very_sparse_density(original_dim)
+        projection = SparseProjection.random(self.target_dim, original_dim, density, seed=self.seed)
+        
+        self._sparse_cache[key] = projection
+        return projection
+    
+    def _get_pca_basis(self, original_dim: int) -> PCABasis:
+        """取得擬合的 PCA 基底"""
+        basis = self._pca_bases.get(original_dim)
+        if basis is None:
+            raise ValueError(f"no fitted PCA basis for dimension {original_dim}; call fit() first")
+        return basis
+    
+    def _get_operator(self, method: FoldingMethod, original_dim: int) -> np.ndarray:
+        """取得折疊方法對應的線性算子"""
+        key = (method, original_dim)
+        operator = self._operator_cache.get(key)
+        if operator is not None:
+            return operator
+        
+        if method == FoldingMethod.PCA_LIKE:
+            generate = lambda: self._chunk_weight_matrix(original_dim)
+        elif method == FoldingMethod.HYBRID:
+            # 線性混合可先合併矩陣：0.7 · P + 0.3 · W
+            alpha = np.float32(0.7)
+            generate = lambda: alpha * self._get_projection_matrix(original_dim) \
+                + (1 - alpha) * self._get_operator(FoldingMethod.PCA_LIKE, original_dim)
+        elif method == FoldingMethod.SEMANTIC_HASH:
+            # 雜湊決定的稀疏 ±1 矩陣；以稠密形式走 BLAS，批次折疊比稀疏收集快
+            generate = lambda: feature_hash_projection(
+                self.target_dim, original_dim, seed=self.seed, family=self.hash_family
+            ).toarray()
+        else:
+            raise ValueError(f"no linear operator for {method}")
+        
+        operator = self._load_matrix(self._matrix_key(method, original_dim), original_dim, generate)
+        self._operator_cache[key] = operator
+        return operator
+    
+    def _chunk_weight_matrix(self, original_dim: int) -> np.ndarray:
+        """將向量分塊加權平均的矩陣（中間權重更高）"""
+        chunk_size = original_dim // self.target_dim
+        matrix = np.zeros((self.target_dim, original_dim), dtype=np.float32)
+        for i in range(self.target_dim):
+            start = i * chunk_size
+            end = start + chunk_size if i < self.target_dim - 1 else original_dim
+            weights = 1.0 + 0.5 * np.sin(np.pi * np.arange(end - start) / (end - start))
+            matrix[i, start:end] = weights / weights.sum()
+        return matrix
+    
+    def _normalize(self, vector: np.ndarray) -> np.ndarray:
+        """L2 正規化（矩陣時逐列）"""
+        if vector.ndim == 2:
+            norms = np.linalg.norm(vector, axis=1, keepdims=True)
+            return vector / np.where(norms < 1e-10, 1.0, norms).astype(vector.dtype)
+        norm = float(np.linalg.norm(vector))
         if norm < 1e-10:
             return vector
-        return [v / norm for v in vector]
+        return vector / norm
     
-    def _cosine_similarity(self, v1: List[float], v2: List[float]) -> float:
+    def _cosine_similarity(self, v1: Sequence[float], v2: Sequence[float]) -> float:
         """餘弦相似度"""
-        dot = sum(a * b for a, b in zip(v1, v2))
-        norm1 = sum(a * a for a in v1) ** 0.5
-        norm2 = sum(b * b for b in v2) ** 0.5
+        a = np.asarray(v1, dtype=np.float64)
+        b = np.asarray(v2, dtype=np.float64)
+        norm1 = float(np.linalg.norm(a))
+        norm2 = float(np.linalg.norm(b))
         
         if norm1 < 1e-10 or norm2 < 1e-10:
             return 0.0
         
-        return dot / (norm1 * norm2)
+        return float(a @ b) / (norm1 * norm2)
     
-    def _estimate_preservation(self, original: List[float], folded: List[float]) -> float:
-        """估算語義保留度"""
+    def _estimate_preservation(self, original: np.ndarray, folded: np.ndarray) -> Any:
+        """估算語義保留度（矩陣時回傳逐列陣列）"""
+        if original.ndim == 2:
+            original_energy = np.einsum("ij,ij->i", original, original)
+            folded_energy = np.einsum("ij,ij->i", folded, folded)
+            ratio = folded_energy / np.maximum(original_energy, 1e-10)
+            scores = np.minimum(1.0, np.sqrt(ratio))
+            return np.where(original_energy < 1e-10, 1.0, scores).astype(np.float32)
+        
         # 使用能量保留作為指標
-        original_energy = sum(v * v for v in original)
-        folded_energy = sum(v * v for v in folded)
+        original_energy = float(original @ original)
+        folded_energy = float(folded @ folded)
         
         if original_energy < 1e-10:
             return 1.0
@@ -444,9 +930,26 @@ class SemanticFolder:
         # 保留度 = 能量比例的平方根（因為正規化的影響）
         return min(1.0, energy_ratio ** 0.5)
     
-    def _generate_fold_key(self, original_dim: int, target_dim: int) -> str:
-        """生成折疊金鑰"""
-        key_data = f"{original_dim}:{target_dim}:{self.seed}:{self.method.value}"
+    def _alignment_key(self, model_a: str, model_b: str) -> str:
+        key_data = f"{model_a}:{model_b}:{self.target_dim}:{self.seed}:{self.method.value}"
+        return hashlib.md5(key_data.encode()).hexdigest()[:16]
+    
+    def _generate_fold_key(
+        self,
+        original_dim: int,
+        target_dim: int,
+        method: Optional[FoldingMethod] = None,
+        basis: Optional[PCABasis] = None
+    ) -> str:
+        """生成折疊金鑰（擬合 PCA 另含基底指紋，語義雜湊另含雜湊族，隨機矩陣另含產生器版本）"""
+        method = method or self.method
+        key_data = f"{original_dim}:{target_dim}:{self.seed}:{method.value}"
+        if method == FoldingMethod.PCA:
+            key_data += f":{(basis or self._get_pca_basis(original_dim)).digest}"
+        elif method == FoldingMethod.SEMANTIC_HASH:
+            key_data += f":{self.hash_family.value}"
+        elif method in _GENERATED_METHODS:
+            key_data += f":{_PROJECTION_GENERATOR}"
         return hashlib.md5(key_data.encode()).hexdigest()[:16]
 
 
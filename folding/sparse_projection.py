@@ -0,0 +1,138 @@
+"""
+Sparse Random Projection — 稀疏隨機投影
+
+USCA 協議棧位置: L1 (Semantic Folding Layer，內部工具)
+
+以 CSR（indptr / indices / data）儲存的稀疏投影矩陣，僅依賴 NumPy：
+- Achlioptas (2003)：密度 1/3，非零值 ±√3
+- Very sparse (Li et al., 2006)：密度 1/√d，非零值 ±d^(1/4)
+
+非零值再除以 √target_dim，使每個元素的二階矩與高斯投影
+N(0, 1) / √target_dim 相同，折疊後距離尺度一致。
+
+版本: 1.0.0
+"""
+
+import math
+from typing import List, Optional
+
+import numpy as np
+
+
+ACHLIOPTAS_DENSITY = 1.0 / 3.0
+
+
+def very_sparse_density(original_dim: int) -> float:
+    """Li et al. 建議的密度 1/√d"""
+    return 1.0 / math.sqrt(original_dim)
+
+
+class SparseProjection:
+    """CSR 格式的稀疏投影矩陣，形狀 (target_dim, original_dim)"""
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        shape: tuple
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+        # 各列起點（空列以遮罩處理，reduceat 對空區間會回傳下一個元素）
+        self._starts = indptr[:-1]
+        self._empty_rows = indptr[1:] == indptr[:-1]
+        self._row_of_nnz: Optional[np.ndarray] = None
+        self._row_slices: Optional[List[slice]] = None
+
+    @classmethod
+    def random(
+        cls,
+        target_dim: int,
+        original_dim: int,
+        density: float,
+        seed: int = 42
+    ) -> "SparseProjection":
+        """
+        以種子向量化生成稀疏投影矩陣
+
+        每個元素獨立以機率 density 非零：先抽樣非零總數，
+        再無重複抽樣位置，等價於逐元素 Bernoulli 但不需建立稠密矩陣
+
+        Args:
+            target_dim: 目標維度（列數）
+            original_dim: 原始維度（行數）
+            density: 非零元素比例 (0, 1]
+            seed: 隨機種子
+        """
+        if not 0.0 < density <= 1.0:
+            raise ValueError(f"density must be in (0, 1], got {density}")
+        rng = np.random.default_rng(seed)
+        total = target_dim * original_dim
+        nnz = int(rng.binomial(total, density))
+        positions = np.sort(rng.choice(total, size=nnz, replace=False))
+        rows = positions // original_dim
+        # 使用 intp 索引：int32 索引在每次 fancy indexing 時都需轉型複製
+        indices = (positions % original_dim).astype(np.intp)
+
+        scale = np.float32(1.0 / math.sqrt(density * target_dim))
+        data = np.where(rng.random(nnz) < 0.5, -scale, scale).astype(np.float32)
+
+        indptr = np.zeros(target_dim + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=target_dim), out=indptr[1:])
+        return cls(indptr, indices, data, (target_dim, original_dim))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @property
+    def density(self) -> float:
+        return self.nnz / (self.shape[0] * self.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """y = R @ x"""
+        products = np.append(self.data * x[self.indices], np.float32(0))
+        y = np.add.reduceat(products, self._starts)
+        y[self._empty_rows] = 0.0
+        return y
+
+    def matmat(self, x: np.ndarray) -> np.ndarray:
+        """
+        Y = X @ R.T（X 形狀 (n, original_dim)）
+
+        轉置後逐列收集 X.T 的非零欄（連續記憶體複製）再做向量內積；
+        每列只觸及 nnz/target_dim 個輸入維度
+        """
+        if self._row_slices is None:
+            self._row_slices = [
+                slice(self.indptr[i], self.indptr[i + 1]) for i in range(self.shape[0])
+            ]
+        xt = np.ascontiguousarray(x.T)
+        out = np.empty((self.shape[0], x.shape[0]), dtype=np.result_type(x.dtype, self.data.dtype))
+        for i, row in enumerate(self._row_slices):
+            out[i] = self.data[row] @ xt[self.indices[row]]
+        return out.T
+
+    def rmatvec(self, y: np.ndarray) -> np.ndarray:
+        """x = R.T @ y（反投影）"""
+        if self._row_of_nnz is None:
+            self._row_of_nnz = np.repeat(
+                np.arange(self.shape[0]), np.diff(self.indptr)
+            )
+        return np.bincount(
+            self.indices, weights=self.data * y[self._row_of_nnz], minlength=self.shape[1]
+        ).astype(np.float32)
+
+    def toarray(self) -> np.ndarray:
+        """轉為稠密矩陣"""
+        dense = np.zeros(self.shape, dtype=np.float32)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
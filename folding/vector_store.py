@@ -0,0 +1,462 @@
+"""
+Folded Vector Store — 折疊向量持久化儲存
+
+USCA 協議棧位置: L1 (Semantic Folding Layer)
+
+以 mmap 開啟的固定步長二進位檔，開啟時只讀取標頭，不載入資料：
+
+    <path>      header (64 B) | rows (count × stride)
+    <path>.ids  id UTF-8 資料（依序串接）
+    <path>.ido  id 結束偏移（count × u64）
+    <path>.pq   乘積量化碼本（僅 PQ 編碼）
+
+每列可為 float32 或量化表示（FLOAT16 / INT8 / BINARY，見 quantization）：
+- INT8 列為 (scale f32, codes i8 × dim)
+- BINARY 列為 ⌈dim / 8⌉ 位元組的打包符號碼
+- 乘積量化（PQ）列為 M 位元組子質心編號，碼本存於 <path>.pq
+  （見 product_quantization），查詢以 ADC 查表計算
+
+支援追加、隨機存取，以及分塊向量化的暴力 top-k 掃描
+（每次只觸及一個區塊的列，記憶體用量與儲存大小無關）。
+
+版本: 1.0.0
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .product_quantization import ProductQuantizer
+from .quantization import QuantizationMode, QuantizedBatch, _popcount, quantize, quantize_batch
+from .semantic_folding import FoldedBatch, FoldedVector
+
+
+STORE_MAGIC = b"SFVS"
+STORE_VERSION = 1
+
+# magic, version, 編碼, dim, original_dim, count, method, fold_key
+_STORE_HEADER = struct.Struct("<4sBB2xIIQ24s16s")
+_HEADER_SIZE = 64
+_COUNT_OFFSET = 16
+
+_ENCODING_CODES: Dict[Optional[QuantizationMode], int] = {
+    None: 0,
+    QuantizationMode.FLOAT16: 1,
+    QuantizationMode.INT8: 2,
+    QuantizationMode.BINARY: 3,
+}
+_ENCODING_MODES = {code: mode for mode, code in _ENCODING_CODES.items()}
+# 乘積量化需訓練好的碼本，不屬於 QuantizationMode
+_PQ_ENCODING = 4
+
+DEFAULT_SCAN_ROWS = 65536
+
+VectorsLike = Union[np.ndarray, QuantizedBatch, FoldedBatch, Sequence[Sequence[float]]]
+QueryLike = Union[np.ndarray, Sequence[float], FoldedVector]
+
+
+def _row_dtype(
+    mode: Optional[QuantizationMode],
+    dim: int,
+    quantizer: Optional[ProductQuantizer] = None
+) -> np.dtype:
+    """每列的 numpy dtype（決定步長）"""
+    if quantizer is not None:
+        return np.dtype(("u1", (quantizer.code_size,)))
+    if mode is None:
+        return np.dtype(("<f4", (dim,)))
+    if mode == QuantizationMode.FLOAT16:
+        return np.dtype(("<f2", (dim,)))
+    if mode == QuantizationMode.INT8:
+        return np.dtype([("scale", "<f4"), ("codes", "i1", (dim,))])
+    if mode == QuantizationMode.BINARY:
+        return np.dtype(("u1", ((dim + 7) // 8,)))
+    raise ValueError(f"unsupported store encoding: {mode}")
+
+
+class FoldedVectorStore:
+    """
+    mmap 折疊向量儲存
+
+    以 create() 建立新檔，或以建構子開啟既有檔案（writable=True 允許追加）
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        """
+        開啟既有儲存
+
+        Args:
+            path: 資料檔路徑
+            writable: 是否允許追加
+        """
+        self.path = path
+        self.writable = writable
+        self._file = open(path, "r+b" if writable else "rb")
+        header = self._file.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE:
+            self._file.close()
+            raise ValueError(f"not a folded vector store: {path}")
+        magic, version, encoding, dim, original_dim, count, method, fold_key = \
+            _STORE_HEADER.unpack_from(header, 0)
+        if magic != STORE_MAGIC:
+            self._file.close()
+            raise ValueError(f"not a folded vector store: {path}")
+        if version != STORE_VERSION:
+            self._file.close()
+            raise ValueError(f"unsupported store version: {version}")
+        if encoding not in _ENCODING_MODES and encoding != _PQ_ENCODING:
+            self._file.close()
+            raise ValueError(f"unsupported store encoding code: {encoding}")
+
+        self.dim = dim
+        self.original_dim = original_dim
+        self.mode = _ENCODING_MODES.get(encoding)
+        self.quantizer: Optional[ProductQuantizer] = None
+        if encoding == _PQ_ENCODING:
+            try:
+                self.quantizer = ProductQuantizer.load(path + ".pq")
+            except (OSError, ValueError):
+                self._file.close()
+                raise
+            if self.quantizer.dim != dim:
+                self._file.close()
+                raise ValueError(f"codebook dim {self.quantizer.dim} does not match store dim {dim}")
+        self.method = method.rstrip(b"\0").decode("ascii")
+        self.fold_key = fold_key.rstrip(b"\0").decode("ascii")
+        self.row_dtype = _row_dtype(self.mode, dim, self.quantizer)
+        self._count = count
+
+        self._maps: List[mmap.mmap] = []
+        self._rows: Optional[np.ndarray] = None
+        self._id_mmap: Optional[mmap.mmap] = None
+        self._id_offsets: Optional[np.ndarray] = None
+        self._id_files = [open(path + suffix, "r+b" if writable else "rb") for suffix in (".ids", ".ido")]
+        self._row_of: Optional[Dict[str, int]] = None
+        self._remap()
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        dim: int,
+        mode: Optional[QuantizationMode] = None,
+        method: str = "",
+        fold_key: str = "",
+        original_dim: int = 0,
+        quantizer: Optional[ProductQuantizer] = None
+    ) -> "FoldedVectorStore":
+        """
+        建立空的儲存並以可追加模式開啟
+
+        Args:
+            path: 資料檔路徑（既有檔案會被覆寫）
+            dim: 折疊維度
+            mode: 量化模式（None 表示 float32）
+            method: 折疊方法名稱（FoldingMethod.value）
+            fold_key: 折疊金鑰
+            original_dim: 原始維度
+            quantizer: 已訓練的乘積量化器（指定時以 PQ 編碼，mode 須為 None）
+        """
+        if dim <= 0:
+            raise ValueError(f"dim must be positive, got {dim}")
+        if quantizer is not None:
+            if mode is not None:
+                raise ValueError("mode and quantizer are mutually exclusive")
+            if quantizer.dim != dim:
+                raise ValueError(f"quantizer dim {quantizer.dim} does not match store dim {dim}")
+            quantizer.save(path + ".pq")
+        _row_dtype(mode, dim, quantizer)
+        encoding = _PQ_ENCODING if quantizer is not None else _ENCODING_CODES[mode]
+        header = _STORE_HEADER.pack(
+            STORE_MAGIC, STORE_VERSION, encoding, dim, original_dim, 0,
+            method.encode("ascii"), fold_key.encode("ascii")
+        )
+        with open(path, "wb") as f:
+            f.write(header.ljust(_HEADER_SIZE, b"\0"))
+        for suffix in (".ids", ".ido"):
+            open(path + suffix, "wb").close()
+        return cls(path, writable=True)
+
+    # ========== 基本介面 ==========
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "FoldedVectorStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def stride(self) -> int:
+        return self.row_dtype.itemsize
+
+    def close(self) -> None:
+        """釋放 mmap 與檔案（之後不可再查詢）"""
+        self._release()
+        self._file.close()
+        for f in self._id_files:
+            f.close()
+
+    def _release(self) -> None:
+        # 先釋放 numpy 視圖，mmap 才能關閉
+        self._rows = self._id_offsets = None
+        self._id_mmap = None
+        for mapped in self._maps:
+            if not mapped.closed:
+                mapped.close()
+        self._maps = []
+
+    def _remap(self) -> None:
+        """依目前列數重新映射（開啟與追加後呼叫）"""
+        self._release()
+        self._rows = np.empty(0, dtype=self.row_dtype)
+        self._id_offsets = np.zeros(0, dtype="<u8")
+        if not self._count:
+            return
+        data_map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        offsets_map = mmap.mmap(self._id_files[1].fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps = [data_map, offsets_map]
+        self._rows = np.frombuffer(data_map, dtype=self.row_dtype, count=self._count, offset=_HEADER_SIZE)
+        self._id_offsets = np.frombuffer(offsets_map, dtype="<u8", count=self._count)
+        if os.fstat(self._id_files[0].fileno()).st_size:
+            self._id_mmap = mmap.mmap(self._id_files[0].fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(self._id_mmap)
+
+    # ========== 寫入 ==========
+
+    def append(self, vectors: VectorsLike, ids: Optional[Iterable[str]] = None) -> range:
+        """
+        追加向量
+
+        Args:
+            vectors: (n, dim) float 矩陣、FoldedBatch，或與儲存相同模式的 QuantizedBatch
+            ids: 各列 id（預設為列號字串）
+
+        Returns:
+            新增列的列號範圍
+        """
+        if not self.writable:
+            raise ValueError("store is opened read-only")
+        rows = self._encode_rows(vectors)
+        n = len(rows)
+        start = self._count
+        ids = [str(start + i) for i in range(n)] if ids is None else list(ids)
+        if len(ids) != n:
+            raise ValueError(f"got {len(ids)} ids for {n} vectors")
+        if not n:
+            return range(start, start)
+
+        encoded = [i.encode("utf-8") for i in ids]
+        base = int(self._id_offsets[-1]) if start else 0
+        ends = base + np.cumsum([len(e) for e in encoded], dtype=np.uint64)
+
+        # 以標頭列數定位（而非檔尾），先前中斷留下的殘餘資料會被覆寫
+        self._file.seek(_HEADER_SIZE + start * self.stride)
+        self._file.write(rows.tobytes())
+        for f, position, payload in (
+            (self._id_files[0], base, b"".join(encoded)),
+            (self._id_files[1], start * 8, ends.astype("<u8").tobytes()),
+        ):
+            f.seek(position)
+            f.write(payload)
+            f.truncate()
+            f.flush()
+
+        # 資料寫入後才更新標頭列數，中斷時只會遺失未完成的批次
+        self._count = start + n
+        self._file.seek(_COUNT_OFFSET)
+        self._file.write(struct.pack("<Q", self._count))
+        self._file.flush()
+
+        if self._row_of is not None:
+            for offset, key in enumerate(ids):
+                self._row_of[key] = start + offset
+        self._remap()
+        return range(start, start + n)
+
+    def _encode_rows(self, vectors: VectorsLike) -> np.ndarray:
+        """將輸入轉為儲存列格式"""
+        if isinstance(vectors, QuantizedBatch):
+            if vectors.mode != self.mode or vectors.dim != self.dim:
+                raise ValueError("quantized batch must match store mode and dimension")
+            quantized = vectors
+        else:
+            if isinstance(vectors, FoldedBatch):
+                vectors = vectors.vectors
+            matrix = np.asarray(vectors, dtype=np.float32)
+            if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+                raise ValueError(f"expected (n, {self.dim}) vectors, got shape {matrix.shape}")
+            if self.quantizer is not None:
+                return self.quantizer.encode(matrix)
+            if self.mode is None:
+                return np.ascontiguousarray(matrix, dtype="<f4")
+            quantized = quantize_batch(matrix, self.mode)
+
+        rows = np.empty(len(quantized), dtype=self.row_dtype)
+        if self.mode == QuantizationMode.INT8:
+            rows["scale"] = quantized.scales
+            rows["codes"] = quantized.codes
+        else:
+            rows[:] = quantized.codes
+        return rows
+
+    # ========== 讀取 ==========
+
+    def id(self, row: int) -> str:
+        """讀取指定列的 id"""
+        if not 0 <= row < self._count:
+            raise IndexError(f"row out of range: {row}")
+        start = int(self._id_offsets[row - 1]) if row else 0
+        end = int(self._id_offsets[row])
+        return self._id_mmap[start:end].decode("utf-8") if end > start else ""
+
+    def row_of(self, key: str) -> Optional[int]:
+        """id → 列號（首次呼叫時建立對照表）"""
+        if self._row_of is None:
+            self._row_of = {self.id(row): row for row in range(self._count)}
+        return self._row_of.get(key)
+
+    def vector(self, row: int) -> np.ndarray:
+        """讀取指定列並還原為 float32 向量"""
+        if not 0 <= row < self._count:
+            raise IndexError(f"row out of range: {row}")
+        return self._decode(self._rows[row:row + 1])[0]
+
+    def vectors(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """讀取連續列並還原為 float32 矩陣"""
+        return self._decode(self._rows[start:stop])
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        """讀取任意列並還原為 float32 矩陣"""
+        return self._decode(self._rows[np.asarray(rows, dtype=np.int64)])
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        if self.quantizer is not None:
+            return self.quantizer.decode(rows)
+        if self.mode is None:
+            return np.array(rows, dtype=np.float32)
+        return self._as_quantized(rows).dequantize()
+
+    def _as_quantized(self, rows: np.ndarray) -> QuantizedBatch:
+        if self.mode == QuantizationMode.INT8:
+            return QuantizedBatch(codes=rows["codes"], dim=self.dim, mode=self.mode, scales=rows["scale"])
+        return QuantizedBatch(codes=rows, dim=self.dim, mode=self.mode)
+
+    # ========== 查詢 ==========
+
+    def search(
+        self,
+        query: QueryLike,
+        k: int = 10,
+        scan_rows: int = DEFAULT_SCAN_ROWS
+    ) -> List[Tuple[str, float]]:
+        """
+        暴力 top-k 餘弦相似度掃描
+
+        分塊讀取 mmap 列；FLOAT16 / INT8 以 float 查詢做非對稱計算，
+        BINARY 將查詢量化為符號碼後以 Hamming 距離估計，PQ 以 ADC 查表計算
+
+        Args:
+            query: 折疊後的查詢向量
+            k: 回傳筆數
+            scan_rows: 每塊列數
+
+        Returns:
+            [(id, 相似度)]，依相似度遞減
+        """
+        rows, scores = self.search_rows(query, k, scan_rows)
+        return [(self.id(int(r)), float(s)) for r, s in zip(rows, scores)]
+
+    def search_rows(
+        self,
+        query: QueryLike,
+        k: int = 10,
+        scan_rows: int = DEFAULT_SCAN_ROWS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """同 search，回傳 (列號, 相似度) 陣列"""
+        prepared = self._prepare_query(query)
+        if prepared is None or k <= 0 or not self._count:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        q, q_aux = prepared
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, self._count, scan_rows):
+            block = self._rows[start:start + scan_rows]
+            scores = self._block_scores(block, q, q_aux)
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(scores))
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top].astype(np.float32)])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores, kind="stable")
+        return best_rows[order], best_scores[order]
+
+    def scores(self, query: QueryLike, rows: np.ndarray) -> np.ndarray:
+        """
+        計算指定列與查詢的餘弦相似度（供候選重排序，例如 IVF 索引）
+
+        Args:
+            query: 折疊後的查詢向量
+            rows: 列號陣列（遞增排序時 mmap 讀取較連續）
+        """
+        prepared = self._prepare_query(query)
+        if prepared is None or not len(rows):
+            return np.zeros(len(rows), dtype=np.float32)
+        q, q_aux = prepared
+        return self._block_scores(self._rows[rows], q, q_aux)
+
+    def normalize_query(self, query: QueryLike) -> Optional[np.ndarray]:
+        """
+        將查詢正規化為單位向量（供索引計算與重心的相似度）
+
+        Returns:
+            float32 單位向量；零向量回傳 None
+
+        Raises:
+            ValueError: 維度與儲存不符
+        """
+        if isinstance(query, FoldedVector):
+            query = query.vector
+        q = np.asarray(query, dtype=np.float32)
+        if q.shape != (self.dim,):
+            raise ValueError(f"expected query of dim {self.dim}, got shape {q.shape}")
+        q_norm = float(np.linalg.norm(q))
+        if q_norm < 1e-10:
+            return None
+        return q / q_norm
+
+    def _prepare_query(self, query: QueryLike) -> Optional[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """查詢正規化（BINARY 另附符號碼，PQ 另附 ADC 查表）；零向量回傳 None"""
+        q = self.normalize_query(query)
+        if q is None:
+            return None
+        if self.quantizer is not None:
+            return q, self.quantizer.lookup_table(q)
+        if self.mode == QuantizationMode.BINARY:
+            return q, quantize(q, QuantizationMode.BINARY).codes
+        return q, None
+
+    def _block_scores(self, block: np.ndarray, q: np.ndarray, q_aux: Optional[np.ndarray]) -> np.ndarray:
+        """計算一個區塊與單位查詢向量的餘弦相似度"""
+        if self.quantizer is not None:
+            return self.quantizer.adc_scores(block, q_aux)
+        if self.mode == QuantizationMode.BINARY:
+            hamming = _popcount(np.bitwise_xor(block, q_aux)).sum(axis=1, dtype=np.int64)
+            return np.cos(np.pi * hamming / self.dim).astype(np.float32)
+        if self.mode == QuantizationMode.INT8:
+            matrix = block["codes"].astype(np.float32)   # scale 在餘弦中抵消
+        else:
+            matrix = block.astype(np.float32, copy=False)
+        norms = np.linalg.norm(matrix, axis=1)
+        return np.divide(matrix @ q, norms, out=np.zeros(len(block), dtype=np.float32), where=norms > 1e-10)
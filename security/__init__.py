@@ -1,5 +1,10 @@
 """SIC-SIT Security"""
-from .semantic_signature import SemanticIntegrity, SemanticSignature, IntegrityReport, IntegrityStatus
+from .semantic_signature import SemanticIntegrity, SemanticSignature, IntegrityReport, IntegrityStatus, ChunkedSignature
+from .merkle import MerkleTree, MerkleProof
+from .digest_cache import DigestCache, CacheStats
+from .signature_codec import encode_signature, decode_signature, encode_report, decode_report
+from .signature_index import MinHasher, SignatureIndex, MappedSignatureIndex
+from .drift_monitor import DriftMonitor, DriftAlert, DriftAlertKind
 
 # Alias
 SemanticSigner = SemanticIntegrity
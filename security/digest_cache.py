@@ -0,0 +1,138 @@
+"""
+Digest Cache — 以內容摘要為鍵的有界快取
+
+USCA 協議棧位置: L2 Security Layer（內部工具）
+
+取代實例方法上的 functools.lru_cache：
+- 每個實例獨立（不同 secret_key 不共用結果，也不延長實例生命週期）
+- 以內容的 SHA-256 digest 為鍵，而非原始字串
+- 以位元組預算限制容量，而非項目數
+- 提供 hit/miss/eviction 指標
+- 可跨執行緒共用
+
+版本: 1.0.0
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class CacheStats:
+    """快取指標"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    current_bytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.hit_rate
+        }
+
+
+class DigestCache:
+    """
+    以位元組預算限制的 LRU 快取
+
+    鍵應為固定長度的摘要（例如 32 位元組 SHA-256 digest），
+    值的大小由 sizeof 估算（預設 sys.getsizeof）。
+    """
+
+    DEFAULT_MAX_BYTES = 4 * 1024 * 1024  # 4MB
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        sizeof: Callable[[Any], int] = sys.getsizeof
+    ):
+        """
+        初始化快取
+
+        Args:
+            max_bytes: 位元組預算（0 表示停用快取）
+            sizeof: 估算值大小的函式
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative")
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._sizes: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats(max_bytes=max_bytes)
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """取得快取值，未命中回傳 None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return self._entries[key]
+            self._stats.misses += 1
+            return None
+
+    def put(self, key: bytes, value: Any) -> None:
+        """寫入快取，必要時淘汰最久未使用的項目"""
+        size = len(key) + self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._stats.current_bytes -= self._sizes[key]
+                del self._entries[key]
+
+            while self._entries and self._stats.current_bytes + size > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._stats.current_bytes -= self._sizes.pop(old_key)
+                self._stats.evictions += 1
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._stats.current_bytes += size
+            self._stats.entries = len(self._entries)
+
+    def get_or_compute(self, key: bytes, compute: Callable[[], Any]) -> Any:
+        """
+        取得快取值，未命中時計算並寫入
+
+        計算在鎖外進行；並發未命中時可能重複計算，但結果一致
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """清空快取（保留累計指標）"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._stats.current_bytes = 0
+            self._stats.entries = 0
+
+    def stats(self) -> CacheStats:
+        """取得指標快照"""
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,430 @@
+"""
+Drift Monitor — 時間窗口語義漂移監控
+
+USCA 協議棧位置: L2 Security Layer
+類比: 網路流量監控（NetFlow），但監控的是「模型輸出分佈」而非「封包」
+
+SemanticIntegrity.verify 只比對單一簽章。DriftMonitor 持續接收各
+model_source 的 SemanticSignature，維護滑動時間窗口的彙總：
+
+- meaning_vector 的平均與變異數（Welford，可合併/扣除）
+- key_concepts 頻率（count-min sketch）
+- hallucination_score 分位數（固定分箱直方圖）
+
+窗口由固定數量的時間桶組成；桶過期時從窗口扣除並併入「參考分佈」。
+參考分佈本身也是有界的第二段時間桶（窗口之前的 reference_buckets 個
+桶），更舊的桶自參考分佈扣除，因此參考分佈會跟著流量更新，sketch 也
+不會因無限累積而飽和。每次更新與警報判斷皆為 O(1)（與流量無關），
+記憶體只與桶數、向量維度、sketch 大小與來源數上限有關。
+
+版本: 1.0.0
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .semantic_signature import SemanticSignature
+
+
+class DriftAlertKind(Enum):
+    """漂移警報類型"""
+    MEANING_SHIFT = "MEANING_SHIFT"             # 語義向量平均偏移
+    CONCEPT_NOVELTY = "CONCEPT_NOVELTY"         # 新概念比例過高
+    HALLUCINATION_SPIKE = "HALLUCINATION_SPIKE" # 幻覺分數高分位數過高
+
+
+@dataclass
+class DriftAlert:
+    """漂移警報"""
+    model_source: str
+    kind: DriftAlertKind
+    value: float
+    threshold: float
+    timestamp: float
+    message: str = ""
+
+    def to_dict(self) -> Dict:
+        return {
+            "model_source": self.model_source,
+            "kind": self.kind.value,
+            "value": self.value,
+            "threshold": self.threshold,
+            "timestamp": self.timestamp,
+            "message": self.message
+        }
+
+
+class WelfordStats:
+    """向量 Welford 統計（支援平行合併與扣除）"""
+
+    def __init__(self, dim: int):
+        self.count = 0
+        self.mean = np.zeros(dim)
+        self.m2 = np.zeros(dim)
+
+    def update(self, x: np.ndarray) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: "WelfordStats") -> None:
+        """併入另一組統計（Chan 平行合併）"""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / total)
+        self.count = total
+
+    def remove(self, other: "WelfordStats") -> None:
+        """扣除先前併入的子集（merge 的反運算）"""
+        if not other.count:
+            return
+        remaining = self.count - other.count
+        if remaining <= 0:
+            self.count = 0
+            self.mean[:] = 0.0
+            self.m2[:] = 0.0
+            return
+        mean = (self.mean * self.count - other.mean * other.count) / remaining
+        delta = other.mean - mean
+        self.m2 = np.maximum(self.m2 - other.m2 - delta ** 2 * (remaining * other.count / self.count), 0.0)
+        self.mean = mean
+        self.count = remaining
+
+    @property
+    def variance(self) -> np.ndarray:
+        if self.count < 2:
+            return np.zeros_like(self.m2)
+        return self.m2 / (self.count - 1)
+
+
+class CountMinSketch:
+    """Count-min sketch（固定記憶體的頻率估計）"""
+
+    def __init__(self, width: int = 512, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    def _columns(self, item: str) -> np.ndarray:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.table[self._rows, self._columns(item)] += count
+
+    def estimate(self, item: str) -> int:
+        return int(self.table[self._rows, self._columns(item)].min())
+
+    def merge(self, other: "CountMinSketch") -> None:
+        self.table += other.table
+
+    def remove(self, other: "CountMinSketch") -> None:
+        self.table -= other.table
+
+    def clear(self) -> None:
+        self.table[:] = 0
+
+
+class _Bucket:
+    """單一時間桶的彙總"""
+
+    def __init__(self, dim: int, cms_width: int, cms_depth: int, bins: int):
+        self.bucket_id = -1
+        self.vector = WelfordStats(dim)
+        self.concepts = CountMinSketch(cms_width, cms_depth)
+        self.hallucination = np.zeros(bins, dtype=np.int64)
+        self.concept_count = 0      # 加入 sketch 的概念總數
+        self.concept_total = 0
+        self.concept_novel = 0
+
+    def reset(self, bucket_id: int) -> None:
+        self.bucket_id = bucket_id
+        self.vector = WelfordStats(len(self.vector.mean))
+        self.concepts.clear()
+        self.hallucination[:] = 0
+        self.concept_count = 0
+        self.concept_total = 0
+        self.concept_novel = 0
+
+    def merge(self, other: "_Bucket") -> None:
+        self.vector.merge(other.vector)
+        self.concepts.merge(other.concepts)
+        self.hallucination += other.hallucination
+        self.concept_count += other.concept_count
+        self.concept_total += other.concept_total
+        self.concept_novel += other.concept_novel
+
+    def remove(self, other: "_Bucket") -> None:
+        self.vector.remove(other.vector)
+        self.concepts.remove(other.concepts)
+        self.hallucination -= other.hallucination
+        self.concept_count -= other.concept_count
+        self.concept_total -= other.concept_total
+        self.concept_novel -= other.concept_novel
+
+
+class _SourceState:
+    """單一 model_source 的窗口與參考分佈"""
+
+    def __init__(self, monitor: "DriftMonitor"):
+        args = (monitor.dim, monitor.cms_width, monitor.cms_depth, monitor.histogram_bins)
+        # 最新的 buckets 個桶屬於窗口，其前 reference_buckets 個屬於參考分佈
+        self.ring = [_Bucket(*args) for _ in range(monitor.buckets + monitor.reference_buckets)]
+        self.window = _Bucket(*args)
+        self.reference = _Bucket(*args)
+        self.active_alerts: Dict[DriftAlertKind, bool] = {}
+        self.head = -1
+
+
+class DriftMonitor:
+    """
+    時間窗口漂移監控器
+
+    用法:
+        monitor = DriftMonitor(window_seconds=3600)
+        for sig in stream:
+            for alert in monitor.ingest(sig):
+                handle(alert)
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 3600.0,
+        buckets: int = 12,
+        reference_buckets: Optional[int] = None,
+        dim: int = 8,
+        cms_width: int = 512,
+        cms_depth: int = 4,
+        histogram_bins: int = 20,
+        max_sources: int = 1024,
+        min_samples: int = 30,
+        mean_shift_threshold: float = 1.0,
+        novelty_threshold: float = 0.5,
+        novelty_min_count: int = 1,
+        hallucination_quantile: float = 0.95,
+        hallucination_threshold: float = 0.7
+    ):
+        """
+        初始化監控器
+
+        Args:
+            window_seconds: 滑動窗口長度（秒）
+            buckets: 窗口內的時間桶數
+            reference_buckets: 參考分佈的時間桶數（預設為 4 * buckets，即窗口之前 4 個窗口長度）
+            dim: meaning_vector 維度
+            cms_width / cms_depth: count-min sketch 大小
+            histogram_bins: 幻覺分數直方圖分箱數
+            max_sources: 追蹤的來源數上限（超過時淘汰最久未更新者）
+            min_samples: 窗口與參考分佈至少需要的樣本數才發出警報
+            mean_shift_threshold: 平均標準化偏移門檻（以參考標準差為單位）
+            novelty_threshold: 窗口中參考分佈未見過的概念比例門檻
+            novelty_min_count: 參考分佈中估計次數低於此值（另加 sketch 碰撞雜訊
+                N / cms_width）的概念視為未見過
+            hallucination_quantile: 監控的幻覺分數分位數
+            hallucination_threshold: 該分位數的門檻
+        """
+        if reference_buckets is None:
+            reference_buckets = 4 * buckets
+        if buckets <= 0 or window_seconds <= 0 or reference_buckets <= 0:
+            raise ValueError("window_seconds, buckets and reference_buckets must be positive")
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.reference_buckets = reference_buckets
+        self.bucket_seconds = window_seconds / buckets
+        self.dim = dim
+        self.cms_width = cms_width
+        self.cms_depth = cms_depth
+        self.histogram_bins = histogram_bins
+        self.max_sources = max_sources
+        self.min_samples = min_samples
+        self.mean_shift_threshold = mean_shift_threshold
+        self.novelty_threshold = novelty_threshold
+        self.novelty_min_count = novelty_min_count
+        self.hallucination_quantile = hallucination_quantile
+        self.hallucination_threshold = hallucination_threshold
+
+        self._sources: "OrderedDict[str, _SourceState]" = OrderedDict()
+
+    def ingest(self, signature: SemanticSignature, timestamp: Optional[float] = None) -> List[DriftAlert]:
+        """
+        接收一筆簽章並回傳新觸發的警報
+
+        警報為邊緣觸發：同一類型持續超標時只回報一次，
+        恢復正常後再次超標才會重新回報
+        """
+        now = time.time() if timestamp is None else timestamp
+        state = self._state(signature.model_source)
+        bucket = self._advance(state, int(now // self.bucket_seconds))
+
+        vector = np.asarray(signature.meaning_vector, dtype=float)
+        if len(vector) != self.dim:
+            raise ValueError(f"meaning_vector dim {len(vector)} != monitor dim {self.dim}")
+
+        # Welford：單筆更新同時套用到桶與窗口
+        single = WelfordStats(self.dim)
+        single.update(vector)
+        bucket.vector.merge(single)
+        state.window.vector.merge(single)
+
+        # 概念頻率與新穎度（參考分佈未見過者；參考分佈足夠時才計入）
+        # sketch 的估計值含碰撞雜訊（平均每格 N / width），不能以 == 0 判斷
+        reference = state.reference
+        track_novelty = reference.vector.count >= self.min_samples
+        seen_threshold = self.novelty_min_count + reference.concept_count / self.cms_width
+        novel = 0
+        for concept in signature.key_concepts:
+            bucket.concepts.add(concept)
+            state.window.concepts.add(concept)
+            if track_novelty and reference.concepts.estimate(concept) < seen_threshold:
+                novel += 1
+        for target in (bucket, state.window):
+            target.concept_count += len(signature.key_concepts)
+        if track_novelty:
+            for target in (bucket, state.window):
+                target.concept_total += len(signature.key_concepts)
+                target.concept_novel += novel
+
+        if signature.hallucination_score is not None:
+            bin_idx = min(int(signature.hallucination_score * self.histogram_bins), self.histogram_bins - 1)
+            bucket.hallucination[bin_idx] += 1
+            state.window.hallucination[bin_idx] += 1
+
+        return self._check(signature.model_source, state, now)
+
+    def snapshot(self, model_source: str) -> Dict:
+        """取得來源目前的窗口統計"""
+        state = self._sources.get(model_source)
+        if state is None:
+            return {}
+        window, reference = state.window, state.reference
+        return {
+            "model_source": model_source,
+            "window_count": window.vector.count,
+            "reference_count": reference.vector.count,
+            "window_mean": window.vector.mean.tolist(),
+            "window_std": np.sqrt(window.vector.variance).tolist(),
+            "mean_shift": self._mean_shift(state),
+            "concept_novelty": window.concept_novel / max(window.concept_total, 1),
+            "hallucination_quantile": self._quantile(window.hallucination, self.hallucination_quantile),
+            "active_alerts": [k.value for k, v in state.active_alerts.items() if v]
+        }
+
+    def concept_frequency(self, model_source: str, concept: str) -> int:
+        """估計概念在目前窗口中的出現次數"""
+        state = self._sources.get(model_source)
+        return state.window.concepts.estimate(concept) if state else 0
+
+    def sources(self) -> List[str]:
+        return list(self._sources)
+
+    # ========== 內部方法 ==========
+
+    def _state(self, model_source: str) -> _SourceState:
+        state = self._sources.get(model_source)
+        if state is None:
+            if len(self._sources) >= self.max_sources:
+                self._sources.popitem(last=False)
+            state = _SourceState(self)
+            self._sources[model_source] = state
+        else:
+            self._sources.move_to_end(model_source)
+        return state
+
+    def _advance(self, state: _SourceState, bucket_id: int) -> _Bucket:
+        """推進時間桶：離開窗口的桶併入參考分佈，離開參考分佈的桶被扣除"""
+        if bucket_id > state.head:
+            window_start = bucket_id - self.buckets + 1
+            reference_start = window_start - self.reference_buckets
+            for slot in state.ring:
+                if slot.bucket_id < 0:
+                    continue
+                if slot.bucket_id >= state.head - self.buckets + 1:
+                    if slot.bucket_id >= window_start:
+                        continue
+                    state.window.remove(slot)
+                    if slot.bucket_id >= reference_start:
+                        state.reference.merge(slot)
+                        continue
+                else:
+                    if slot.bucket_id >= reference_start:
+                        continue
+                    state.reference.remove(slot)
+                slot.reset(-1)
+            # 最多重設 len(ring) 個桶（新桶的槽位此時皆已失效）
+            for new_id in range(max(state.head + 1, bucket_id - len(state.ring) + 1), bucket_id + 1):
+                state.ring[new_id % len(state.ring)].reset(new_id)
+            state.head = bucket_id
+
+        slot = state.ring[bucket_id % len(state.ring)]
+        if slot.bucket_id != bucket_id or bucket_id <= state.head - self.buckets:
+            # 過舊的亂序資料：歸入窗口內最舊的桶
+            slot = min((b for b in state.ring if b.bucket_id > state.head - self.buckets),
+                       key=lambda b: b.bucket_id)
+        return slot
+
+    def _mean_shift(self, state: _SourceState) -> float:
+        ref = state.reference.vector
+        if ref.count < 2 or not state.window.vector.count:
+            return 0.0
+        std = np.sqrt(ref.variance) + 1e-2
+        return float(np.mean(np.abs(state.window.vector.mean - ref.mean) / std))
+
+    def _quantile(self, histogram: np.ndarray, q: float) -> float:
+        total = histogram.sum()
+        if not total:
+            return 0.0
+        idx = int(np.searchsorted(np.cumsum(histogram), q * total))
+        return (min(idx, self.histogram_bins - 1) + 1) / self.histogram_bins
+
+    def _check(self, model_source: str, state: _SourceState, now: float) -> List[DriftAlert]:
+        window = state.window
+        if window.vector.count < self.min_samples:
+            return []
+
+        measurements = [(
+            DriftAlertKind.HALLUCINATION_SPIKE,
+            self._quantile(window.hallucination, self.hallucination_quantile),
+            self.hallucination_threshold,
+            f"p{self.hallucination_quantile * 100:.0f} 幻覺分數過高"
+        )]
+        if state.reference.vector.count >= self.min_samples:
+            measurements.append((
+                DriftAlertKind.MEANING_SHIFT,
+                self._mean_shift(state),
+                self.mean_shift_threshold,
+                "語義向量平均偏移"
+            ))
+            measurements.append((
+                DriftAlertKind.CONCEPT_NOVELTY,
+                window.concept_novel / max(window.concept_total, 1),
+                self.novelty_threshold,
+                "新概念比例過高"
+            ))
+
+        alerts = []
+        for kind, value, threshold, message in measurements:
+            firing = value > threshold
+            if firing and not state.active_alerts.get(kind):
+                alerts.append(DriftAlert(
+                    model_source=model_source,
+                    kind=kind,
+                    value=value,
+                    threshold=threshold,
+                    timestamp=now,
+                    message=f"{message}: {value:.2f} > {threshold:.2f}"
+                ))
+            state.active_alerts[kind] = firing
+        return alerts
@@ -0,0 +1,134 @@
+"""
+Merkle Tree — 分塊簽章用雜湊樹
+
+USCA 協議棧位置: L2 Security Layer（內部工具）
+
+葉節點與內部節點以不同前綴區分（0x00 / 0x01），避免第二原像攻擊；
+奇數層最後一個節點直接上提，不複製。
+
+- 驗證單一區塊只需 O(log n) 次雜湊（MerkleProof）
+- 更新單一葉節點只重算該葉到根的路徑
+
+版本: 1.0.0
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(chunk_digest: bytes) -> bytes:
+    """由區塊內容 digest 計算葉節點雜湊"""
+    return hashlib.sha256(_LEAF_PREFIX + chunk_digest).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    """計算內部節點雜湊"""
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+@dataclass
+class MerkleProof:
+    """
+    包含證明
+
+    path 由葉到根，每一步為 (兄弟節點雜湊, 兄弟是否在左側)
+    """
+    index: int
+    leaf_count: int
+    path: List[Tuple[bytes, bool]] = field(default_factory=list)
+
+    def compute_root(self, chunk_digest: bytes) -> bytes:
+        """由區塊 digest 沿路徑計算根雜湊"""
+        h = leaf_hash(chunk_digest)
+        for sibling, sibling_is_left in self.path:
+            h = node_hash(sibling, h) if sibling_is_left else node_hash(h, sibling)
+        return h
+
+    def verify(self, chunk_digest: bytes, root: bytes) -> bool:
+        """驗證區塊是否屬於指定根"""
+        return self.compute_root(chunk_digest) == root
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "leaf_count": self.leaf_count,
+            "path": [[sibling.hex(), is_left] for sibling, is_left in self.path]
+        }
+
+
+class MerkleTree:
+    """以 digest 列表建立的 Merkle 樹，保留所有層以支援證明與路徑更新"""
+
+    def __init__(self, chunk_digests: Sequence[bytes]):
+        """
+        建立 Merkle 樹
+
+        Args:
+            chunk_digests: 各區塊內容的 SHA-256 digest
+        """
+        if not chunk_digests:
+            chunk_digests = [hashlib.sha256(b"").digest()]
+        self.levels: List[List[bytes]] = [[leaf_hash(d) for d in chunk_digests]]
+        while len(self.levels[-1]) > 1:
+            below = self.levels[-1]
+            above = [
+                node_hash(below[i], below[i + 1]) if i + 1 < len(below) else below[i]
+                for i in range(0, len(below), 2)
+            ]
+            self.levels.append(above)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    @property
+    def leaf_count(self) -> int:
+        return len(self.levels[0])
+
+    def copy(self) -> "MerkleTree":
+        """複製樹（各層列表淺拷貝，不重新計算雜湊）"""
+        clone = MerkleTree.__new__(MerkleTree)
+        clone.levels = [list(level) for level in self.levels]
+        return clone
+
+    def proof(self, index: int) -> MerkleProof:
+        """產生指定葉節點的包含證明"""
+        if not 0 <= index < self.leaf_count:
+            raise IndexError(f"leaf index out of range: {index}")
+        path = []
+        pos = index
+        for level in self.levels[:-1]:
+            sibling = pos ^ 1
+            if sibling < len(level):
+                path.append((level[sibling], sibling < pos))
+            pos //= 2
+        return MerkleProof(index=index, leaf_count=self.leaf_count, path=path)
+
+    def update(self, index: int, chunk_digest: bytes) -> int:
+        """
+        更新單一葉節點並只重算其到根的路徑
+
+        Returns:
+            本次計算的雜湊次數
+        """
+        if not 0 <= index < self.leaf_count:
+            raise IndexError(f"leaf index out of range: {index}")
+        self.levels[0][index] = leaf_hash(chunk_digest)
+        hashes = 1
+        pos = index
+        for depth in range(len(self.levels) - 1):
+            level = self.levels[depth]
+            left = pos & ~1
+            parent = pos // 2
+            if left + 1 < len(level):
+                self.levels[depth + 1][parent] = node_hash(level[left], level[left + 1])
+                hashes += 1
+            else:
+                self.levels[depth + 1][parent] = level[left]
+            pos = parent
+        return hashes
@@ -16,7 +16,6 @@ USCA 協議棧位置: L2 Security Layer
 版本: 1.0.0
 """
 
-import json
 import hashlib
 import hmac
 from typing import Any, Dict, List, Optional, Tuple
@@ -24,7 +23,12 @@ from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 import re
-from functools import lru_cache
+from difflib import SequenceMatcher
+
+from core.canonical import encode_content
+
+from .digest_cache import CacheStats, DigestCache
+from .merkle import MerkleProof, MerkleTree
 
 
 class IntegrityStatus(Enum):
@@ -54,6 +58,12 @@ class SemanticSignature:
     model_source: str
     version: str = "1.0"
     
+    # 簽章時的幻覺分數（僅供參考與監控；未受 HMAC 保護，驗證時一律重新計算）
+    hallucination_score: Optional[float] = None
+    
+    # MinHash 草圖（供近似重複索引使用，見 signature_index.py）
+    minhash: Optional[List[int]] = None
+    
     def to_dict(self) -> Dict:
         return {
             "content_hash": self.content_hash,
@@ -64,7 +74,9 @@ class SemanticSignature:
             "intent_summary": self.intent_summary,
             "created_at": self.created_at,
             "model_source": self.model_source,
-            "version": self.version
+            "version": self.version,
+            "hallucination_score": self.hallucination_score,
+            "minhash": self.minhash
         }
 
 
@@ -86,6 +98,71 @@ class IntegrityReport:
     # 詳細資訊
     drift_details: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    
+    # 是否由快速路徑（內容雜湊精確匹配）產生
+    fast_path: bool = False
+    
+    def to_dict(self) -> Dict:
+        return {
+            "status": self.status.value,
+            "content_match": self.content_match,
+            "semantic_match": self.semantic_match,
+            "structure_match": self.structure_match,
+            "drift_score": self.drift_score,
+            "stability_score": self.stability_score,
+            "hallucination_score": self.hallucination_score,
+            "drift_details": self.drift_details,
+            "warnings": self.warnings,
+            "fast_path": self.fast_path
+        }
+
+
+@dataclass
+class ChunkedSignature:
+    """
+    分塊語義簽章
+    
+    以段落或固定視窗切分內容，對每個區塊簽章，
+    再以區塊內容雜湊建立 Merkle 樹，根雜湊代表整份文件
+
+    Merkle 根不含金鑰，root_mac（根雜湊與各區塊語義雜湊的 HMAC）
+    確認簽章出自驗證方的金鑰
+    """
+    root_hash: str                      # Merkle 根雜湊
+    chunking: str                       # 切分方式 paragraph / window
+    window_size: int                    # 視窗大小（字元，window 模式）
+    chunks: List[SemanticSignature]     # 各區塊簽章
+    
+    # 元數據
+    created_at: str
+    model_source: str
+    version: str = "1.0"
+    root_mac: str = ""                  # HMAC(根雜湊 + 各區塊語義雜湊)
+    
+    _tree: Optional[MerkleTree] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def tree(self) -> MerkleTree:
+        """Merkle 樹（由區塊內容雜湊延遲重建）"""
+        if self._tree is None:
+            self._tree = MerkleTree([bytes.fromhex(c.content_hash) for c in self.chunks])
+        return self._tree
+    
+    def proof(self, index: int) -> MerkleProof:
+        """取得指定區塊的包含證明"""
+        return self.tree.proof(index)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "root_hash": self.root_hash,
+            "chunking": self.chunking,
+            "window_size": self.window_size,
+            "chunks": [c.to_dict() for c in self.chunks],
+            "created_at": self.created_at,
+            "model_source": self.model_source,
+            "version": self.version,
+            "root_mac": self.root_mac
+        }
 
 
 class SemanticIntegrity:
@@ -114,19 +191,54 @@ class SemanticIntegrity:
         r"IIRC",
     ]
     
+    # 分塊方式
+    CHUNK_PARAGRAPH = "paragraph"
+    CHUNK_WINDOW = "window"
+    DEFAULT_WINDOW_SIZE = 4096
+    
+    # 狀態嚴重度（分塊彙總時取最嚴重者）
+    _STATUS_SEVERITY = {
+        IntegrityStatus.INTACT: 0,
+        IntegrityStatus.UNKNOWN: 1,
+        IntegrityStatus.DRIFTED: 2,
+        IntegrityStatus.CORRUPTED: 3,
+        IntegrityStatus.HALLUCINATED: 4,
+    }
+    
     # 不確定性標記
     UNCERTAINTY_MARKERS = [
         "可能", "也許", "大概", "應該", "似乎",
         "maybe", "perhaps", "probably", "might", "could be"
     ]
     
-    def __init__(self, secret_key: str = None):
+    def __init__(
+        self,
+        secret_key: str = None,
+        cache_bytes: int = DigestCache.DEFAULT_MAX_BYTES,
+        sketcher: Optional[Any] = None
+    ):
+        """
+        初始化驗證器
+        
+        Args:
+            secret_key: HMAC 金鑰
+            cache_bytes: 語義雜湊快取的位元組預算（0 表示停用）
+            sketcher: 草圖產生器（例如 signature_index.MinHasher），
+                      提供時 sign() 會附帶 MinHash 草圖
+        """
         if secret_key is None:
             raise ValueError("secret_key must be provided and cannot be None")
         self.secret_key = secret_key.encode('utf-8')
         self._compiled_patterns = [
             re.compile(p, re.IGNORECASE) for p in self.HALLUCINATION_PATTERNS
         ]
+        self.sketcher = sketcher
+        # 以內容 SHA-256 digest 為鍵的實例快取
+        self._semantic_hash_cache = DigestCache(max_bytes=cache_bytes)
+    
+    def cache_stats(self) -> CacheStats:
+        """取得語義雜湊快取指標"""
+        return self._semantic_hash_cache.stats()
     
     def sign(self, content: Any, model_source: str = "unknown") -> SemanticSignature:
         """
@@ -140,16 +252,15 @@ class SemanticIntegrity:
             SemanticSignature
         """
         # 標準化內容
-        if isinstance(content, dict):
-            content_str = json.dumps(content, sort_keys=True, ensure_ascii=False)
-        else:
-            content_str = str(content)
+        encoding = encode_content(content)
+        content_str = encoding.text
         
         # 1. 內容雜湊（精確匹配）
-        content_hash = hashlib.sha256(content_str.encode()).hexdigest()
+        content_digest = encoding.digest
+        content_hash = content_digest.hex()
         
         # 2. 語義雜湊（意義指紋）
-        semantic_hash = self._compute_semantic_hash(content_str)
+        semantic_hash = self._compute_semantic_hash(content_str, content_digest)
         
         # 3. 結構雜湊
         structure_hash = self._compute_structure_hash(content)
@@ -163,6 +274,12 @@ class SemanticIntegrity:
         # 6. 意圖摘要
         intent_summary = self._summarize_intent(content_str)
         
+        # 7. 幻覺分數
+        hallucination_score = self._detect_hallucination(content_str)
+        
+        # 8. 近似重複草圖（選用）
+        minhash = self.sketcher.sketch(content_str) if self.sketcher else None
+        
         return SemanticSignature(
             content_hash=content_hash,
             semantic_hash=semantic_hash,
@@ -171,44 +288,58 @@ class SemanticIntegrity:
             key_concepts=key_concepts,
             intent_summary=intent_summary,
             created_at=datetime.utcnow().isoformat() + "Z",
-            model_source=model_source
+            model_source=model_source,
+            hallucination_score=hallucination_score,
+            minhash=minhash
         )
     
     def verify(
         self,
         content: Any,
         signature: SemanticSignature,
-        strict: bool = False
+        strict: bool = False,
+        full_report: bool = False
     ) -> IntegrityReport:
         """
         驗證內容完整性
         
+        分層驗證：
+        - 第一層：內容、結構與語義雜湊。三者皆匹配時零漂移為必然，
+          只略過漂移與穩定性計算（dict 與其 JSON 字串的內容雜湊相同、
+          結構雜湊不同；內容與結構雜湊不含金鑰，須以 HMAC 語義雜湊
+          確認簽章出自本金鑰）。幻覺分數一律由內容重新計算，不信任
+          簽章中儲存的值
+        - 第二層：漂移與穩定性的完整分析，只在第一層失敗或
+          full_report=True 時計算
+        
         Args:
             content: 要驗證的內容
             signature: 原始簽章
             strict: 是否嚴格模式（要求精確匹配）
+            full_report: 即使內容精確匹配也執行完整分析
         
         Returns:
             IntegrityReport
         """
         # 標準化內容
-        if isinstance(content, dict):
-            content_str = json.dumps(content, sort_keys=True, ensure_ascii=False)
-        else:
-            content_str = str(content)
+        encoding = encode_content(content)
+        content_str = encoding.text
         
         # 1. 內容雜湊驗證
-        current_content_hash = hashlib.sha256(content_str.encode()).hexdigest()
-        content_match = current_content_hash == signature.content_hash
+        content_digest = encoding.digest
+        content_match = content_digest.hex() == signature.content_hash
         
-        # 2. 語義雜湊驗證
-        current_semantic_hash = self._compute_semantic_hash(content_str)
-        semantic_match = current_semantic_hash == signature.semantic_hash
-        
-        # 3. 結構雜湊驗證
+        # 2. 結構雜湊驗證
         current_structure_hash = self._compute_structure_hash(content)
         structure_match = current_structure_hash == signature.structure_hash
         
+        # 3. 語義雜湊驗證（HMAC，以內容 digest 快取）
+        current_semantic_hash = self._compute_semantic_hash(content_str, content_digest)
+        semantic_match = current_semantic_hash == signature.semantic_hash
+        
+        if content_match and structure_match and semantic_match and not full_report:
+            return self._verify_exact_match(content_str, strict)
+        
         # 4. 計算漂移分數
         drift_score = self._compute_drift_score(
             content_str, signature.meaning_vector, signature.key_concepts
@@ -258,6 +389,254 @@ class SemanticIntegrity:
             warnings=warnings
         )
     
+    def _verify_exact_match(self, content_str: str, strict: bool) -> IntegrityReport:
+        """快速路徑：內容、結構與語義雜湊皆匹配，略過漂移計算"""
+        # 簽章中的幻覺分數未受 HMAC 保護，由內容重新計算
+        hallucination_score = self._detect_hallucination(content_str)
+        
+        status = IntegrityStatus.INTACT
+        warnings = []
+        if not strict and hallucination_score > 0.7:
+            status = IntegrityStatus.HALLUCINATED
+            warnings.append(f"高幻覺風險: {hallucination_score:.2f}")
+        
+        return IntegrityReport(
+            status=status,
+            content_match=True,
+            semantic_match=True,
+            structure_match=True,
+            drift_score=0.0,
+            stability_score=1.0,
+            hallucination_score=hallucination_score,
+            warnings=warnings,
+            fast_path=True
+        )
+    
+    # ========== 分塊簽章 ==========
+    
+    def sign_chunked(
+        self,
+        content: Any,
+        model_source: str = "unknown",
+        chunking: str = CHUNK_PARAGRAPH,
+        window_size: int = DEFAULT_WINDOW_SIZE
+    ) -> ChunkedSignature:
+        """
+        為大型文件生成分塊語義簽章
+        
+        Args:
+            content: 要簽章的內容
+            model_source: 來源模型
+            chunking: 切分方式（paragraph 以空行分段，window 以固定字元數）
+            window_size: window 模式的區塊大小
+        
+        Returns:
+            ChunkedSignature
+        """
+        chunks = self._split_chunks(content, chunking, window_size)
+        chunk_sigs = [self.sign(chunk, model_source=model_source) for chunk in chunks]
+        tree = MerkleTree([bytes.fromhex(sig.content_hash) for sig in chunk_sigs])
+        
+        return ChunkedSignature(
+            root_hash=tree.root.hex(),
+            chunking=chunking,
+            window_size=window_size,
+            chunks=chunk_sigs,
+            created_at=datetime.utcnow().isoformat() + "Z",
+            model_source=model_source,
+            root_mac=self._chunked_mac(tree.root.hex(), chunk_sigs),
+            _tree=tree
+        )
+    
+    def resign_chunked(self, content: Any, chunked: ChunkedSignature) -> ChunkedSignature:
+        """
+        編輯後重新簽章
+        
+        未變更的區塊沿用原簽章（其語義雜湊須以本金鑰驗證通過）；
+        區塊數不變時只重算被修改區塊到根的路徑，否則以重用的區塊
+        簽章重建 Merkle 樹
+        
+        Returns:
+            新的 ChunkedSignature（不修改傳入的簽章）
+        """
+        chunks = self._split_chunks(content, chunked.chunking, chunked.window_size)
+        digests = [hashlib.sha256(c.encode()).digest() for c in chunks]
+        
+        if len(chunks) == len(chunked.chunks):
+            tree = chunked.tree.copy()
+            chunk_sigs = list(chunked.chunks)
+            for i, digest in enumerate(digests):
+                if not self._chunk_reusable(chunks[i], digest, chunk_sigs[i]):
+                    chunk_sigs[i] = self.sign(chunks[i], model_source=chunked.model_source)
+                    if digest.hex() != chunked.chunks[i].content_hash:
+                        tree.update(i, digest)
+        else:
+            reusable = {sig.content_hash: sig for sig in chunked.chunks}
+            chunk_sigs = []
+            for chunk, digest in zip(chunks, digests):
+                sig = reusable.get(digest.hex())
+                if sig is None or not self._chunk_reusable(chunk, digest, sig):
+                    sig = self.sign(chunk, model_source=chunked.model_source)
+                chunk_sigs.append(sig)
+            tree = MerkleTree(digests)
+        
+        return ChunkedSignature(
+            root_hash=tree.root.hex(),
+            chunking=chunked.chunking,
+            window_size=chunked.window_size,
+            chunks=chunk_sigs,
+            created_at=datetime.utcnow().isoformat() + "Z",
+            model_source=chunked.model_source,
+            root_mac=self._chunked_mac(tree.root.hex(), chunk_sigs),
+            _tree=tree
+        )
+    
+    def verify_section(self, section: str, index: int, chunked: ChunkedSignature) -> bool:
+        """
+        驗證單一區塊是否屬於簽章文件（O(log n) 次雜湊）
+        
+        Args:
+            section: 區塊內容
+            index: 區塊索引
+            chunked: 分塊簽章
+        """
+        digest = hashlib.sha256(section.encode()).digest()
+        return chunked.proof(index).verify(digest, bytes.fromhex(chunked.root_hash))
+    
+    def verify_chunked(
+        self,
+        content: Any,
+        chunked: ChunkedSignature,
+        strict: bool = False
+    ) -> IntegrityReport:
+        """
+        驗證分塊簽章，並在 drift_details 指出漂移的區塊
+        
+        先以 root_mac 確認簽章出自本金鑰；根雜湊相符時所有區塊皆
+        視為相同，否則以區塊雜湊對齊新舊區塊（插入或刪除段落不會
+        使後續區塊全部失配），只對被修改的區塊執行完整分析。
+        相同的區塊仍比對 HMAC 語義雜湊（以 digest 快取）並重新計算
+        幻覺分數，不信任簽章中儲存的值
+        """
+        chunks = self._split_chunks(content, chunked.chunking, chunked.window_size)
+        digests = [hashlib.sha256(c.encode()).digest() for c in chunks]
+        root_match = MerkleTree(digests).root.hex() == chunked.root_hash
+        
+        status = IntegrityStatus.INTACT
+        semantic_match = structure_match = True
+        drift_total = 0.0
+        slots = 0
+        hallucination = 0.0
+        drift_details = []
+        warnings = []
+        
+        mac_match = hmac.compare_digest(
+            self._chunked_mac(chunked.root_hash, chunked.chunks), chunked.root_mac
+        )
+        if not mac_match:
+            semantic_match = False
+            status = IntegrityStatus.DRIFTED
+            drift_details.append("root: HMAC 不符（簽章金鑰不同或簽章遭竄改）")
+        
+        if root_match:
+            opcodes = [("equal", 0, len(chunks), 0, len(chunks))]
+        else:
+            old_digests = [c.content_hash for c in chunked.chunks]
+            opcodes = SequenceMatcher(
+                None, old_digests, [d.hex() for d in digests], autojunk=False
+            ).get_opcodes()
+        
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    j = j1 + offset
+                    current = self._compute_semantic_hash(chunks[j], digests[j])
+                    if current != chunked.chunks[i1 + offset].semantic_hash:
+                        semantic_match = False
+                        status = self._worse_status(status, IntegrityStatus.DRIFTED)
+                        drift_details.append(f"chunk[{j}]: 語義雜湊不符")
+                    hallucination = max(hallucination, self._detect_hallucination(chunks[j]))
+                slots += i2 - i1
+                continue
+            
+            paired = min(i2 - i1, j2 - j1)
+            for offset in range(paired):
+                j = j1 + offset
+                report = self.verify(chunks[j], chunked.chunks[i1 + offset], strict=strict)
+                status = self._worse_status(status, report.status)
+                semantic_match = semantic_match and report.semantic_match
+                structure_match = structure_match and report.structure_match
+                drift_total += report.drift_score
+                hallucination = max(hallucination, report.hallucination_score)
+                drift_details.append(f"chunk[{j}]: 內容已修改 (漂移 {report.drift_score:.2f})")
+                drift_details.extend(f"chunk[{j}]: {detail}" for detail in report.drift_details)
+            
+            for j in range(j1 + paired, j2):
+                drift_details.append(f"chunk[{j}]: 新增區塊")
+                hallucination = max(hallucination, self._detect_hallucination(chunks[j]))
+            for i in range(i1 + paired, i2):
+                drift_details.append(f"chunk[{i}]: 原區塊已移除")
+            
+            unpaired = (i2 - i1) + (j2 - j1) - 2 * paired
+            if unpaired:
+                semantic_match = structure_match = False
+                status = self._worse_status(
+                    status, IntegrityStatus.CORRUPTED if strict else IntegrityStatus.DRIFTED
+                )
+            drift_total += unpaired
+            slots += paired + unpaired
+        
+        if not strict and hallucination > 0.7:
+            status = IntegrityStatus.HALLUCINATED
+            warnings.append(f"高幻覺風險: {hallucination:.2f}")
+        
+        drift_score = min(1.0, drift_total / max(slots, 1))
+        return IntegrityReport(
+            status=status,
+            content_match=root_match,
+            semantic_match=semantic_match,
+            structure_match=structure_match,
+            drift_score=drift_score,
+            stability_score=1.0 - drift_score,
+            hallucination_score=hallucination,
+            drift_details=drift_details,
+            warnings=warnings,
+            fast_path=root_match and mac_match
+        )
+    
+    def _chunk_reusable(self, chunk: str, digest: bytes, sig: SemanticSignature) -> bool:
+        """區塊簽章可沿用：內容相同且語義雜湊出自本金鑰"""
+        return (digest.hex() == sig.content_hash
+                and self._compute_semantic_hash(chunk, digest) == sig.semantic_hash)
+    
+    def _chunked_mac(self, root_hash: str, chunks: List[SemanticSignature]) -> str:
+        """分塊簽章的 HMAC：綁定 Merkle 根與各區塊的語義雜湊"""
+        mac = hmac.new(self.secret_key, bytes.fromhex(root_hash), hashlib.sha256)
+        for sig in chunks:
+            mac.update(sig.semantic_hash.encode())
+        return mac.hexdigest()
+    
+    def _worse_status(self, current: IntegrityStatus, new: IntegrityStatus) -> IntegrityStatus:
+        """取較嚴重的狀態"""
+        if self._STATUS_SEVERITY[new] > self._STATUS_SEVERITY[current]:
+            return new
+        return current
+    
+    def _split_chunks(self, content: Any, chunking: str, window_size: int) -> List[str]:
+        """依切分方式將內容分為區塊"""
+        content_str = encode_content(content).text
+        
+        if chunking == self.CHUNK_PARAGRAPH:
+            return content_str.split('\n\n')
+        if chunking == self.CHUNK_WINDOW:
+            if window_size <= 0:
+                raise ValueError("window_size must be positive")
+            return [
+                content_str[i:i + window_size]
+                for i in range(0, max(len(content_str), 1), window_size)
+            ]
+        raise ValueError(f"unknown chunking: {chunking}")
+    
     def compute_stability_score(self, contents: List[str]) -> float:
         """
         計算多個輸出的穩定性分數
@@ -288,13 +667,22 @@ class SemanticIntegrity:
         avg_distance = sum(distances) / len(distances)
         return max(0.0, 1.0 - avg_distance)
     
-    def _compute_semantic_hash(self, content: str) -> str:
-        """計算語義雜湊"""
-        return self._compute_semantic_hash_cached(content)
-
-    @lru_cache(maxsize=1024)
-    def _compute_semantic_hash_cached(self, content: str) -> str:
-        """計算語義雜湊（緩存版本）"""
+    def _compute_semantic_hash(self, content: str, content_digest: Optional[bytes] = None) -> str:
+        """
+        計算語義雜湊（以內容 digest 快取）
+        
+        Args:
+            content: 標準化後的內容
+            content_digest: 內容的 SHA-256 digest（呼叫端已算出時傳入以免重算）
+        """
+        if content_digest is None:
+            content_digest = hashlib.sha256(content.encode()).digest()
+        return self._semantic_hash_cache.get_or_compute(
+            content_digest, lambda: self._semantic_hash_uncached(content)
+        )
+    
+    def _semantic_hash_uncached(self, content: str) -> str:
+        """計算語義雜湊（無快取）"""
         # 正規化：移除空白、轉小寫
         normalized = ' '.join(content.lower().split())
         
@@ -0,0 +1,377 @@
+"""
+Semantic Signature Binary Codec
+語義簽章二進位編碼
+
+USCA 協議棧位置: L2 Security Layer（儲存 / 傳輸格式）
+類比: 證書的 DER 編碼，取代 JSON 文字表示
+
+格式（所有整數皆為 little-endian）:
+
+    SemanticSignature
+    ┌──────────┬─────┬───────┬──────────────────────────────────────┐
+    │ "SSG"    │ ver │ flags │ body                                 │
+    └──────────┴─────┴───────┴──────────────────────────────────────┘
+    body:
+      content_hash / semantic_hash / structure_hash
+                          u8 長度 + 原始 digest 位元組
+      meaning_vector      varint 個數 + float16/float32 陣列
+      key_concepts        varint 個數 + (varint 長度 + UTF-8)*
+      intent_summary      varint 長度 + UTF-8
+      created_at          i64 epoch 微秒（flags 標記時改為 varint 字串）
+      model_source        varint 長度 + UTF-8
+      version             varint 長度 + UTF-8
+      hallucination_score float32（僅在 flags 標記時存在）
+      minhash             varint 個數 + uint32 陣列（僅在 flags 標記時存在）
+
+    IntegrityReport
+    ┌──────────┬─────┬────────┬───────┬──────────────────────────────┐
+    │ "SIR"    │ ver │ status │ match │ 3 × float32 分數 + 字串列表    │
+    └──────────┴─────┴────────┴───────┴──────────────────────────────┘
+
+解碼接受 bytes / bytearray / memoryview，全程以 offset 讀取，
+不對輸入做切片複製（zero-copy）。
+
+版本: 1.0.0
+"""
+
+import struct
+from datetime import datetime, timedelta
+from typing import List, Tuple, Union
+
+from .semantic_signature import IntegrityReport, IntegrityStatus, SemanticSignature
+
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+SIGNATURE_MAGIC = b"SSG"
+REPORT_MAGIC = b"SIR"
+CODEC_VERSION = 1
+
+# Signature flags
+FLAG_VECTOR_F32 = 0x01      # meaning_vector 以 float32 儲存（預設 float16）
+FLAG_RAW_TIMESTAMP = 0x02   # created_at 無法解析為 epoch，改存原始字串
+FLAG_HALLUCINATION = 0x04   # 附帶簽章時的幻覺分數
+FLAG_MINHASH = 0x08         # 附帶 MinHash 草圖
+
+# IntegrityReport match bits
+_MATCH_CONTENT = 0x01
+_MATCH_SEMANTIC = 0x02
+_MATCH_STRUCTURE = 0x04
+_FAST_PATH = 0x08
+
+_STATUS_ORDER = list(IntegrityStatus)
+_EPOCH = datetime(1970, 1, 1)
+
+_I64 = struct.Struct("<q")
+_F32 = struct.Struct("<f")
+_REPORT_FIXED = struct.Struct("<BB3f")
+
+
+# ========== Varint ==========
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """寫入無號 LEB128 varint"""
+    if value < 0:
+        raise ValueError(f"varint 不支援負數: {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(mv: memoryview, offset: int) -> Tuple[int, int]:
+    """讀取無號 LEB128 varint，回傳 (值, 新 offset)"""
+    result = 0
+    shift = 0
+    while True:
+        if offset >= len(mv):
+            raise ValueError("varint 資料截斷")
+        byte = mv[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
+        if shift > 63:
+            raise ValueError("varint 過長")
+
+
+def _write_str(out: bytearray, value: str) -> None:
+    data = value.encode("utf-8")
+    _write_varint(out, len(data))
+    out += data
+
+
+def _read_str(mv: memoryview, offset: int) -> Tuple[str, int]:
+    length, offset = _read_varint(mv, offset)
+    end = offset + length
+    if end > len(mv):
+        raise ValueError("字串資料截斷")
+    return str(mv[offset:end], "utf-8"), end
+
+
+def _write_str_list(out: bytearray, values: List[str]) -> None:
+    _write_varint(out, len(values))
+    for value in values:
+        _write_str(out, value)
+
+
+def _read_str_list(mv: memoryview, offset: int) -> Tuple[List[str], int]:
+    count, offset = _read_varint(mv, offset)
+    values = []
+    for _ in range(count):
+        value, offset = _read_str(mv, offset)
+        values.append(value)
+    return values, offset
+
+
+def _write_digest(out: bytearray, hex_digest: str) -> None:
+    try:
+        raw = bytes.fromhex(hex_digest)
+    except ValueError:
+        raise ValueError(f"非十六進位 digest: {hex_digest[:16]}...")
+    if len(raw) > 0xFF:
+        raise ValueError("digest 過長")
+    out.append(len(raw))
+    out += raw
+
+
+def _read_digest(mv: memoryview, offset: int) -> Tuple[str, int]:
+    length = mv[offset]
+    start = offset + 1
+    end = start + length
+    if end > len(mv):
+        raise ValueError("digest 資料截斷")
+    return mv[start:end].hex(), end
+
+
+def _check_magic(mv: memoryview, magic: bytes) -> int:
+    """檢查魔數與版本，回傳 body 起始 offset"""
+    header_len = len(magic) + 1
+    if len(mv) < header_len or mv[:len(magic)] != magic:
+        raise ValueError(f"無效的魔數，預期 {magic!r}")
+    version = mv[len(magic)]
+    if version != CODEC_VERSION:
+        raise ValueError(f"不支援的編碼版本: {version}")
+    return header_len
+
+
+# ========== Timestamp ==========
+
+def _timestamp_to_micros(created_at: str) -> int:
+    """
+    將 sign() 產生的 ISO 時間戳轉為 epoch 微秒
+
+    只接受可無損還原的格式，否則拋出 ValueError
+    """
+    if not created_at.endswith("Z"):
+        raise ValueError("非 UTC 時間戳")
+    dt = datetime.fromisoformat(created_at[:-1])
+    if dt.tzinfo is not None or _micros_to_timestamp(_to_micros(dt)) != created_at:
+        raise ValueError("時間戳無法無損還原")
+    return _to_micros(dt)
+
+
+def _to_micros(dt: datetime) -> int:
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _micros_to_timestamp(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat() + "Z"
+
+
+# ========== SemanticSignature ==========
+
+def encode_signature(signature: SemanticSignature, vector_dtype: str = "float16") -> bytes:
+    """
+    將語義簽章編碼為二進位
+
+    Args:
+        signature: 語義簽章
+        vector_dtype: meaning_vector 精度（"float16" 或 "float32"）
+
+    Returns:
+        二進位編碼
+    """
+    if vector_dtype not in ("float16", "float32"):
+        raise ValueError(f"不支援的向量精度: {vector_dtype}")
+
+    flags = 0
+    if vector_dtype == "float32":
+        flags |= FLAG_VECTOR_F32
+    try:
+        ts_micros = _timestamp_to_micros(signature.created_at)
+    except ValueError:
+        flags |= FLAG_RAW_TIMESTAMP
+        ts_micros = 0
+    if signature.hallucination_score is not None:
+        flags |= FLAG_HALLUCINATION
+    if signature.minhash is not None:
+        flags |= FLAG_MINHASH
+
+    out = bytearray(SIGNATURE_MAGIC)
+    out.append(CODEC_VERSION)
+    out.append(flags)
+
+    _write_digest(out, signature.content_hash)
+    _write_digest(out, signature.semantic_hash)
+    _write_digest(out, signature.structure_hash)
+
+    vector = signature.meaning_vector
+    _write_varint(out, len(vector))
+    code = "f" if flags & FLAG_VECTOR_F32 else "e"
+    out += struct.pack(f"<{len(vector)}{code}", *vector)
+
+    _write_str_list(out, signature.key_concepts)
+    _write_str(out, signature.intent_summary)
+
+    if flags & FLAG_RAW_TIMESTAMP:
+        _write_str(out, signature.created_at)
+    else:
+        out += _I64.pack(ts_micros)
+
+    _write_str(out, signature.model_source)
+    _write_str(out, signature.version)
+    if flags & FLAG_HALLUCINATION:
+        out += _F32.pack(signature.hallucination_score)
+    if flags & FLAG_MINHASH:
+        _write_varint(out, len(signature.minhash))
+        out += struct.pack(f"<{len(signature.minhash)}I", *signature.minhash)
+    return bytes(out)
+
+
+def decode_signature_from(data: BufferLike, offset: int = 0) -> Tuple[SemanticSignature, int]:
+    """
+    從緩衝區指定位置解碼語義簽章
+
+    Args:
+        data: 緩衝區（不會被複製）
+        offset: 起始位置
+
+    Returns:
+        (SemanticSignature, 結束 offset)
+    """
+    mv = memoryview(data)
+    try:
+        pos = offset + _check_magic(mv[offset:], SIGNATURE_MAGIC)
+        flags = mv[pos]
+        pos += 1
+
+        content_hash, pos = _read_digest(mv, pos)
+        semantic_hash, pos = _read_digest(mv, pos)
+        structure_hash, pos = _read_digest(mv, pos)
+
+        count, pos = _read_varint(mv, pos)
+        code = "f" if flags & FLAG_VECTOR_F32 else "e"
+        meaning_vector = list(struct.unpack_from(f"<{count}{code}", mv, pos))
+        pos += count * (4 if code == "f" else 2)
+
+        key_concepts, pos = _read_str_list(mv, pos)
+        intent_summary, pos = _read_str(mv, pos)
+
+        if flags & FLAG_RAW_TIMESTAMP:
+            created_at, pos = _read_str(mv, pos)
+        else:
+            (ts_micros,) = _I64.unpack_from(mv, pos)
+            pos += _I64.size
+            created_at = _micros_to_timestamp(ts_micros)
+
+        model_source, pos = _read_str(mv, pos)
+        version, pos = _read_str(mv, pos)
+
+        hallucination_score = None
+        if flags & FLAG_HALLUCINATION:
+            (hallucination_score,) = _F32.unpack_from(mv, pos)
+            pos += _F32.size
+
+        minhash = None
+        if flags & FLAG_MINHASH:
+            count, pos = _read_varint(mv, pos)
+            minhash = list(struct.unpack_from(f"<{count}I", mv, pos))
+            pos += count * 4
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"簽章資料損壞: {e}")
+
+    signature = SemanticSignature(
+        content_hash=content_hash,
+        semantic_hash=semantic_hash,
+        structure_hash=structure_hash,
+        meaning_vector=meaning_vector,
+        key_concepts=key_concepts,
+        intent_summary=intent_summary,
+        created_at=created_at,
+        model_source=model_source,
+        version=version,
+        hallucination_score=hallucination_score,
+        minhash=minhash
+    )
+    return signature, pos
+
+
+def decode_signature(data: BufferLike) -> SemanticSignature:
+    """解碼語義簽章"""
+    signature, _ = decode_signature_from(data)
+    return signature
+
+
+# ========== IntegrityReport ==========
+
+def encode_report(report: IntegrityReport) -> bytes:
+    """將完整性報告編碼為二進位"""
+    match = 0
+    if report.content_match:
+        match |= _MATCH_CONTENT
+    if report.semantic_match:
+        match |= _MATCH_SEMANTIC
+    if report.structure_match:
+        match |= _MATCH_STRUCTURE
+    if report.fast_path:
+        match |= _FAST_PATH
+
+    out = bytearray(REPORT_MAGIC)
+    out.append(CODEC_VERSION)
+    out += _REPORT_FIXED.pack(
+        _STATUS_ORDER.index(report.status),
+        match,
+        report.drift_score,
+        report.stability_score,
+        report.hallucination_score
+    )
+    _write_str_list(out, report.drift_details)
+    _write_str_list(out, report.warnings)
+    return bytes(out)
+
+
+def decode_report_from(data: BufferLike, offset: int = 0) -> Tuple[IntegrityReport, int]:
+    """從緩衝區指定位置解碼完整性報告，回傳 (報告, 結束 offset)"""
+    mv = memoryview(data)
+    try:
+        pos = offset + _check_magic(mv[offset:], REPORT_MAGIC)
+        status_idx, match, drift, stability, hallucination = _REPORT_FIXED.unpack_from(mv, pos)
+        pos += _REPORT_FIXED.size
+        drift_details, pos = _read_str_list(mv, pos)
+        warnings, pos = _read_str_list(mv, pos)
+        status = _STATUS_ORDER[status_idx]
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"報告資料損壞: {e}")
+
+    report = IntegrityReport(
+        status=status,
+        content_match=bool(match & _MATCH_CONTENT),
+        semantic_match=bool(match & _MATCH_SEMANTIC),
+        structure_match=bool(match & _MATCH_STRUCTURE),
+        drift_score=drift,
+        stability_score=stability,
+        hallucination_score=hallucination,
+        drift_details=drift_details,
+        warnings=warnings,
+        fast_path=bool(match & _FAST_PATH)
+    )
+    return report, pos
+
+
+def decode_report(data: BufferLike) -> IntegrityReport:
+    """解碼完整性報告"""
+    report, _ = decode_report_from(data)
+    return report
@@ -0,0 +1,425 @@
+"""
+Signature Index — 近似重複簽章索引
+MinHash 草圖 + 分帶 LSH
+
+USCA 協議棧位置: L2 Security Layer
+類比: 內容指紋資料庫，但查詢的是「語義上接近」而非「位元相同」
+
+semantic_hash 只能偵測關鍵詞集合完全相同的內容。本模組在 sign() 時
+計算字元 shingle 的 MinHash 草圖，並以分帶 LSH 表索引，使
+「在數千萬筆輸出中找出與此輸出相近者」只需檢查少量候選：
+
+- MinHasher: 向量化計算 MinHash 草圖（numpy）
+- SignatureIndex: 記憶體內分帶 LSH 索引（可增量新增）
+- MappedSignatureIndex: 以 mmap 開啟的唯讀磁碟索引，
+  每個 band 為排序後的鍵陣列，以二分搜尋查詢
+
+用法:
+    hasher = MinHasher()
+    integrity = SemanticIntegrity(secret_key="...", sketcher=hasher)
+    index = SignatureIndex(num_perm=hasher.num_perm)
+    index.add("doc-1", integrity.sign(text))
+    index.query(integrity.sign(other_text))
+
+版本: 1.0.0
+"""
+
+import mmap
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .semantic_signature import SemanticSignature
+
+
+SketchLike = Union[SemanticSignature, Sequence[int], np.ndarray]
+
+_MERSENNE_PRIME = np.uint64(4294967311)  # 大於 2^32 的最小質數
+_MASK32 = np.uint64(0xFFFFFFFF)
+_EMPTY = np.uint32(0xFFFFFFFF)
+
+INDEX_MAGIC = b"SLSH"
+INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("<4sB3xIIIQQ4x")
+
+
+def _fmix64(h: np.ndarray) -> np.ndarray:
+    """MurmurHash3 64 位元最終混合（向量化）"""
+    h = h ^ (h >> np.uint64(33))
+    h = h * np.uint64(0xFF51AFD7ED558CCD)
+    h = h ^ (h >> np.uint64(33))
+    h = h * np.uint64(0xC4CEB9FE1A85EC53)
+    return h ^ (h >> np.uint64(33))
+
+
+class MinHasher:
+    """
+    MinHash 草圖產生器
+
+    以字元 k-shingle 表示內容（不依賴空白分詞，適用中英文），
+    每個 shingle 以滾動雜湊得到 32 位元值，再套用 num_perm 個
+    通用雜湊排列取最小值。兩份草圖相同位置相等的比例即為
+    shingle 集合 Jaccard 相似度的無偏估計。
+    """
+
+    DEFAULT_NUM_PERM = 128
+    DEFAULT_SHINGLE_SIZE = 5
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 42
+    ):
+        """
+        初始化草圖產生器
+
+        Args:
+            num_perm: 排列數（草圖長度）
+            shingle_size: 字元 shingle 長度
+            seed: 隨機種子（索引兩端必須一致）
+        """
+        if num_perm <= 0 or shingle_size <= 0:
+            raise ValueError("num_perm and shingle_size must be positive")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._salt = np.uint64(rng.integers(0, 1 << 63))
+
+    def shingle_hashes(self, content: str) -> np.ndarray:
+        """計算去重後的 shingle 32 位元雜湊"""
+        normalized = ' '.join(content.lower().split())
+        codepoints = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        k = self.shingle_size
+        if len(codepoints) < k:
+            if not len(codepoints):
+                return np.empty(0, dtype=np.uint64)
+            k = len(codepoints)
+
+        # 多項式滾動雜湊（uint64 自然溢位）
+        windows = len(codepoints) - k + 1
+        h = np.full(windows, self._salt, dtype=np.uint64)
+        base = np.uint64(0x100000001B3)
+        for j in range(k):
+            h = h * base + codepoints[j:j + windows]
+        return np.unique(_fmix64(h) & _MASK32)
+
+    def sketch_array(self, content: str) -> np.ndarray:
+        """計算 MinHash 草圖（uint32 陣列）"""
+        hashes = self.shingle_hashes(content)
+        if not len(hashes):
+            return np.full(self.num_perm, _EMPTY, dtype=np.uint32)
+
+        result = np.full(self.num_perm, _EMPTY, dtype=np.uint64)
+        # 分塊處理，避免長文件產生 (shingles × num_perm) 的巨大中間矩陣
+        chunk = max(1, (1 << 20) // self.num_perm)
+        for start in range(0, len(hashes), chunk):
+            block = hashes[start:start + chunk, None]
+            permuted = (block * self._a + self._b) % _MERSENNE_PRIME & _MASK32
+            np.minimum(result, permuted.min(axis=0), out=result)
+        return result.astype(np.uint32)
+
+    def sketch(self, content: str) -> List[int]:
+        """計算 MinHash 草圖（可 JSON 序列化的 list）"""
+        return self.sketch_array(content).tolist()
+
+
+def estimate_jaccard(a: SketchLike, b: SketchLike) -> float:
+    """以兩份 MinHash 草圖估算 Jaccard 相似度"""
+    sa, sb = _as_sketch(a), _as_sketch(b)
+    if len(sa) != len(sb):
+        raise ValueError("sketch length mismatch")
+    return float(np.count_nonzero(sa == sb)) / len(sa)
+
+
+def _as_sketch(item: SketchLike) -> np.ndarray:
+    if isinstance(item, SemanticSignature):
+        if item.minhash is None:
+            raise ValueError("signature has no minhash sketch; sign with a sketcher")
+        item = item.minhash
+    return np.asarray(item, dtype=np.uint32)
+
+
+def _band_keys(sketches: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """
+    將草圖切成 bands 段，每段 rows 個值合併為 64 位元鍵
+
+    Args:
+        sketches: (n, bands * rows) uint32
+
+    Returns:
+        (n, bands) uint64
+    """
+    n = sketches.shape[0]
+    parts = sketches[:, :bands * rows].reshape(n, bands, rows).astype(np.uint64)
+    keys = np.zeros((n, bands), dtype=np.uint64)
+    for r in range(rows):
+        keys = _fmix64(keys ^ parts[:, :, r]) + np.uint64(r + 1)
+    # 以 band 編號區分，避免不同 band 的相同值碰撞
+    return _fmix64(keys ^ np.arange(bands, dtype=np.uint64))
+
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """選擇 (bands, rows)，使 LSH S 曲線的轉折點 (1/b)^(1/r) 最接近門檻"""
+    best = (num_perm, 1)
+    best_err = float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        err = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+class SignatureIndex:
+    """
+    記憶體內分帶 LSH 索引
+
+    查詢只比對至少一個 band 完全相同的候選，再以草圖估算的
+    Jaccard 相似度過濾與排序，成本與候選數成正比而非索引大小。
+    """
+
+    def __init__(
+        self,
+        num_perm: int = MinHasher.DEFAULT_NUM_PERM,
+        threshold: float = 0.5,
+        bands: Optional[int] = None
+    ):
+        """
+        初始化索引
+
+        Args:
+            num_perm: 草圖長度（須與 MinHasher 一致）
+            threshold: 近似重複的 Jaccard 門檻
+            bands: band 數（預設依門檻自動選擇）
+        """
+        if bands is None:
+            bands, rows = _choose_bands(num_perm, threshold)
+        else:
+            if num_perm % bands:
+                raise ValueError("num_perm must be divisible by bands")
+            rows = num_perm // bands
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+
+        self._keys: List[str] = []
+        self._key_index: Dict[str, int] = {}
+        self._sketches = np.empty((0, num_perm), dtype=np.uint32)
+        self._pending: List[np.ndarray] = []
+        self._tables: List[Dict[int, List[int]]] = [dict() for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str, item: SketchLike) -> None:
+        """新增一筆草圖"""
+        self.add_many([(key, item)])
+
+    def add_many(self, items: Iterable[Tuple[str, SketchLike]]) -> None:
+        """批次新增草圖（band 鍵以向量化方式計算）"""
+        keys, sketches = [], []
+        for key, item in items:
+            if key in self._key_index:
+                raise ValueError(f"duplicate key: {key}")
+            sketch = _as_sketch(item)
+            if len(sketch) != self.num_perm:
+                raise ValueError("sketch length does not match index num_perm")
+            keys.append(key)
+            sketches.append(sketch)
+        if not keys:
+            return
+
+        matrix = np.vstack(sketches)
+        band_keys = _band_keys(matrix, self.bands, self.rows)
+        base = len(self._keys)
+        for offset, key in enumerate(keys):
+            row = base + offset
+            self._keys.append(key)
+            self._key_index[key] = row
+            for band, band_key in enumerate(band_keys[offset].tolist()):
+                self._tables[band].setdefault(band_key, []).append(row)
+        self._pending.append(matrix)
+
+    def _matrix(self) -> np.ndarray:
+        if self._pending:
+            self._sketches = np.vstack([self._sketches] + self._pending)
+            self._pending = []
+        return self._sketches
+
+    def candidates(self, item: SketchLike) -> np.ndarray:
+        """回傳與查詢至少共享一個 band 的列號"""
+        sketch = _as_sketch(item)
+        band_keys = _band_keys(sketch[None, :], self.bands, self.rows)[0].tolist()
+        rows = set()
+        for band, band_key in enumerate(band_keys):
+            rows.update(self._tables[band].get(band_key, ()))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def query(
+        self,
+        item: SketchLike,
+        k: int = 10,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        查詢近似重複
+
+        Args:
+            item: 查詢簽章或草圖
+            k: 最多回傳筆數
+            threshold: Jaccard 門檻（預設使用索引門檻）
+
+        Returns:
+            [(key, 估計相似度)]，依相似度遞減
+        """
+        rows = self.candidates(item)
+        return _rank(
+            _as_sketch(item), rows, self._matrix(), self._keys.__getitem__,
+            k, self.threshold if threshold is None else threshold
+        )
+
+    def save(self, path: str) -> None:
+        """
+        寫入磁碟索引（供 MappedSignatureIndex 以 mmap 開啟）
+
+        格式:
+            header | sketches (n × num_perm u32)
+                   | band 鍵 (bands × n u64，各 band 內排序)
+                   | band 列號 (bands × n u32)
+                   | key 偏移 ((n + 1) u64) | key UTF-8 資料
+        """
+        sketches = self._matrix()
+        n = len(self._keys)
+        band_keys = _band_keys(sketches, self.bands, self.rows).T  # (bands, n)
+        order = np.argsort(band_keys, axis=1, kind="stable")
+        sorted_keys = np.take_along_axis(band_keys, order, axis=1)
+
+        encoded = [key.encode("utf-8") for key in self._keys]
+        offsets = np.zeros(n + 1, dtype=np.uint64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+
+        with open(path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(
+                INDEX_MAGIC, INDEX_VERSION, self.num_perm, self.bands, self.rows,
+                n, int(self.threshold * 1_000_000)
+            ))
+            f.write(np.ascontiguousarray(sketches, dtype="<u4").tobytes())
+            f.write(np.ascontiguousarray(sorted_keys, dtype="<u8").tobytes())
+            f.write(np.ascontiguousarray(order, dtype="<u4").tobytes())
+            f.write(offsets.astype("<u8").tobytes())
+            f.write(b"".join(encoded))
+
+
+class MappedSignatureIndex:
+    """
+    以 mmap 開啟的唯讀磁碟索引
+
+    開啟時不載入資料；每個 band 以二分搜尋（O(log n)）找出候選，
+    只有候選的草圖與 key 會被實際讀取。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"empty index file: {path}")
+
+        magic, version, num_perm, bands, rows, n, threshold = _INDEX_HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"not a signature index: {path}")
+        if version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"unsupported index version: {version}")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold / 1_000_000
+        self._n = n
+
+        offset = _INDEX_HEADER.size
+        self._sketches = np.frombuffer(self._mmap, dtype="<u4", count=n * num_perm, offset=offset) \
+            .reshape(n, num_perm)
+        offset += n * num_perm * 4
+        self._band_keys = np.frombuffer(self._mmap, dtype="<u8", count=bands * n, offset=offset) \
+            .reshape(bands, n)
+        offset += bands * n * 8
+        self._band_rows = np.frombuffer(self._mmap, dtype="<u4", count=bands * n, offset=offset) \
+            .reshape(bands, n)
+        offset += bands * n * 4
+        self._key_offsets = np.frombuffer(self._mmap, dtype="<u8", count=n + 1, offset=offset)
+        self._key_base = offset + (n + 1) * 8
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __enter__(self) -> "MappedSignatureIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """釋放 mmap（之後不可再查詢）"""
+        self._sketches = self._band_keys = self._band_rows = self._key_offsets = None
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def key(self, row: int) -> str:
+        """讀取指定列的 key"""
+        start = self._key_base + int(self._key_offsets[row])
+        end = self._key_base + int(self._key_offsets[row + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def candidates(self, item: SketchLike) -> np.ndarray:
+        """回傳與查詢至少共享一個 band 的列號"""
+        sketch = _as_sketch(item)
+        band_keys = _band_keys(sketch[None, :], self.bands, self.rows)[0]
+        found = []
+        for band in range(self.bands):
+            keys = self._band_keys[band]
+            lo = np.searchsorted(keys, band_keys[band], side="left")
+            hi = np.searchsorted(keys, band_keys[band], side="right")
+            if hi > lo:
+                found.append(self._band_rows[band, lo:hi])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found)).astype(np.int64)
+
+    def query(
+        self,
+        item: SketchLike,
+        k: int = 10,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """查詢近似重複（語義同 SignatureIndex.query）"""
+        rows = self.candidates(item)
+        return _rank(
+            _as_sketch(item), rows, self._sketches, self.key,
+            k, self.threshold if threshold is None else threshold
+        )
+
+
+def _rank(sketch, rows, sketches, key_of, k, threshold) -> List[Tuple[str, float]]:
+    """以估計 Jaccard 過濾並排序候選"""
+    if not len(rows):
+        return []
+    similarity = (sketches[rows] == sketch).mean(axis=1)
+    keep = similarity >= threshold
+    rows, similarity = rows[keep], similarity[keep]
+    order = np.argsort(-similarity, kind="stable")[:k]
+    return [(key_of(int(rows[i])), float(similarity[i])) for i in order]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+測試標準化編碼與協議棧共用
+"""
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from core import canonical
+from core.canonical import encode, encode_content, encoding_scope
+from enterprise.semantic_compliance import SemanticComplianceEngine
+from security.semantic_signature import SemanticIntegrity
+from validators.sic_fw import SIC_FW
+from validators.sic_pkt import SIC_PKT_Error, SIC_PKT_Handler
+
+
+PAYLOAD = {
+    "intent": "查詢用戶資料",
+    "requester": {"id": "user-123", "role": "analyst"},
+    "constraints": {"max_tokens": 1000, "fields": ["name", "email"]},
+}
+
+
+def test_encoding_matches_legacy_json_dumps():
+    expected = json.dumps(PAYLOAD, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    encoding = encode(PAYLOAD)
+    assert encoding.data == expected
+    assert encoding.hexdigest == hashlib.sha256(expected).hexdigest()
+    assert encoding.size == len(expected)
+    assert encode_content("plain text").data == b"plain text"
+
+
+def test_scope_memoizes_by_identity():
+    canonical.reset_stats()
+    with encoding_scope():
+        first = encode(PAYLOAD)
+        assert encode(PAYLOAD) is first
+        assert encode(dict(PAYLOAD)) is not first
+    assert canonical.stats().encodes == 2
+    assert canonical.stats().scope_hits == 1
+    # 範圍外不記憶化
+    assert encode(PAYLOAD) is not first
+
+
+def test_stats_are_exact_under_threads():
+    canonical.reset_stats()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: [encode(PAYLOAD) for _ in range(500)], range(8)))
+    assert canonical.stats().encodes == 8 * 500
+
+
+def test_in_place_tampering_still_detected():
+    handler = SIC_PKT_Handler("model-a")
+    pkt = handler.create_packet(dict(PAYLOAD), dst_model="model-b")
+    assert handler.validate_packet(pkt) == (True, None)
+    pkt.payload["intent"] = "刪除所有資料"
+    assert handler.validate_packet(pkt) == (False, SIC_PKT_Error.INVALID_SHV)
+
+
+def test_pipeline_serializes_payload_once_in_scope():
+    fw = SIC_FW()
+    handler = SIC_PKT_Handler("model-a")
+    integrity = SemanticIntegrity(secret_key="test-key")
+    compliance = SemanticComplianceEngine()
+    payload = dict(PAYLOAD)
+
+    canonical.reset_stats()
+    with encoding_scope():
+        fw.evaluate(payload)
+        pkt = handler.create_packet(payload, dst_model="model-b")
+        assert handler.validate_packet(pkt) == (True, None)
+        sig = integrity.sign(payload, model_source="model-a")
+        compliance.check_compliance(payload, intent="查詢")
+        compliance.track_lineage(payload, source_model="model-a", intent="查詢")
+    assert canonical.stats().encodes == 1
+    assert sig.content_hash == encode(payload).hexdigest
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+測試語義折疊組件
+"""
+
+import hashlib
+import json
+
+import numpy as np
+import pytest
+
+from folding.manifold import ManifoldStats
+from folding.semantic_folding import FoldingMethod, SemanticFolder
+from folding.quantization import QuantizationMode
+from folding.sparse_projection import SparseProjection, very_sparse_density
+from folding.feature_hashing import HashFamily, hash_indices
+from folding.ivf_index import IVFIndex
+from folding.product_quantization import ProductQuantizer
+from folding.quality import Reservoir
+from folding.vector_store import FoldedVectorStore
+
+
+ORIGINAL_DIM = 512
+TARGET_DIM = 64
+
+# 擬合 PCA 需先 fit，其餘方法可直接折疊
+UNFITTED_METHODS = [m for m in FoldingMethod if m is not FoldingMethod.PCA]
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(7)
+    return rng.standard_normal((20, ORIGINAL_DIM))
+
+
+def _legacy_project(matrix, vector):
+    return [sum(v * p for v, p in zip(vector, row)) for row in matrix.tolist()]
+
+
+@pytest.mark.parametrize("method", [
+    FoldingMethod.RANDOM_PROJECTION, FoldingMethod.LOCALITY_SENSITIVE, FoldingMethod.HYBRID
+])
+def test_fold_key_differs_from_legacy_generator(method, vectors):
+    """矩陣改由 numpy 產生器生成，fold_key 不得與 random.gauss 時期相同"""
+    folded = SemanticFolder(target_dim=TARGET_DIM, method=method).fold(vectors[0].tolist())
+    legacy = f"{ORIGINAL_DIM}:{TARGET_DIM}:42:{method.value}"
+    assert folded.fold_key != hashlib.md5(legacy.encode()).hexdigest()[:16]
+    pca_like = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.PCA_LIKE)
+    legacy = f"{ORIGINAL_DIM}:{TARGET_DIM}:42:{FoldingMethod.PCA_LIKE.value}"
+    assert pca_like.fold(vectors[0].tolist()).fold_key == hashlib.md5(legacy.encode()).hexdigest()[:16]
+
+
+@pytest.mark.parametrize("method", UNFITTED_METHODS)
+def test_fold_is_deterministic_for_seed(method, vectors):
+    a = SemanticFolder(target_dim=TARGET_DIM, method=method, seed=3).fold(vectors[0].tolist())
+    b = SemanticFolder(target_dim=TARGET_DIM, method=method, seed=3).fold(vectors[0].tolist())
+    c = SemanticFolder(target_dim=TARGET_DIM, method=method, seed=4).fold(vectors[0].tolist())
+    assert a.vector == b.vector
+    assert a.folded_dim == TARGET_DIM
+    assert np.linalg.norm(a.vector) == pytest.approx(1.0, abs=1e-5)
+    if method != FoldingMethod.PCA_LIKE:
+        assert a.vector != c.vector
+
+
+def test_projection_matches_reference_loop(vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION)
+    matrix = folder._get_projection_matrix(ORIGINAL_DIM)
+    assert matrix.dtype == np.float32 and matrix.flags.c_contiguous
+    expected = np.asarray(_legacy_project(matrix, vectors[0].astype(np.float32).tolist()))
+    expected /= np.linalg.norm(expected)
+    assert folder.fold(vectors[0].tolist()).vector == pytest.approx(expected.tolist(), abs=1e-5)
+
+
+def test_unfold_is_transpose_projection(vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION)
+    folded = folder.fold(vectors[0].tolist())
+    matrix = folder._get_projection_matrix(ORIGINAL_DIM).astype(np.float64)
+    expected = np.asarray(folded.vector) @ matrix
+    expected /= np.linalg.norm(expected)
+    assert folder.unfold(folded) == pytest.approx(expected.tolist(), abs=1e-5)
+
+
+def test_fold_preserves_similarity_ordering(vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.HYBRID)
+    rng = np.random.default_rng(1)
+    near = vectors[0] + 0.1 * rng.standard_normal(ORIGINAL_DIM)
+    base = folder.fold(vectors[0].tolist())
+    assert folder.compute_similarity(base, folder.fold(near.tolist())) > 0.95
+    assert abs(folder.compute_similarity(base, folder.fold(vectors[1].tolist()))) < 0.5
+
+
+@pytest.mark.parametrize("method", UNFITTED_METHODS)
+def test_fold_batch_matches_single_fold(method, vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=method)
+    batch, manifold = folder.fold_batch(vectors, batch_rows=7)
+    assert len(batch) == len(vectors)
+    assert batch.vectors.dtype == np.float32
+    for i in (0, 8, 19):
+        single = folder.fold(vectors[i].tolist())
+        assert batch[i].vector == pytest.approx(single.vector, abs=1e-5)
+        assert batch[i].preservation_score == pytest.approx(single.preservation_score, abs=1e-5)
+        assert batch[i].fold_key == single.fold_key
+
+    center = np.mean([fv.vector for fv in batch], axis=0)
+    radius = max(np.linalg.norm(np.asarray(fv.vector) - center) for fv in batch)
+    assert manifold.center == pytest.approx(center.tolist(), abs=1e-6)
+    assert manifold.radius == pytest.approx(radius, abs=1e-5)
+
+
+def test_fold_batch_accepts_chunk_iterator(vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION)
+    whole, manifold = folder.fold_batch(vectors)
+    streamed, streamed_manifold = folder.fold_batch(iter([vectors[:5], vectors[5:12], vectors[12:]]))
+    np.testing.assert_allclose(streamed.vectors, whole.vectors, atol=1e-6)
+    assert streamed_manifold.radius == pytest.approx(manifold.radius)
+
+    empty, empty_manifold = folder.fold_batch([])
+    assert len(empty) == 0 and empty_manifold.center == []
+    with pytest.raises(ValueError):
+        folder.fold_batch(iter([vectors[:2], vectors[:2, :100]]))
+
+
+def _low_rank(n, dim, rank, seed, noise=0.05):
+    rng = np.random.default_rng(seed)
+    basis, _ = np.linalg.qr(rng.standard_normal((dim, rank)))
+    scales = np.linspace(3.0, 1.0, rank)
+    return (rng.standard_normal((n, rank)) * scales) @ basis.T + noise * rng.standard_normal((n, dim))
+
+
+def _pairwise_cosine(matrix):
+    unit = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (unit @ unit.T)[np.triu_indices(len(matrix), 1)]
+
+
+def test_fold_stream_updates_mergeable_manifold_stats():
+    data = _clustered(900, ORIGINAL_DIM, clusters=6, seed=4)
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION)
+    whole, manifold = folder.fold_batch(data)
+
+    stats = ManifoldStats()
+    parts = list(folder.fold_stream((data[i:i + 250] for i in range(0, 900, 250)), stats, batch_rows=100))
+    assert [len(p) for p in parts] == [100, 100, 50] * 3 + [100, 50]
+    assert all(p.fold_key == whole.fold_key for p in parts)
+    streamed = np.concatenate([p.vectors for p in parts])
+    np.testing.assert_allclose(streamed, whole.vectors, atol=1e-6)
+
+    assert stats.count == 900
+    np.testing.assert_allclose(stats.mean, whole.vectors.mean(axis=0), atol=1e-6)
+    np.testing.assert_allclose(stats.covariance(), np.cov(whole.vectors.T), atol=1e-6)
+    # 串流半徑為包圍球上界
+    assert manifold.radius <= stats.radius < 1.15 * manifold.radius
+    streamed_manifold = stats.manifold(SemanticFolder.S_STAR)
+    assert streamed_manifold.center == pytest.approx(manifold.center, abs=1e-6)
+    assert streamed_manifold.density == pytest.approx(manifold.density)
+    assert streamed_manifold.count == manifold.count == 900
+
+    # 分片統計合併（含序列化往返）與整體一致
+    shards = [ManifoldStats().update(whole.vectors[:200]), ManifoldStats().update(whole.vectors[200:])]
+    merged = ManifoldStats.from_dict(json.loads(json.dumps(shards[0].to_dict()))).merge(shards[1])
+    assert merged.count == 900
+    np.testing.assert_allclose(merged.mean, stats.mean, atol=1e-9)
+    np.testing.assert_allclose(merged.scatter, stats.scatter, atol=1e-6)
+    assert merged.radius >= manifold.radius - 1e-9
+    assert ManifoldStats().merge(ManifoldStats()).manifold(SemanticFolder.S_STAR).count == 0
+
+
+def test_fit_pca_streams_and_preserves_cosine():
+    data = _low_rank(3000, ORIGINAL_DIM, rank=40, seed=11)
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.PCA)
+    with pytest.raises(ValueError):
+        folder.fold(data[0].tolist())
+
+    basis = folder.fit((data[i:i + 500] for i in range(0, len(data), 500)), batch_rows=256)
+    assert basis.components.shape == (TARGET_DIM, ORIGINAL_DIM)
+    assert basis.n_samples == len(data)
+    np.testing.assert_allclose(basis.components @ basis.components.T, np.eye(TARGET_DIM), atol=1e-4)
+    # 與精確 SVD 的主子空間一致
+    _, _, vt = np.linalg.svd(data, full_matrices=False)
+    overlap = np.linalg.svd(basis.components[:40] @ vt[:40].T, compute_uv=False)
+    assert overlap.min() > 0.99
+
+    # fold / fold_batch 皆為單次矩陣乘法
+    expected = data[:5].astype(np.float32) @ basis.components.T
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    batch, _ = folder.fold_batch(data[:5])
+    np.testing.assert_allclose(batch.vectors, expected, atol=1e-5)
+    assert folder.fold(data[0].tolist()).vector == pytest.approx(expected[0].tolist(), abs=1e-5)
+
+    probe = data[:200]
+    truth = _pairwise_cosine(probe)
+    random_batch, _ = SemanticFolder(
+        target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION
+    ).fold_batch(probe)
+    pca_batch, _ = folder.fold_batch(probe)
+    pca_error = np.abs(_pairwise_cosine(pca_batch.vectors) - truth).mean()
+    random_error = np.abs(_pairwise_cosine(random_batch.vectors) - truth).mean()
+    assert pca_error < 0.01 < random_error
+
+
+def test_pca_basis_persisted_under_fold_key(tmp_path):
+    data = _low_rank(400, ORIGINAL_DIM, rank=20, seed=3)
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.PCA)
+    folder.fit(data, center=True)
+    folded = folder.fold(data[1].tolist())
+    (path,) = folder.save_basis(str(tmp_path))
+    assert path.endswith(f"{folded.fold_key}.npz")
+
+    restored = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.PCA)
+    restored.load_basis(str(tmp_path), folded.fold_key)
+    again = restored.fold(data[1].tolist())
+    assert again.fold_key == folded.fold_key
+    assert again.vector == pytest.approx(folded.vector, abs=1e-6)
+    assert len(restored.unfold(again)) == ORIGINAL_DIM
+
+    # 不同資料擬合的基底有不同金鑰
+    other = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.PCA)
+    other.fit(_low_rank(400, ORIGINAL_DIM, rank=20, seed=4))
+    assert other.fold(data[1].tolist()).fold_key != folded.fold_key
+    with pytest.raises(ValueError):
+        SemanticFolder(target_dim=32, method=FoldingMethod.PCA).load_basis(str(tmp_path), folded.fold_key)
+
+
+def test_reservoir_sample_is_uniform_over_stream():
+    reservoir = Reservoir(500, seed=1)
+    stream = np.arange(20000, dtype=np.float64)[:, None]
+    for start in range(0, len(stream), 3000):
+        reservoir.add(stream[start:start + 3000])
+    sample = reservoir.sample[:, 0]
+    assert reservoir.seen == 20000 and len(sample) == 500
+    assert len(np.unique(sample)) == 500
+    assert abs(sample.mean() - 10000) < 1000
+    assert np.histogram(sample, bins=4, range=(0, 20000))[0].min() > 80
+
+
+def test_evaluate_reports_pairwise_distortion():
+    data = _low_rank(3000, ORIGINAL_DIM, rank=32, seed=2)
+    chunks = (data[i:i + 700] for i in range(0, len(data), 700))
+    small = SemanticFolder(target_dim=16, method=FoldingMethod.RANDOM_PROJECTION).evaluate(
+        chunks, pairs=4000, sample_size=800
+    )
+    large = SemanticFolder(target_dim=256, method=FoldingMethod.RANDOM_PROJECTION).evaluate(
+        data, pairs=4000, sample_size=800
+    )
+    assert (small.vectors_seen, small.sample_size, small.pairs) == (3000, 800, 4000)
+    assert (small.original_dim, small.folded_dim) == (ORIGINAL_DIM, 16)
+    assert set(small.quantiles) == {"p50", "p90", "p99"}
+    assert small.quantiles["p50"] <= small.quantiles["p99"] <= small.max_abs_error
+    # 維度越高失真越小
+    assert large.mean_abs_error < small.mean_abs_error
+    assert large.correlation > small.correlation
+
+    pca = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.PCA)
+    pca.fit(data)
+    report = pca.evaluate(data, pairs=4000, sample_size=800)
+    assert report.quantiles["p99"] < 0.02 and report.correlation > 0.99
+    identity = SemanticFolder(target_dim=ORIGINAL_DIM).evaluate(data, pairs=100)
+    assert identity.max_abs_error < 1e-5
+
+
+def test_procrustes_alignment_recovers_rotation(tmp_path):
+    rng = np.random.default_rng(5)
+    anchors_a = rng.standard_normal((300, TARGET_DIM)).astype(np.float32)
+    anchors_a /= np.linalg.norm(anchors_a, axis=1, keepdims=True)
+    rotation, _ = np.linalg.qr(rng.standard_normal((TARGET_DIM, TARGET_DIM)))
+    anchors_b = anchors_a @ rotation.T + 0.01 * rng.standard_normal(anchors_a.shape)
+
+    folder = SemanticFolder(target_dim=TARGET_DIM)
+    operator = folder.fit_alignment(anchors_a, anchors_b, "model-a", "model-b", holdout=0.25)
+    np.testing.assert_allclose(operator.rotation, rotation, atol=0.02)
+    metrics = operator.metrics
+    assert metrics.held_out and (metrics.fit_anchors, metrics.eval_anchors) == (225, 75)
+    assert metrics.cosine_before < 0.5 < 0.99 < metrics.cosine_after
+    assert metrics.top1_accuracy == 1.0
+
+    aligned = folder.apply_alignment(anchors_b, "model-a", "model-b")
+    assert np.einsum("ij,ij->i", aligned, anchors_a).min() > 0.95
+
+    (path,) = folder.save_alignments(str(tmp_path))
+    restored = SemanticFolder(target_dim=TARGET_DIM)
+    loaded = restored.load_alignment(str(tmp_path), "model-a", "model-b")
+    assert np.array_equal(loaded.rotation, operator.rotation)
+    assert loaded.metrics == metrics
+    with pytest.raises(ValueError):
+        restored.apply_alignment(anchors_b, "model-b", "model-a")
+
+
+def test_align_across_models_batches_without_mutation():
+    rng = np.random.default_rng(9)
+    mix, _ = np.linalg.qr(rng.standard_normal((ORIGINAL_DIM, ORIGINAL_DIM)))
+    # 兩個「模型」共享 16 維語義子空間，模型 B 為其旋轉
+    data_a = _low_rank(400, ORIGINAL_DIM, rank=16, seed=9, noise=0.0)
+    data_b = data_a @ mix
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION)
+    pairs = [(i, i) for i in range(300)]
+
+    batch_a, batch_b = folder.align_across_models(data_a, data_b, pairs, "a", "b")
+    unaligned, _ = folder.fold_batch(data_b)
+    assert len(batch_a) == len(batch_b) == 400
+    assert not np.array_equal(batch_b.vectors, unaligned.vectors)
+    np.testing.assert_allclose(np.linalg.norm(batch_b.vectors, axis=1), 1.0, atol=1e-5)
+    # 非錨點的向量也對齊
+    tail = np.einsum("ij,ij->i", batch_a.vectors[300:], batch_b.vectors[300:])
+    before = np.einsum("ij,ij->i", batch_a.vectors[300:], unaligned.vectors[300:])
+    assert tail.mean() > 0.9 > 0.1 > before.mean()
+    metrics = folder.alignment("a", "b").metrics
+    assert metrics.held_out and metrics.top1_accuracy > 0.95
+
+    same_a, same_b = folder.align_across_models(data_a, data_b, [])
+    assert np.array_equal(same_b.vectors, unaligned.vectors)
+    with pytest.raises(ValueError):
+        folder.align_across_models(data_a, data_b, [(0, 400)])
+
+
+@pytest.mark.parametrize("method", [FoldingMethod.RANDOM_PROJECTION, FoldingMethod.HYBRID])
+def test_projection_matrix_persisted_and_mmapped(method, vectors, tmp_path):
+    reference = SemanticFolder(target_dim=TARGET_DIM, method=method).fold_batch(vectors)[0].vectors
+    writer = SemanticFolder(target_dim=TARGET_DIM, method=method, matrix_dir=str(tmp_path))
+    np.testing.assert_array_equal(writer.fold_batch(vectors)[0].vectors, reference)
+    key = writer._matrix_key(method, ORIGINAL_DIM)
+    assert (tmp_path / f"{key}.npy").exists()
+
+    reader = SemanticFolder(target_dim=TARGET_DIM, method=method, matrix_dir=str(tmp_path))
+    np.testing.assert_array_equal(reader.fold_batch(vectors)[0].vectors, reference)
+    matrix = reader._get_operator(method, ORIGINAL_DIM) if method == FoldingMethod.HYBRID \
+        else reader._get_projection_matrix(ORIGINAL_DIM)
+    assert not matrix.flags.writeable
+
+    # 目標維度不同的折疊器使用不同的 fold_key；同名但形狀不符的檔案被拒絕
+    other = SemanticFolder(target_dim=TARGET_DIM // 2, method=method, matrix_dir=str(tmp_path))
+    assert other._matrix_key(method, ORIGINAL_DIM) != key
+    np.save(tmp_path / f"{other._matrix_key(method, ORIGINAL_DIM)}.npy", np.zeros((3, 3), np.float32))
+    with pytest.raises(ValueError):
+        other.fold_batch(vectors)
+
+
+def test_projection_matrix_shared_memory(vectors):
+    publisher = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.HYBRID, seed=1234)
+    name = publisher.publish_shared(ORIGINAL_DIM)
+    assert publisher.publish_shared(ORIGINAL_DIM) == name
+    try:
+        worker = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.HYBRID, seed=1234, shared=True)
+        np.testing.assert_array_equal(
+            worker.fold_batch(vectors)[0].vectors, publisher.fold_batch(vectors)[0].vectors
+        )
+        operator = worker._get_operator(FoldingMethod.HYBRID, ORIGINAL_DIM)
+        assert not operator.flags.writeable
+        # 附掛的是算子本身，不需生成隨機投影矩陣
+        assert ORIGINAL_DIM not in worker._projection_cache
+        worker.release_shared()
+    finally:
+        publisher.release_shared()
+
+    # 區段移除後退回本地生成
+    fallback = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.HYBRID, seed=1234, shared=True)
+    fallback.fold_batch(vectors)
+    assert not fallback._shared_matrices
+    with pytest.raises(ValueError):
+        SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.VERY_SPARSE_PROJECTION).publish_shared(ORIGINAL_DIM)
+
+
+@pytest.mark.parametrize("family", list(HashFamily))
+def test_semantic_hash_is_signed_feature_hashing(family, vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.SEMANTIC_HASH, hash_family=family)
+    dense = folder._get_operator(FoldingMethod.SEMANTIC_HASH, ORIGINAL_DIM)
+    # 每個分量恰落入一個桶，符號 ±1
+    assert np.array_equal(np.abs(dense).sum(axis=0), np.ones(ORIGINAL_DIM))
+    batch, _ = folder.fold_batch(vectors)
+    expected = vectors.astype(np.float32) @ dense.T
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    np.testing.assert_allclose(batch.vectors, expected, atol=1e-5)
+
+    # 局部性：相近輸入的折疊仍相近，無關輸入接近正交
+    rng = np.random.default_rng(5)
+    near = vectors + 0.1 * rng.standard_normal(vectors.shape)
+    folded_near, _ = folder.fold_batch(near)
+    assert np.einsum("ij,ij->i", batch.vectors, folded_near.vectors).min() > 0.95
+    off_diagonal = (batch.vectors @ batch.vectors.T)[~np.eye(len(vectors), dtype=bool)]
+    assert np.abs(off_diagonal).mean() < 0.2
+
+    other = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.SEMANTIC_HASH, hash_family=(
+        HashFamily.TABULATION if family == HashFamily.MURMUR3 else HashFamily.MURMUR3
+    ))
+    assert other.fold(vectors[0].tolist()).fold_key != batch[0].fold_key
+
+
+def test_murmur3_matches_reference():
+    # MurmurHash3 x86_32 參考值（4 個零位元組）
+    assert hash_indices(np.array([0]), seed=0)[0] == 0x2362F9DE
+    with pytest.raises(ValueError):
+        hash_indices(np.array([-1]), seed=0)
+
+
+@pytest.mark.parametrize("density", [1 / 3, very_sparse_density(ORIGINAL_DIM), 1e-4])
+def test_sparse_projection_matches_dense(density, vectors):
+    projection = SparseProjection.random(TARGET_DIM, ORIGINAL_DIM, density, seed=5)
+    dense = projection.toarray()
+    x = vectors.astype(np.float32)
+    np.testing.assert_allclose(projection.matvec(x[0]), dense @ x[0], atol=1e-4)
+    np.testing.assert_allclose(projection.matmat(x), x @ dense.T, atol=1e-4)
+    y = x[0, :TARGET_DIM]
+    np.testing.assert_allclose(projection.rmatvec(y), y @ dense, atol=1e-4)
+    if density > 1e-3:
+        assert projection.density == pytest.approx(density, rel=0.1)
+        # 每個元素二階矩與高斯投影一致
+        assert float((dense ** 2).mean()) == pytest.approx(1 / TARGET_DIM, rel=0.1)
+
+
+@pytest.mark.parametrize(
+    "method", [FoldingMethod.SPARSE_PROJECTION, FoldingMethod.VERY_SPARSE_PROJECTION]
+)
+def test_sparse_fold_preserves_distances(method, vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=method)
+    projection = folder._get_sparse_projection(method, ORIGINAL_DIM)
+    projected = projection.matmat(vectors.astype(np.float32))
+    original = np.linalg.norm(vectors[:10] - vectors[10:], axis=1)
+    folded = np.linalg.norm(projected[:10] - projected[10:], axis=1)
+    assert np.abs(folded / original - 1).max() < 0.35
+
+    batch, _ = folder.fold_batch(vectors)
+    assert batch.vectors.flags.c_contiguous
+    restored = folder.unfold(batch[0])
+    assert len(restored) == ORIGINAL_DIM
+    with pytest.raises(ValueError):
+        SparseProjection.random(TARGET_DIM, ORIGINAL_DIM, 0.0)
+
+
+@pytest.mark.parametrize(
+    "mode,tolerance", [
+        (QuantizationMode.FLOAT16, 1e-3),
+        (QuantizationMode.INT8, 2e-2),
+        (QuantizationMode.BINARY, 0.35),
+    ]
+)
+def test_quantized_similarity_tracks_float(mode, tolerance, vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.LOCALITY_SENSITIVE)
+    rng = np.random.default_rng(2)
+    near = vectors[:10] + 0.5 * rng.standard_normal((10, ORIGINAL_DIM))
+    batch, _ = folder.fold_batch(np.vstack([vectors[:10], near, vectors[10:]]))
+    quantized = folder.quantize(batch, mode)
+    assert len(quantized) == len(batch)
+
+    for i in range(10):
+        exact = folder.compute_similarity(batch[i], batch[i + 10])
+        approx = folder.compute_similarity(quantized[i], quantized[i + 10])
+        assert approx == pytest.approx(exact, abs=tolerance)
+        single = folder.quantize(batch[i], mode)
+        assert single.similarity(quantized[i + 10]) == pytest.approx(approx, abs=1e-6)
+
+    scores = quantized.similarities(quantized[0])
+    assert scores[0] == pytest.approx(1.0, abs=1e-3)
+    assert scores[10] == pytest.approx(folder.compute_similarity(quantized[0], quantized[10]), abs=1e-5)
+    # 混合比較時還原量化向量
+    assert folder.compute_similarity(batch[0], quantized[0]) > 0.8
+
+
+def test_quantized_memory_reduction(vectors):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION)
+    batch, _ = folder.fold_batch(vectors)
+    float_bytes = batch.vectors.nbytes
+    assert float_bytes / folder.quantize(batch, QuantizationMode.FLOAT16).nbytes == 2
+    assert float_bytes / folder.quantize(batch, QuantizationMode.INT8).nbytes > 3.5
+    assert float_bytes / folder.quantize(batch, QuantizationMode.BINARY).nbytes == 32
+    assert folder.quantize(batch[0], QuantizationMode.BINARY).codes.nbytes == TARGET_DIM // 8
+
+
+@pytest.mark.parametrize("mode", [None] + list(QuantizationMode))
+def test_vector_store_append_reopen_and_search(mode, vectors, tmp_path):
+    folder = SemanticFolder(target_dim=TARGET_DIM, method=FoldingMethod.RANDOM_PROJECTION)
+    batch, _ = folder.fold_batch(vectors)
+    path = str(tmp_path / "folded.store")
+
+    with FoldedVectorStore.create(
+        path, TARGET_DIM, mode=mode, method=folder.method.value,
+        fold_key=batch.fold_key, original_dim=ORIGINAL_DIM
+    ) as store:
+        assert store.append(batch.vectors[:12], ids=[f"doc-{i}" for i in range(12)]) == range(0, 12)
+        assert store.append(batch) == range(12, 32)
+        assert store.id(3) == "doc-3" and store.id(12) == "12"
+
+    with FoldedVectorStore(path) as store:
+        assert len(store) == 32
+        assert (store.method, store.fold_key, store.original_dim) == ("RANDOM_PROJECTION", batch.fold_key, ORIGINAL_DIM)
+        assert store.row_of("doc-5") == 5
+        restored = store.vector(5)
+        if mode != QuantizationMode.BINARY:
+            assert np.dot(restored, batch.vectors[5]) / np.linalg.norm(restored) > 0.99
+
+        results = store.search(batch[7], k=3, scan_rows=5)
+        assert results[0][0] == "doc-7"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-2)
+        rows, scores = store.search_rows(batch.vectors[7], k=40, scan_rows=5)
+        assert len(rows) == 32 and set(rows.tolist()) == set(range(32))
+        assert np.all(np.diff(scores) <= 0)
+        with pytest.raises(ValueError):
+            store.append(batch)
+
+
+def test_vector_store_rejects_bad_input(tmp_path):
+    path = str(tmp_path / "folded.store")
+    with FoldedVectorStore.create(path, 8) as store:
+        with pytest.raises(ValueError):
+            store.append(np.zeros((2, 4)))
+        with pytest.raises(ValueError):
+            store.append(np.zeros((2, 8)), ids=["a"])
+        assert store.search(np.ones(8)) == []
+        assert store.normalize_query(np.zeros(8)) is None
+        assert np.linalg.norm(store.normalize_query(np.full(8, 3.0))) == pytest.approx(1.0)
+        with pytest.raises(ValueError):
+            store.normalize_query(np.ones(4))
+    (tmp_path / "junk").write_bytes(b"x" * 80)
+    with pytest.raises(ValueError):
+        FoldedVectorStore(str(tmp_path / "junk"))
+
+
+def _clustered(n, dim, clusters, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    labels = rng.integers(0, clusters, n)
+    return (centers[labels] + 0.3 * rng.standard_normal((n, dim))).astype(np.float32)
+
+
+def test_ivf_index_recall_incremental_and_persistence(tmp_path):
+    data = _clustered(3000, 32, clusters=20)
+    path = str(tmp_path / "folded.store")
+    store = FoldedVectorStore.create(path, 32)
+    store.append(data[:2000])
+
+    index = IVFIndex(store, nlist=16)
+    index.train(iterations=10)
+    assert index.sync() == 2000
+    # 增量加入
+    rows = store.append(data[2000:])
+    index.add(data[2000:], rows)
+    assert len(index) == 3000 and index.list_sizes().sum() == 3000
+
+    queries = data[::150]
+    hits = 0
+    for q in queries:
+        exact, _ = store.search_rows(q, k=10)
+        approx, scores = index.search_rows(q, k=10, nprobe=4)
+        assert np.all(np.diff(scores) <= 0)
+        hits += len(set(exact.tolist()) & set(approx.tolist()))
+    assert hits / (10 * len(queries)) > 0.9
+    full, _ = index.search_rows(queries[0], k=10, nprobe=16)
+    assert set(full.tolist()) == set(store.search_rows(queries[0], k=10)[0].tolist())
+
+    index.save()
+    loaded = IVFIndex.load(store)
+    assert loaded.search(queries[1], k=5, nprobe=4) == index.search(queries[1], k=5, nprobe=4)
+    store.close()
+
+
+def test_product_quantizer_adc_matches_decoded(tmp_path):
+    data = _clustered(2000, 32, clusters=20)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    pq = ProductQuantizer(32, subspaces=8, ksub=64)
+    with pytest.raises(ValueError):
+        pq.encode(data)
+    pq.train(data, iterations=10)
+
+    codes = pq.encode(data)
+    assert codes.shape == (2000, 8) and codes.dtype == np.uint8
+    assert pq.compression_ratio == 16.0
+    decoded = pq.decode(codes)
+    assert np.mean(np.sum((decoded - data) ** 2, axis=1)) < 0.1
+
+    query = data[3]
+    expected = decoded @ query / np.linalg.norm(decoded, axis=1)
+    np.testing.assert_allclose(pq.adc_scores(codes, pq.lookup_table(query)), expected, atol=1e-5)
+    assert np.argmax(pq.adc_scores(codes, pq.lookup_table(query))) == 3
+
+    pq.save(str(tmp_path / "codebook.pq"))
+    loaded = ProductQuantizer.load(str(tmp_path / "codebook.pq"))
+    assert np.array_equal(loaded.encode(data), codes)
+    with pytest.raises(ValueError):
+        ProductQuantizer(30, subspaces=8)
+
+
+def test_vector_store_product_quantization(tmp_path):
+    data = _clustered(1500, 32, clusters=15)
+    pq = ProductQuantizer(32, subspaces=8, ksub=64)
+    pq.train(data, iterations=10)
+    path = str(tmp_path / "folded.store")
+    with pytest.raises(ValueError):
+        FoldedVectorStore.create(path, 32, mode=QuantizationMode.INT8, quantizer=pq)
+
+    with FoldedVectorStore.create(path, 32, quantizer=pq) as store:
+        store.append(data)
+        assert store.stride == 8
+
+    with FoldedVectorStore(path) as store:
+        assert store.quantizer is not None and store.mode is None
+        assert np.array_equal(store.vectors(0, 10), pq.decode(pq.encode(data[:10])))
+        rows, scores = store.search_rows(data[42], k=5)
+        assert rows[0] == 42 and np.all(np.diff(scores) <= 0)
+        # IVF 候選以 ADC 重排序
+        index = IVFIndex(store, nlist=8)
+        index.train(iterations=5)
+        index.sync()
+        assert index.search_rows(data[42], k=5, nprobe=8)[0].tolist() == rows.tolist()
+
+
+def test_ivf_index_load_keeps_seed(tmp_path):
+    data = _clustered(600, 16, clusters=8)
+    with FoldedVectorStore.create(str(tmp_path / "s"), 16) as store:
+        store.append(data)
+        index = IVFIndex(store, nlist=8, seed=1234)
+        index.train(iterations=5)
+        index.save()
+        loaded = IVFIndex.load(store)
+        assert loaded.seed == 1234
+        # 重新訓練載入的索引可重現原本的質心
+        loaded.train(iterations=5)
+        np.testing.assert_array_equal(loaded.centroids, index.centroids)
+
+
+def test_ivf_index_requires_training(tmp_path):
+    with FoldedVectorStore.create(str(tmp_path / "s"), 8) as store:
+        index = IVFIndex(store, nlist=4)
+        with pytest.raises(ValueError):
+            index.search_rows(np.ones(8))
+        with pytest.raises(ValueError):
+            index.train(np.ones((2, 8)))
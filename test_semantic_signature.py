@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+測試語義簽章組件
+"""
+
+import json
+
+import pytest
+
+from security.semantic_signature import IntegrityStatus, SemanticIntegrity
+from security.signature_codec import (
+    decode_report,
+    decode_signature,
+    decode_signature_from,
+    encode_report,
+    encode_signature,
+)
+
+
+SAMPLE_TEXT = (
+    "The quarterly compliance report covers data retention policies, "
+    "access control reviews and incident response metrics for all regional offices."
+)
+
+
+@pytest.fixture
+def integrity():
+    return SemanticIntegrity(secret_key="test-key")
+
+
+def _assert_signature_dicts_equal(decoded, original, rel=1e-3):
+    decoded_dict = decoded.to_dict()
+    original_dict = original.to_dict()
+    assert decoded_dict.pop("meaning_vector") == pytest.approx(
+        original_dict.pop("meaning_vector"), rel=rel, abs=1e-3
+    )
+    assert decoded_dict.pop("hallucination_score") == pytest.approx(
+        original_dict.pop("hallucination_score"), abs=1e-6
+    )
+    assert decoded_dict == original_dict
+
+
+def test_signature_roundtrip_float16(integrity):
+    """float16 向量編碼後，除精度外 to_dict 完全一致"""
+    sig = integrity.sign(SAMPLE_TEXT, model_source="claude")
+    decoded = decode_signature(encode_signature(sig))
+    _assert_signature_dicts_equal(decoded, sig)
+
+
+def test_signature_roundtrip_float32_from_memoryview(integrity):
+    """float32 向量可從 memoryview 直接解碼"""
+    sig = integrity.sign({"intent": "查詢用戶資料", "scope": "語義完整性"}, model_source="gpt")
+    data = encode_signature(sig, vector_dtype="float32")
+    decoded = decode_signature(memoryview(bytearray(data)))
+    _assert_signature_dicts_equal(decoded, sig, rel=1e-6)
+
+
+def test_signature_raw_timestamp_fallback(integrity):
+    """非 sign() 產生的時間戳以原始字串保存"""
+    sig = integrity.sign(SAMPLE_TEXT)
+    sig.created_at = "2025-12-29 08:00 UTC+8"
+    decoded = decode_signature(encode_signature(sig))
+    assert decoded.created_at == sig.created_at
+
+
+def test_signature_concatenated_records(integrity):
+    """多筆簽章可依序從同一緩衝區解碼"""
+    sigs = [integrity.sign(f"{SAMPLE_TEXT} #{i}") for i in range(3)]
+    buf = b"".join(encode_signature(s) for s in sigs)
+    offset = 0
+    for sig in sigs:
+        decoded, offset = decode_signature_from(buf, offset)
+        assert decoded.content_hash == sig.content_hash
+    assert offset == len(buf)
+
+
+def test_signature_smaller_than_json(integrity):
+    """二進位編碼顯著小於 JSON"""
+    sig = integrity.sign(SAMPLE_TEXT, model_source="claude")
+    json_size = len(json.dumps(sig.to_dict(), ensure_ascii=False).encode("utf-8"))
+    assert len(encode_signature(sig)) < json_size * 0.6
+
+
+def test_signature_rejects_corrupt_data(integrity):
+    """損壞或截斷的資料拋出 ValueError"""
+    data = encode_signature(integrity.sign(SAMPLE_TEXT))
+    with pytest.raises(ValueError):
+        decode_signature(b"XXX" + data[3:])
+    with pytest.raises(ValueError):
+        decode_signature(data[:40])
+
+
+def test_report_roundtrip(integrity):
+    """完整性報告編碼後 to_dict 一致"""
+    sig = integrity.sign(SAMPLE_TEXT)
+    report = integrity.verify(SAMPLE_TEXT + " 據我所知 I think probably", sig)
+    decoded = decode_report(memoryview(encode_report(report)))
+    decoded_dict = decoded.to_dict()
+    original_dict = report.to_dict()
+    for key in ("drift_score", "stability_score", "hallucination_score"):
+        assert decoded_dict.pop(key) == pytest.approx(original_dict.pop(key), abs=1e-6)
+    assert decoded_dict == original_dict
+    assert decoded.status in IntegrityStatus
+
+
+def test_verify_exact_replay_uses_fast_path(integrity):
+    """精確重放走快速路徑，結果與完整分析一致"""
+    sig = integrity.sign(SAMPLE_TEXT)
+    fast = integrity.verify(SAMPLE_TEXT, sig)
+    full = integrity.verify(SAMPLE_TEXT, sig, full_report=True)
+    assert fast.fast_path and not full.fast_path
+    assert fast.status == full.status == IntegrityStatus.INTACT
+    assert fast.drift_score == full.drift_score == 0.0
+    assert fast.hallucination_score == full.hallucination_score
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_verify_fast_path_agrees_with_full_report_across_types(integrity, strict):
+    """dict 與其 JSON 字串內容雜湊相同，快速路徑與完整分析的結果仍須一致"""
+    payload = {"report": SAMPLE_TEXT, "region": "apac", "reviewed": True}
+    as_text = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    for signed, verified in ((payload, as_text), (as_text, payload), (payload, payload)):
+        sig = integrity.sign(signed)
+        fast = integrity.verify(verified, sig, strict=strict)
+        full = integrity.verify(verified, sig, strict=strict, full_report=True)
+        assert fast.fast_path == (signed is verified)
+        fast_dict, full_dict = fast.to_dict(), full.to_dict()
+        del fast_dict["fast_path"], full_dict["fast_path"]
+        assert fast_dict == full_dict
+    report = integrity.verify(as_text, integrity.sign(payload))
+    assert report.content_match and not report.structure_match
+    assert report.status == IntegrityStatus.DRIFTED
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_verify_fast_path_rejects_foreign_key(integrity, strict):
+    """內容與結構雜湊不含金鑰：他方金鑰的簽章不得走快速路徑回報 INTACT"""
+    foreign = SemanticIntegrity(secret_key="other-key").sign(SAMPLE_TEXT)
+    fast = integrity.verify(SAMPLE_TEXT, foreign, strict=strict)
+    full = integrity.verify(SAMPLE_TEXT, foreign, strict=strict, full_report=True)
+    assert not fast.fast_path and not fast.semantic_match
+    assert fast.to_dict() == full.to_dict()
+    if strict:
+        assert fast.status == IntegrityStatus.DRIFTED
+
+
+def test_verify_fast_path_ignores_stored_hallucination_score(integrity):
+    """簽章中的幻覺分數未受保護，竄改後快速路徑仍回報 HALLUCINATED"""
+    hallucinated = "據我所知，這個技術應該是在2020年發明的，我記得可能是Google做的。"
+    sig = integrity.sign(hallucinated)
+    assert sig.hallucination_score > 0.7
+    sig.hallucination_score = 0.0
+    fast = integrity.verify(hallucinated, sig)
+    assert fast.fast_path
+    assert fast.status == IntegrityStatus.HALLUCINATED
+    assert fast.status == integrity.verify(hallucinated, sig, full_report=True).status
+
+
+def test_verify_fast_path_keeps_hallucination_status(integrity):
+    """快速路徑仍回報簽章內容的幻覺狀態"""
+    hallucinated = "據我所知，這個技術應該是在2020年發明的，我記得可能是Google做的。"
+    sig = integrity.sign(hallucinated)
+    report = integrity.verify(hallucinated, sig)
+    assert report.fast_path
+    assert report.status == IntegrityStatus.HALLUCINATED
+    assert report.status == integrity.verify(hallucinated, sig, full_report=True).status
+
+    sig.hallucination_score = None  # 舊版簽章
+    assert integrity.verify(hallucinated, sig).status == IntegrityStatus.HALLUCINATED
+
+
+def test_verify_mismatch_runs_full_analysis(integrity):
+    """內容不符時執行完整分析"""
+    sig = integrity.sign(SAMPLE_TEXT)
+    report = integrity.verify(SAMPLE_TEXT + " (modified)", sig, strict=True)
+    assert not report.fast_path
+    assert not report.content_match
+    assert report.status == IntegrityStatus.CORRUPTED
+
+
+def test_semantic_hash_cache_is_per_instance():
+    """不同金鑰的實例不共用語義雜湊結果"""
+    a = SemanticIntegrity(secret_key="key-a")
+    b = SemanticIntegrity(secret_key="key-b")
+    assert a.sign(SAMPLE_TEXT).semantic_hash != b.sign(SAMPLE_TEXT).semantic_hash
+
+    a.verify(SAMPLE_TEXT + " (modified)", a.sign(SAMPLE_TEXT))
+    a.sign(SAMPLE_TEXT)
+    stats = a.cache_stats()
+    assert stats.hits >= 1
+    assert b.cache_stats().hits == 0
+
+
+def test_digest_cache_byte_budget_and_metrics():
+    """位元組預算觸發淘汰並記錄指標"""
+    import hashlib
+    from security.digest_cache import DigestCache
+
+    cache = DigestCache(max_bytes=1000, sizeof=lambda v: 100)
+    keys = [hashlib.sha256(str(i).encode()).digest() for i in range(20)]
+    for key in keys:
+        cache.put(key, "x")
+
+    stats = cache.stats()
+    assert stats.current_bytes <= 1000
+    assert stats.evictions == 20 - len(cache)
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[-1]) == "x"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_digest_cache_thread_safety():
+    """多執行緒並發存取保持預算一致"""
+    import threading
+    from security.digest_cache import DigestCache
+
+    cache = DigestCache(max_bytes=4096, sizeof=lambda v: 64)
+
+    def worker(offset):
+        for i in range(500):
+            key = (offset * 1000 + i % 50).to_bytes(32, "big")
+            cache.get_or_compute(key, lambda: "v")
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert stats.current_bytes <= 4096
+    assert stats.current_bytes == stats.entries * (32 + 64)
+
+
+def test_signature_index_finds_near_duplicates(tmp_path):
+    """LSH 索引找出近似重複，記憶體與 mmap 索引結果一致"""
+    from security.signature_index import MappedSignatureIndex, MinHasher, SignatureIndex
+
+    integrity = SemanticIntegrity(secret_key="test-key", sketcher=MinHasher())
+    docs = {
+        "report": SAMPLE_TEXT,
+        "weather": "今日天氣晴朗，海洋溫度偏高，沿海地區請注意強風與大浪。",
+        "routing": "Semantic routing selects the closest model node by intent distance.",
+    }
+    index = SignatureIndex(threshold=0.5)
+    for key, text in docs.items():
+        index.add(key, integrity.sign(text))
+
+    drifted = integrity.sign(SAMPLE_TEXT.replace("quarterly", "annual"))
+    assert index.query(drifted)[0][0] == "report"
+    assert index.query(integrity.sign("Completely unrelated text about cooking pasta.")) == []
+
+    path = str(tmp_path / "signatures.idx")
+    index.save(path)
+    with MappedSignatureIndex(path) as mapped:
+        assert len(mapped) == len(docs)
+        assert mapped.query(drifted) == index.query(drifted)
+
+
+def test_minhash_survives_codec(integrity):
+    """MinHash 草圖可經二進位編碼往返"""
+    from security.signature_index import MinHasher
+
+    sig = SemanticIntegrity(secret_key="test-key", sketcher=MinHasher(num_perm=64)).sign(SAMPLE_TEXT)
+    assert decode_signature(encode_signature(sig)).minhash == sig.minhash
+    assert integrity.sign(SAMPLE_TEXT).minhash is None
+
+
+def _make_document(paragraphs: int = 40):
+    return "\n\n".join(
+        f"Section {i}: the retention policy for region {i} requires quarterly access reviews "
+        f"and incident reports filed within {i % 7 + 1} days."
+        for i in range(paragraphs)
+    )
+
+
+def test_chunked_signature_verifies_intact_document(integrity):
+    """分塊簽章對原始文件回報完整"""
+    document = _make_document()
+    chunked = integrity.sign_chunked(document)
+    report = integrity.verify_chunked(document, chunked)
+    assert len(chunked.chunks) == 40
+    assert report.status == IntegrityStatus.INTACT
+    assert report.content_match and report.drift_details == []
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_chunked_signature_rejects_foreign_key(integrity, strict):
+    """Merkle 根不含金鑰：他方金鑰的分塊簽章不得回報 INTACT"""
+    document = _make_document()
+    foreign = SemanticIntegrity(secret_key="other-key").sign_chunked(document)
+    report = integrity.verify_chunked(document, foreign, strict=strict)
+    assert report.status != IntegrityStatus.INTACT
+    assert not report.semantic_match and not report.fast_path
+
+    # 以他方簽章 resign 時不沿用其區塊簽章
+    resigned = integrity.resign_chunked(document, foreign)
+    assert integrity.verify_chunked(document, resigned, strict=strict).status == IntegrityStatus.INTACT
+
+
+def test_chunked_signature_ignores_stored_hallucination_scores(integrity):
+    """區塊簽章中的幻覺分數未受保護，竄改後仍由內容重新計算"""
+    paragraphs = _make_document(10).split("\n\n")
+    paragraphs[3] = "據我所知，這個技術應該是在2020年發明的，我記得可能是Google做的。"
+    document = "\n\n".join(paragraphs)
+    chunked = integrity.sign_chunked(document)
+    for sig in chunked.chunks:
+        sig.hallucination_score = 0.0
+    assert integrity.verify_chunked(document, chunked).status == IntegrityStatus.HALLUCINATED
+
+
+def test_chunked_signature_reports_drifted_chunk(integrity):
+    """修改單一段落時 drift_details 指出該區塊"""
+    document = _make_document()
+    chunked = integrity.sign_chunked(document)
+    paragraphs = document.split("\n\n")
+    paragraphs[17] = "Completely rewritten: marketing copy about a new product launch!!!"
+    report = integrity.verify_chunked("\n\n".join(paragraphs), chunked)
+    assert not report.content_match
+    assert report.drift_details
+    assert all(d.startswith("chunk[17]") for d in report.drift_details)
+
+
+def test_chunked_signature_aligns_inserted_paragraph(integrity):
+    """插入段落不會使後續區塊全部失配"""
+    document = _make_document()
+    chunked = integrity.sign_chunked(document)
+    paragraphs = document.split("\n\n")
+    paragraphs.insert(5, "A newly inserted paragraph.")
+    report = integrity.verify_chunked("\n\n".join(paragraphs), chunked)
+    assert report.drift_details == ["chunk[5]: 新增區塊"]
+    assert report.status == IntegrityStatus.DRIFTED
+
+
+def test_verify_section_uses_merkle_proof(integrity):
+    """單一區塊以 O(log n) 證明驗證"""
+    document = _make_document(33)
+    chunked = integrity.sign_chunked(document)
+    paragraphs = document.split("\n\n")
+    proof = chunked.proof(32)
+    assert len(proof.path) <= 6
+    assert integrity.verify_section(paragraphs[32], 32, chunked)
+    assert not integrity.verify_section(paragraphs[31], 32, chunked)
+
+
+def test_resign_chunked_only_rehashes_touched_path(integrity):
+    """編輯後重簽只重算受影響路徑，根雜湊與完整重簽一致"""
+    document = _make_document()
+    chunked = integrity.sign_chunked(document)
+    paragraphs = document.split("\n\n")
+    paragraphs[3] = "Edited paragraph three."
+    edited = "\n\n".join(paragraphs)
+
+    resigned = integrity.resign_chunked(edited, chunked)
+    assert resigned.root_hash == integrity.sign_chunked(edited).root_hash
+    assert resigned.chunks[4] is chunked.chunks[4]
+    assert resigned.root_hash != chunked.root_hash
+    assert integrity.verify_chunked(edited, resigned).status == IntegrityStatus.INTACT
+
+
+def test_merkle_update_cost_is_logarithmic():
+    """更新單一葉節點的雜湊次數為 O(log n)"""
+    import hashlib
+    from security.merkle import MerkleTree
+
+    digests = [hashlib.sha256(str(i).encode()).digest() for i in range(1000)]
+    tree = MerkleTree(digests)
+    new_digest = hashlib.sha256(b"edited").digest()
+    assert tree.update(500, new_digest) <= 11
+    digests[500] = new_digest
+    assert tree.root == MerkleTree(digests).root
+
+
+def _stream_signature(integrity, i, topic="retention policy audit", model="claude"):
+    return integrity.sign(f"{topic} review number {i} covering access control evidence", model_source=model)
+
+
+def test_drift_monitor_alerts_on_distribution_shift(integrity):
+    """輸出分佈改變時發出警報，且每類只觸發一次"""
+    from security.drift_monitor import DriftAlertKind, DriftMonitor
+
+    monitor = DriftMonitor(window_seconds=60, buckets=6, min_samples=20)
+    t = 0.0
+    for i in range(200):
+        assert monitor.ingest(_stream_signature(integrity, i), timestamp=t) == []
+        t += 0.5
+
+    alerts = []
+    for i in range(200):
+        sig = integrity.sign(
+            f"據我所知 I THINK THE ANSWER IS {i}!!! MAYBE PROBABLY {i * 7}??? 可能是 應該是",
+            model_source="claude"
+        )
+        alerts.extend(monitor.ingest(sig, timestamp=t))
+        t += 0.5
+
+    kinds = [a.kind for a in alerts]
+    assert DriftAlertKind.MEANING_SHIFT in kinds
+    assert DriftAlertKind.CONCEPT_NOVELTY in kinds
+    assert DriftAlertKind.HALLUCINATION_SPIKE in kinds
+    assert len(kinds) == len(set(kinds))
+
+
+def test_drift_monitor_novelty_survives_many_distinct_concepts(integrity):
+    """大量相異概念流過後 sketch 不飽和：穩定一段時間後新概念仍會觸發警報"""
+    from dataclasses import replace
+
+    from security.drift_monitor import DriftAlertKind, DriftMonitor
+
+    monitor = DriftMonitor(window_seconds=60, buckets=6, min_samples=20)
+    base = _stream_signature(integrity, 0)
+    vocabulary = [f"stable-{k}" for k in range(10)]
+    t = 0.0
+
+    def feed(count, concepts):
+        nonlocal t
+        kinds = []
+        for i in range(count):
+            alerts = monitor.ingest(replace(base, key_concepts=concepts(i)), timestamp=t)
+            kinds.extend(a.kind for a in alerts)
+            t += 0.5
+        return kinds
+
+    # 25,000 個相異概念，遠超過 512 x 4 sketch 的容量
+    feed(5000, lambda i: [f"topic-{i}-{k}" for k in range(5)])
+    # 穩定詞彙持續超過窗口 + 參考分佈的長度
+    feed(1000, lambda i: [vocabulary[(i + k) % 10] for k in range(5)])
+    assert monitor.snapshot("claude")["concept_novelty"] == 0.0
+    assert DriftAlertKind.CONCEPT_NOVELTY.value not in monitor.snapshot("claude")["active_alerts"]
+
+    kinds = feed(100, lambda i: [f"fresh-{i}-{k}" for k in range(5)])
+    assert DriftAlertKind.CONCEPT_NOVELTY in kinds
+
+
+def test_drift_monitor_memory_is_bounded(integrity):
+    """窗口與參考分佈只涵蓋最近的時間桶，來源數有上限"""
+    from security.drift_monitor import DriftMonitor
+
+    monitor = DriftMonitor(window_seconds=10, buckets=5, reference_buckets=10, max_sources=3)
+    sig = _stream_signature(integrity, 0)
+    for i in range(1000):
+        monitor.ingest(sig, timestamp=i * 0.1)
+    snapshot = monitor.snapshot("claude")
+    assert snapshot["window_count"] <= 10 / 0.1 + 1
+    assert snapshot["reference_count"] == pytest.approx(20 / 0.1, abs=1)
+    assert snapshot["window_mean"] == pytest.approx(sig.meaning_vector)
+    assert monitor.concept_frequency("claude", sig.key_concepts[0]) == snapshot["window_count"]
+
+    for model in ("a", "b", "c", "d"):
+        monitor.ingest(_stream_signature(integrity, 0, model=model), timestamp=100.0)
+    assert len(monitor.sources()) == 3
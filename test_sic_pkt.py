@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+測試 SIC 封包處理器
+"""
+
+import asyncio
+import copy
+import io
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict, defaultdict, namedtuple
+
+import pytest
+
+from core import canonical
+from validators import sic_pkt
+from validators.sic_pkt import (
+    FRAME_RAW_SHV,
+    FRAME_RAW_SID,
+    FRAME_RAW_TIMESTAMP,
+    FRAME_RAW_VERSION,
+    SIC_Frame,
+    SIC_Header,
+    SIC_Packet,
+    SIC_Payload,
+    SIC_PKT_Error,
+    SIC_PKT_Handler,
+    SIC_PKT_Type,
+    decode_frame,
+    encode_frame,
+)
+from validators.sic_stream import SIC_StreamFormat, SIC_StreamStats, iter_packets, write_packets
+from validators.sic_transport import SIC_Client, SIC_Server, SIC_TransportConfig, run_load
+
+
+PAYLOAD = {
+    "intent": "查詢用戶資料",
+    "requester": {"id": "user-123", "role": "analyst"},
+    "constraints": {"max_tokens": 1000, "fields": ["name", "email"]},
+}
+
+
+@pytest.fixture
+def handler():
+    return SIC_PKT_Handler("model-a")
+
+
+def test_frame_roundtrip_without_copying_payload(handler):
+    pkt = handler.create_packet(dict(PAYLOAD), dst_model="model-b", pkt_type=SIC_PKT_Type.CONTROL, ttl=7)
+    buffer = bytearray(handler.encode_frame(pkt))
+    assert len(buffer) < len(pkt.to_json().encode("utf-8"))
+
+    frame, error = handler.parse_frame(memoryview(buffer))
+    assert error is None
+    assert frame.header == pkt.header
+    assert frame.size == len(buffer)
+    # 載荷是輸入緩衝區的視圖，尚未解碼
+    assert frame.payload.obj is buffer
+    assert frame.to_packet().payload == pkt.payload
+    assert handler.validate_frame(frame) == (True, None)
+
+
+def test_frame_raw_field_fallbacks():
+    header = SIC_Header(SHV="", SID="custom-sid", VER="2.0-beta", src_model="源", timestamp="yesterday")
+    data = encode_frame(SIC_Packet(header=header, payload={}))
+    assert data[4] == FRAME_RAW_SHV | FRAME_RAW_SID | FRAME_RAW_VERSION | FRAME_RAW_TIMESTAMP
+    assert decode_frame(data).header == header
+
+
+def test_forward_frame_updates_routing_fields(handler):
+    pkt = handler.create_packet(dict(PAYLOAD), dst_model="model-b", ttl=2)
+    frame = decode_frame(handler.encode_frame(pkt))
+    forwarded = decode_frame(handler.forward_frame(frame, "model-c-with-longer-id"))
+    assert (forwarded.header.TTL, forwarded.header.hop_count) == (1, 1)
+    assert forwarded.header.dst_model == "model-c-with-longer-id"
+    assert bytes(forwarded.payload) == bytes(frame.payload)
+    assert handler.validate_frame(forwarded) == (True, None)
+
+    expired = decode_frame(handler.forward_frame(forwarded, "model-d"))
+    assert handler.validate_frame(expired) == (False, SIC_PKT_Error.TTL_EXPIRED)
+    with pytest.raises(ValueError, match=SIC_PKT_Error.TTL_EXPIRED.value):
+        handler.forward_frame(expired, "model-e")
+
+
+def test_frame_tampering_and_corruption(handler):
+    data = bytearray(handler.encode_frame(handler.create_packet(dict(PAYLOAD))))
+    data[-2] ^= 0x01
+    frame, error = handler.parse_frame(data)
+    assert error is None
+    assert handler.validate_frame(frame) == (False, SIC_PKT_Error.INVALID_SHV)
+
+    assert handler.parse_frame(data[:-1]) == (None, SIC_PKT_Error.INVALID_FORMAT)
+    assert handler.parse_frame(b"XYZ" + bytes(data[3:])) == (None, SIC_PKT_Error.INVALID_FORMAT)
+    with pytest.raises(ValueError):
+        encode_frame(SIC_Packet(header=SIC_Header(SHV="", SID="", TTL=300), payload={}))
+
+
+def test_concatenated_frames(handler):
+    packets = [handler.create_packet({"seq": i, "intent": "x" * i}) for i in range(5)]
+    stream = b"".join(encode_frame(pkt) for pkt in packets)
+    offset, decoded = 0, []
+    while offset < len(stream):
+        frame = decode_frame(stream, offset)
+        decoded.append(frame.decode_payload())
+        offset += frame.size
+    assert decoded == [pkt.payload for pkt in packets]
+
+
+def test_validation_reuses_cached_encoding(handler):
+    canonical.reset_stats()
+    pkt = handler.create_packet(dict(PAYLOAD), dst_model="model-b")
+    for _ in range(3):
+        assert handler.validate_packet(pkt) == (True, None)
+    assert decode_frame(handler.encode_frame(pkt)).digest_matches()
+    assert SIC_Packet.from_json(pkt.to_json()).payload == PAYLOAD
+    assert canonical.stats().encodes == 1
+
+    # 解析的封包首次驗證編碼一次，之後沿用快取
+    parsed, _ = handler.parse_packet(pkt.to_json())
+    canonical.reset_stats()
+    handler.validate_packet(parsed)
+    handler.validate_packet(parsed)
+    assert canonical.stats().encodes == 1
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda p: p.__setitem__("intent", "刪除所有資料"),
+    lambda p: p["requester"].__setitem__("role", "admin"),
+    lambda p: p["constraints"]["fields"].append("password"),
+    lambda p: p["constraints"]["fields"].sort(),
+    lambda p: p["requester"].update(id="root"),
+    lambda p: p.pop("constraints"),
+    lambda p: p.setdefault("extra", {}),
+])
+def test_nested_mutation_invalidates_cached_encoding(handler, mutate):
+    pkt = handler.create_packet(dict(PAYLOAD))
+    assert handler.validate_packet(pkt) == (True, None)
+    mutate(pkt.payload)
+    assert handler.validate_packet(pkt) == (False, SIC_PKT_Error.INVALID_SHV)
+    pkt.header.SHV = pkt.shv
+    assert handler.validate_packet(pkt) == (True, None)
+
+
+def test_tracked_payload_snapshot_assignment_and_copies(handler):
+    original = copy.deepcopy(PAYLOAD)
+    pkt = handler.create_packet(original)
+    # 建立時取得快照，之後修改傳入的物件不影響封包
+    original["requester"]["role"] = "admin"
+    assert handler.validate_packet(pkt) == (True, None)
+
+    # 新加入的巢狀容器同樣被追蹤
+    pkt.payload["extra"] = {"items": []}
+    pkt.header.SHV = pkt.shv
+    pkt.payload["extra"]["items"].append(1)
+    assert handler.validate_packet(pkt)[1] == SIC_PKT_Error.INVALID_SHV
+
+    pkt.payload = dict(PAYLOAD)
+    assert isinstance(pkt.payload, SIC_Payload)
+    pkt.header.SHV = pkt.shv
+    for clone in (copy.deepcopy(pkt), pickle.loads(pickle.dumps(pkt))):
+        assert handler.validate_packet(clone) == (True, None)
+        clone.payload["requester"]["role"] = "admin"
+        assert handler.validate_packet(clone)[1] == SIC_PKT_Error.INVALID_SHV
+    assert handler.validate_packet(pkt) == (True, None)
+
+
+@pytest.mark.parametrize("nested, mutate", [
+    (lambda: OrderedDict(b=1), lambda v: v.__setitem__("b", 2)),
+    (lambda: defaultdict(list, b=[1]), lambda v: v["b"].append(2)),
+    (lambda: ({"b": 1}, [2]), lambda v: v[0].__setitem__("b", 2)),
+    (lambda: ({"b": 1}, [2]), lambda v: v[1].append(3)),
+    (lambda: namedtuple("Pair", "left right")([1], {"b": 1}), lambda v: v.left.append(2)),
+])
+def test_nested_subclass_and_tuple_mutation_invalidates_encoding(handler, nested, mutate):
+    pkt = handler.create_packet(dict(PAYLOAD))
+    pkt.payload["extra"] = nested()
+    pkt.header.SHV = pkt.shv
+    assert handler.validate_packet(pkt) == (True, None)
+    mutate(pkt.payload["extra"])
+    assert handler.validate_packet(pkt) == (False, SIC_PKT_Error.INVALID_SHV)
+    assert handler.validate_many([pkt]) == [(False, SIC_PKT_Error.INVALID_SHV)]
+
+
+def test_untrackable_payload_is_not_cached(handler):
+    pkt = handler.create_packet(dict(PAYLOAD))
+    pkt.payload["extra"] = namedtuple("Pair", "left right")([1], 2)
+    assert not pkt.payload.tracked
+    pkt.header.SHV = pkt.shv
+    canonical.reset_stats()
+    handler.validate_packet(pkt)
+    handler.validate_packet(pkt)
+    assert canonical.stats().encodes == 2
+
+
+def test_payload_constructors_are_tracked(handler):
+    for payload in (
+        SIC_Payload({"a": {"b": [1]}}),
+        SIC_Payload(a={"b": [1]}),
+        SIC_Payload.fromkeys(["a"], {"b": [1]}),
+    ):
+        before = payload.version
+        payload["a"]["b"].append(2)
+        assert payload.version > before
+        pkt = SIC_Packet(header=SIC_Header(SHV="", SID="sid"), payload=payload)
+        pkt.header.SHV = pkt.shv
+        assert handler.validate_packet(pkt) == (True, None)
+        pkt.payload["a"]["b"].append(3)
+        assert handler.validate_packet(pkt) == (False, SIC_PKT_Error.INVALID_SHV)
+
+    empty = SIC_Payload()
+    nested = handler.create_packet({})
+    nested.payload["inner"] = empty
+    empty_version = nested.payload.version
+    nested.payload["inner"]["x"] = 1
+    assert nested.payload.version > empty_version
+
+
+def test_payload_size_limit_counts_escaped_json(handler):
+    for value in ("ascii", "語義狀態", "emoji 🧠", "del \x7f ctrl \x01\n\"", {"鍵": ["值", 1.5, None]}):
+        payload = {"v": value}
+        data = canonical.encode(payload).data
+        assert sic_pkt._json_ascii_size(data) == len(json.dumps(payload))
+        for limit in range(len(data) - 1, 6 * len(data) + 1):
+            assert sic_pkt._exceeds_json_size(data, limit) == (len(json.dumps(payload)) > limit)
+
+    # UTF-8 約 600 KB，json.dumps 跳脫後約 1.2 MB：與原本的量法一致，超過上限
+    pkt = handler.create_packet({"text": "語" * 200_000})
+    assert pkt.encoding.size <= handler.MAX_PAYLOAD_SIZE < len(json.dumps(pkt.payload))
+    assert handler.validate_packet(pkt) == (False, SIC_PKT_Error.PAYLOAD_TOO_LARGE)
+    assert handler.validate_frame(decode_frame(encode_frame(pkt))) == (False, SIC_PKT_Error.PAYLOAD_TOO_LARGE)
+    assert handler.validate_many([pkt]) == [(False, SIC_PKT_Error.PAYLOAD_TOO_LARGE)]
+
+def _capture(handler, count=20):
+    return [handler.create_packet({"seq": i, "intent": "擷取" * i}, dst_model="model-b") for i in range(count)]
+
+
+@pytest.mark.parametrize("fmt", list(SIC_StreamFormat))
+def test_stream_roundtrip_across_chunk_boundaries(handler, fmt):
+    packets = _capture(handler)
+    buffer = io.BytesIO()
+    assert write_packets(buffer, iter(packets), fmt, buffer_size=100) == len(packets)
+
+    for chunk_size in (1, 7, 1 << 16):
+        buffer.seek(0)
+        stats = SIC_StreamStats()
+        # 未指定格式時自動辨識
+        decoded = list(iter_packets(buffer, chunk_size=chunk_size, stats=stats))
+        assert [pkt.payload for pkt in decoded] == [pkt.payload for pkt in packets]
+        assert [pkt.header for pkt in decoded] == [pkt.header for pkt in packets]
+        assert (stats.records, stats.bytes) == (len(packets), len(buffer.getvalue()))
+        assert all(handler.validate_packet(pkt) == (True, None) for pkt in decoded)
+
+
+def test_stream_reads_incrementally(handler):
+    buffer = io.BytesIO()
+    write_packets(buffer, _capture(handler, 200), SIC_StreamFormat.FRAMED)
+    buffer.seek(0)
+    frames = iter_packets(buffer, decode=False, chunk_size=256)
+    first = next(frames)
+    assert first.header.dst_model == "model-b"
+    assert buffer.tell() <= 256
+    assert sum(1 for _ in frames) == 199
+
+    buffer.seek(0)
+    with pytest.raises(ValueError):
+        list(iter_packets(buffer, SIC_StreamFormat.FRAMED, max_record_size=64))
+
+
+def test_stream_skips_malformed_records_when_not_strict(handler):
+    packets = _capture(handler, 3)
+    lines = [pkt.to_json() for pkt in packets]
+    text = "\n".join([lines[0], "{not json", "", "x" * 5000, lines[1], lines[2]])
+    stats = SIC_StreamStats()
+    decoded = list(iter_packets(io.BytesIO(text.encode("utf-8")), strict=False,
+                                stats=stats, chunk_size=64, max_record_size=1024))
+    assert [pkt.payload["seq"] for pkt in decoded] == [0, 1, 2]
+    assert (stats.records, stats.malformed) == (5, 2)
+    with pytest.raises(ValueError):
+        list(iter_packets(io.BytesIO(text.encode("utf-8"))))
+
+    framed = io.BytesIO()
+    write_packets(framed, packets, SIC_StreamFormat.FRAMED)
+    truncated = framed.getvalue()[:-3]
+    stats = SIC_StreamStats()
+    assert len(list(iter_packets(io.BytesIO(truncated), strict=False, stats=stats))) == 2
+    assert stats.malformed == 1
+    with pytest.raises(ValueError):
+        list(iter_packets(io.BytesIO(truncated)))
+
+
+@pytest.mark.parametrize("trailing", ["\n", ""])
+def test_stream_rejects_oversized_line_read_in_one_chunk(handler, trailing):
+    lines = [pkt.to_json() for pkt in _capture(handler, 2)]
+    limit = max(len(line.encode("utf-8")) for line in lines)
+    # 整個串流落在同一個區塊內，換行在第一次 fill 就已找到
+    data = "\n".join([lines[0], "x" * 5000, lines[1], "y" * 5000]).encode("utf-8") + trailing.encode()
+    assert len(data) < 64 * 1024
+    stats = SIC_StreamStats()
+    decoded = list(iter_packets(io.BytesIO(data), SIC_StreamFormat.NDJSON, strict=False,
+                                stats=stats, chunk_size=64 * 1024, max_record_size=limit))
+    assert [pkt.payload["seq"] for pkt in decoded] == [0, 1]
+    assert (stats.records, stats.malformed, stats.bytes) == (4, 2, len(data))
+    with pytest.raises(ValueError, match="超過上限"):
+        list(iter_packets(io.BytesIO(data), SIC_StreamFormat.NDJSON,
+                          chunk_size=64 * 1024, max_record_size=limit))
+
+
+@pytest.mark.parametrize("decode", [True, False])
+def test_stream_validation_stage(handler, decode):
+    packets = _capture(handler, 5)
+    packets[1].header.SHV = "0" * 64
+    packets[3].header.TTL = 0
+    buffer = io.BytesIO()
+    write_packets(buffer, packets, SIC_StreamFormat.FRAMED)
+    buffer.seek(0)
+    stats = SIC_StreamStats()
+    valid = list(iter_packets(buffer, handler=handler, decode=decode, stats=stats))
+    assert [item.header.SID for item in valid] == [packets[i].header.SID for i in (0, 2, 4)]
+    assert all(isinstance(item, SIC_Packet if decode else SIC_Frame) for item in valid)
+    assert stats.rejected == {
+        SIC_PKT_Error.INVALID_SHV.value: 1,
+        SIC_PKT_Error.TTL_EXPIRED.value: 1,
+    }
+
+    # 訊框可直接轉存為 NDJSON
+    out = io.BytesIO()
+    write_packets(out, valid, SIC_StreamFormat.NDJSON)
+    out.seek(0)
+    assert [pkt.header.SID for pkt in iter_packets(out, handler=handler)] == [item.header.SID for item in valid]
+
+
+def _mixed_batch(handler):
+    big = {"records": ["語義" * 64] * 64}
+    packets = [handler.create_packet(dict(PAYLOAD)) for _ in range(7)]
+    packets[1].header.SHV = "0" * 64
+    packets[2].header.SID = ""
+    packets[3].header.TTL = 0
+    packets[4].header.VER = "9.9.9"
+    packets[5].payload["requester"]["role"] = "admin"   # 修改後快取失效
+    parsed = SIC_Packet.from_json(handler.create_packet(big).to_json())
+    frames = [decode_frame(encode_frame(handler.create_packet(big))) for _ in range(2)]
+    tampered = bytearray(encode_frame(handler.create_packet(big)))
+    tampered[-3] ^= 0x01
+    frames.append(decode_frame(tampered))
+    oversized = handler.create_packet({"blob": "x" * 70000})
+    invalid_payload = SIC_Packet(header=SIC_Header(SHV="x", SID="y"), payload=[1, 2])
+    return packets + [parsed, oversized, invalid_payload] + frames
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_validate_many_matches_single_validation(handler, monkeypatch, workers):
+    monkeypatch.setattr(sic_pkt, "_HASH_WORKERS", workers)
+    handler.PARALLEL_HASH_MIN_BYTES = 1024
+    handler.MAX_PAYLOAD_SIZE = 64 * 1024
+    expected = [
+        handler.validate_frame(item) if isinstance(item, SIC_Frame) else handler.validate_packet(item)
+        for item in _mixed_batch(handler)
+    ]
+    batch = _mixed_batch(handler)
+    results = handler.validate_many(batch)
+    assert results == expected
+    assert {error for _, error in results} == {
+        None,
+        SIC_PKT_Error.MISSING_HEADER,
+        SIC_PKT_Error.INVALID_SHV,
+        SIC_PKT_Error.TTL_EXPIRED,
+        SIC_PKT_Error.PAYLOAD_TOO_LARGE,
+        SIC_PKT_Error.VERSION_MISMATCH,
+    }
+
+    # 批次驗證時計算的編碼快取在封包上
+    canonical.reset_stats()
+    assert handler.validate_packet(batch[7]) == results[7]
+    assert canonical.stats().encodes == 0
+    assert handler.validate_many([]) == []
+
+
+def test_transport_pipelined_requests_over_tcp(handler):
+    packets = _capture(handler, 50)
+    packets[7].header.SHV = "0" * 64
+
+    async def scenario():
+        async with SIC_Server("server") as server:
+            await server.start_tcp()
+            host, port = server.address[:2]
+            async with SIC_Client(host, port, config=SIC_TransportConfig(pool_size=2)) as client:
+                replies = await client.send_many(packets)
+                load = await run_load(client, _capture(handler, 20), concurrency=8)
+            return replies, server.stats, client.stats, load
+
+    replies, server_stats, client_stats, load = asyncio.run(scenario())
+    for pkt, reply in zip(packets, replies):
+        payload = reply.decode_payload()
+        if pkt is packets[7]:
+            assert reply.header.pkt_type == SIC_PKT_Type.ERROR
+            assert payload["error_code"] == SIC_PKT_Error.INVALID_SHV.value
+        else:
+            assert reply.header.pkt_type == SIC_PKT_Type.RESPONSE
+            assert payload == {"ack": pkt.header.SID}
+        assert reply.header.dst_model == pkt.header.src_model
+    assert server_stats.frames_in == server_stats.frames_out == 70
+    assert server_stats.rejected == {SIC_PKT_Error.INVALID_SHV.value: 1}
+    assert client_stats.connections <= 2
+    assert (load["packets"], load["errors"]) == (20, 0)
+
+
+def test_transport_backpressure_over_unix_socket(handler):
+    packets = [handler.create_packet({"seq": i, "blob": "語義" * 1000}) for i in range(40)]
+    config = SIC_TransportConfig(high_watermark=16 * 1024, low_watermark=4 * 1024, max_in_flight=4, pool_size=1)
+
+    async def echo(frame, conn_handler):
+        await asyncio.sleep(0)
+        return frame
+
+    async def scenario(path):
+        async with SIC_Server("server", on_packet=echo, config=config) as server:
+            await server.start_unix(path)
+            async with SIC_Client(path=path, config=config) as client:
+                replies = await client.send_many(packets)
+            return replies, client.stats
+
+    with tempfile.TemporaryDirectory() as tmp:
+        replies, stats = asyncio.run(scenario(os.path.join(tmp, "sic.sock")))
+    assert [reply.decode_payload()["seq"] for reply in replies] == list(range(40))
+    assert all(handler.validate_frame(reply) == (True, None) for reply in replies)
+    assert stats.connections == 1 and stats.pauses > 0
+
+
+def test_transport_rejects_malformed_frames():
+    config = SIC_TransportConfig(max_frame_size=1024)
+
+    async def scenario():
+        async with SIC_Server("server", config=config) as server:
+            await server.start_tcp()
+            host, port = server.address[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            garbage = b"not a frame"
+            writer.write(len(garbage).to_bytes(4, "little") + garbage)
+            size = int.from_bytes(await reader.readexactly(4), "little")
+            error = decode_frame(await reader.readexactly(size))
+
+            # 超過上限的訊框：伺服器關閉連線
+            writer.write((4096).to_bytes(4, "little"))
+            closed = await reader.read() == b""
+            writer.close()
+            return error, closed, server.stats
+
+    error, closed, stats = asyncio.run(scenario())
+    assert error.header.pkt_type == SIC_PKT_Type.ERROR
+    assert error.decode_payload()["error_code"] == SIC_PKT_Error.INVALID_FORMAT.value
+    assert closed and stats.protocol_errors == 1
+
+
+
+def test_transport_callback_errors_keep_pipeline_intact(handler):
+    packets = _capture(handler, 6)
+
+    def flaky(frame, conn_handler):
+        seq = frame.decode_payload()["seq"]
+        if seq % 3 == 1:
+            raise RuntimeError("boom")
+        if seq % 3 == 2:
+            return {"not": "a packet"}          # 無法編碼的回應
+        return None
+
+    async def scenario():
+        async with SIC_Server("server", on_packet=flaky) as server:
+            await server.start_tcp()
+            host, port = server.address[:2]
+            async with SIC_Client(host, port, config=SIC_TransportConfig(pool_size=1)) as client:
+                replies = await client.send_many(packets)
+            return replies, server.stats
+
+    replies, stats = asyncio.run(scenario())
+    for i, reply in enumerate(replies):
+        payload = reply.decode_payload()
+        if i % 3 == 0:
+            assert payload == {"ack": packets[i].header.SID}
+        else:
+            assert payload["error_code"] == SIC_PKT_Error.HANDLER_ERROR.value
+            assert payload["original_sid"] == packets[i].header.SID
+    assert stats.connections == 1
+    assert stats.rejected == {SIC_PKT_Error.HANDLER_ERROR.value: 4}
+
+
+def test_transport_runs_callback_pipeline_in_encoding_scope(handler):
+    from enterprise.semantic_compliance import SemanticComplianceEngine
+    from security.semantic_signature import SemanticIntegrity
+    from validators.sic_fw import SIC_FW
+
+    fw, integrity, compliance = SIC_FW(), SemanticIntegrity(secret_key="test-key"), SemanticComplianceEngine()
+    encodes = []
+
+    def pipeline(frame, conn_handler):
+        payload = frame.decode_payload()
+        before = canonical.stats().encodes
+        fw.evaluate(payload)
+        sig = integrity.sign(payload, model_source=frame.header.src_model)
+        compliance.check_compliance(payload, intent="同步")
+        encodes.append(canonical.stats().encodes - before)
+        assert sig.content_hash == canonical.encode(payload).hexdigest
+
+    async def scenario():
+        async with SIC_Server("server", on_packet=pipeline) as server:
+            await server.start_tcp()
+            host, port = server.address[:2]
+            async with SIC_Client(host, port) as client:
+                return await client.send_many(_capture(handler, 3))
+
+    replies = asyncio.run(scenario())
+    assert all(reply.header.pkt_type == SIC_PKT_Type.RESPONSE for reply in replies)
+    assert encodes == [1, 1, 1]
+    # 範圍只涵蓋請求處理期間
+    assert canonical.encode(PAYLOAD) is not canonical.encode(PAYLOAD)
+
+
+@pytest.mark.parametrize("reply", [b"\x05\x00\x00\x00XXXXX", b"\x05\x00\x00"])
+def test_client_fails_request_on_malformed_reply(handler, reply):
+    async def respond(reader, writer):
+        size = int.from_bytes(await reader.readexactly(4), "little")
+        await reader.readexactly(size)
+        writer.write(reply)
+        await writer.drain()
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(respond, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            async with SIC_Client(host, port) as client:
+                with pytest.raises(ConnectionError):
+                    await asyncio.wait_for(client.send(handler.create_packet({"seq": 1})), 5)
+                return client.stats
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    assert asyncio.run(scenario()).protocol_errors == 1
@@ -1,6 +1,8 @@
 """SIC-SIT Validators"""
 from .sic_fw import SIC_FW, SIC_FW_Result, SIC_FW_Action, SIC_FW_ErrorCode
-from .sic_pkt import SIC_PKT_Handler, SIC_Packet, SIC_Header
+from .sic_pkt import SIC_PKT_Handler, SIC_Packet, SIC_Header, SIC_Frame, SIC_Payload
+from .sic_stream import SIC_StreamFormat, SIC_StreamStats, iter_packets, write_packets
+from .sic_transport import SIC_Server, SIC_Client, SIC_TransportConfig, SIC_TransportStats
 from .sit_handshake import SIT_Session, SIT_Handshake, SIT_SYN, SIT_SYN_ACK, SIT_ACK
 
 # Aliases for cleaner API
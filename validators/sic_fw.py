@@ -26,6 +26,8 @@ from enum import Enum
 from datetime import datetime
 from functools import lru_cache
 
+from core.canonical import encode
+
 
 class SIC_FW_Action(Enum):
     """SIC-FW 動作類型"""
@@ -342,8 +344,8 @@ class SIC_FW:
     
     def _check_injection_patterns(self, state: Dict) -> Optional[Dict]:
         """檢查注入模式"""
-        # 將整個 state 序列化為字串來檢查
-        state_str = json.dumps(state, ensure_ascii=False)
+        # 將整個 state 以標準化編碼序列化為字串來檢查
+        state_str = encode(state).text
         
         for pattern, category in self._compiled_patterns:
             if pattern.search(state_str):
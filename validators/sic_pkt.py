@@ -10,6 +10,9 @@ USCA 協議棧位置: L2 (Network Layer)
 - 封包建立與解析
 - SHV (Semantic-Hash-Vector) 計算
 - TTL 管理
+- 二進位訊框（固定配置標頭 + 不透明載荷，轉發時不需解碼載荷）
+- 封包快取載荷的標準化編碼（載荷修改時以版本號失效）
+- 批次驗證（大載荷的 SHA-256 於執行緒池平行計算）
 
 設計來源: 老翔 USCA 規格
 實作: Claude (尾德) Round 10+
@@ -17,15 +20,21 @@ USCA 協議棧位置: L2 (Network Layer)
 版本: 1.0.0
 """
 
+import hashlib
 import json
+import os
+import struct
+import threading
 import uuid
-import hashlib
-from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import lru_cache
 
+from core.canonical import CanonicalEncoding, canonical_bytes, encode
+
 
 class SIC_PKT_Type(Enum):
     """封包類型"""
@@ -44,6 +53,7 @@ class SIC_PKT_Error(Enum):
     TTL_EXPIRED = "SIC-PKT-004"
     PAYLOAD_TOO_LARGE = "SIC-PKT-005"
     VERSION_MISMATCH = "SIC-PKT-006"
+    HANDLER_ERROR = "SIC-PKT-007"     # 接收端處理封包時發生例外（傳輸層回覆）
 
 
 @dataclass
@@ -96,12 +106,238 @@ class SIC_Header:
         )
 
 
+# ========== 版本追蹤載荷 ==========
+#
+# 封包快取載荷的標準化編碼；一般 dict 無法偵測就地修改，因此載荷
+# 轉為追蹤容器：同一棵樹的所有 dict / list 共用一個版本計數器，
+# 任何層級的修改都會遞增版本，使快取失效。dict / list 的子類別同樣轉換，
+# tuple 遞迴轉換內容；無法追蹤的值（其他物件、tuple 子類別）會將整棵樹
+# 標記為 untracked，封包不再快取編碼，每次重新序列化。
+
+_IMMUTABLE_LEAVES = (str, int, float, bool, type(None))
+
+
+class _Version:
+    __slots__ = ("value", "untracked")
+
+    def __init__(self):
+        self.value = 0
+        self.untracked = False
+
+
+def _track(value: Any, version: _Version) -> Any:
+    """將 dict / list / tuple（遞迴）轉為共用 version 的追蹤容器"""
+    if isinstance(value, _IMMUTABLE_LEAVES):
+        return value
+    if isinstance(value, SIC_Payload) and value._version is version:
+        return value
+    if isinstance(value, _TrackedList) and value._version is version:
+        return value
+    if isinstance(value, dict):
+        tracked = SIC_Payload._new(version)
+        dict.update(tracked, ((k, _track(v, version)) for k, v in dict.items(value)))
+        return tracked
+    if isinstance(value, list):
+        return _TrackedList._new(version, (_track(v, version) for v in value))
+    if type(value) is tuple:
+        return tuple(_track(v, version) for v in value)
+    version.untracked = True
+    return value
+
+
+def _restore(cls: type, items: Any, version: _Version) -> Any:
+    """pickle / deepcopy 還原（保留共用的版本計數器）"""
+    tracked = cls._new(version)
+    if cls is SIC_Payload:
+        dict.update(tracked, items)
+    else:
+        list.extend(tracked, items)
+    return tracked
+
+
+class SIC_Payload(dict):
+    """
+    追蹤修改的載荷 dict
+
+    巢狀 dict / list 同為追蹤容器；修改任一層都會遞增 version
+    """
+    __slots__ = ("_version",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._version = _Version()
+        if args or kwargs:
+            dict.update(self, ((k, _track(v, self._version)) for k, v in dict(*args, **kwargs).items()))
+
+    @classmethod
+    def _new(cls, version: _Version) -> "SIC_Payload":
+        tracked = dict.__new__(cls)
+        tracked._version = version
+        return tracked
+
+    @classmethod
+    def fromkeys(cls, keys, value=None) -> "SIC_Payload":
+        tracked = cls()
+        for key in keys:
+            dict.__setitem__(tracked, key, _track(value, tracked._version))
+        return tracked
+
+    @classmethod
+    def wrap(cls, value: Any) -> Any:
+        """轉為追蹤載荷（已是追蹤載荷時原樣回傳；非 dict 不處理）"""
+        if isinstance(value, SIC_Payload) or not isinstance(value, dict):
+            return value
+        return _track(value, _Version())
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes]) -> "SIC_Payload":
+        """解析 JSON 物件並直接建立追蹤容器"""
+        version = _Version()
+
+        def hook(obj: Dict) -> SIC_Payload:
+            tracked = cls._new(version)
+            dict.update(tracked, (
+                (k, _track(v, version) if type(v) is list else v) for k, v in obj.items()
+            ))
+            return tracked
+
+        payload = json.loads(text, object_hook=hook)
+        if not isinstance(payload, SIC_Payload):
+            raise ValueError("payload must be a JSON object")
+        return payload
+
+    @property
+    def version(self) -> int:
+        return self._version.value
+
+    @property
+    def tracked(self) -> bool:
+        """所有巢狀值皆可追蹤（False 時封包不快取編碼）"""
+        return not self._version.untracked
+
+    def _touch(self) -> None:
+        self._version.value += 1
+
+    def __reduce__(self):
+        return _restore, (SIC_Payload, dict(self), self._version)
+
+    def __setitem__(self, key, value) -> None:
+        dict.__setitem__(self, key, _track(value, self._version))
+        self._touch()
+
+    def __delitem__(self, key) -> None:
+        dict.__delitem__(self, key)
+        self._touch()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._touch()
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self._touch()
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self._touch()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            dict.__setitem__(self, key, _track(value, self._version))
+        self._touch()
+
+
+class _TrackedList(list):
+    """追蹤修改的載荷 list"""
+    __slots__ = ("_version",)
+
+    @classmethod
+    def _new(cls, version: _Version, items: Any = ()) -> "_TrackedList":
+        tracked = cls(items)
+        tracked._version = version
+        return tracked
+
+    def _touch(self) -> None:
+        self._version.value += 1
+
+    def __reduce__(self):
+        return _restore, (_TrackedList, list(self), self._version)
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            value = [_track(v, self._version) for v in value]
+        else:
+            value = _track(value, self._version)
+        list.__setitem__(self, index, value)
+        self._touch()
+
+    def __delitem__(self, index) -> None:
+        list.__delitem__(self, index)
+        self._touch()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n):
+        list.__imul__(self, n)
+        self._touch()
+        return self
+
+    def append(self, value) -> None:
+        list.append(self, _track(value, self._version))
+        self._touch()
+
+    def extend(self, values) -> None:
+        list.extend(self, [_track(v, self._version) for v in values])
+        self._touch()
+
+    def insert(self, index, value) -> None:
+        list.insert(self, index, _track(value, self._version))
+        self._touch()
+
+    def pop(self, *args):
+        value = list.pop(self, *args)
+        self._touch()
+        return value
+
+    def remove(self, value) -> None:
+        list.remove(self, value)
+        self._touch()
+
+    def clear(self) -> None:
+        list.clear(self)
+        self._touch()
+
+    def sort(self, *args, **kwargs) -> None:
+        list.sort(self, *args, **kwargs)
+        self._touch()
+
+    def reverse(self) -> None:
+        list.reverse(self)
+        self._touch()
+
+
 @dataclass
 class SIC_Packet:
     """
     SIC 封包
     
     完整的語義交換封包，包含標頭和載荷
+    
+    載荷轉為 SIC_Payload（追蹤修改），標準化編碼與 SHV 快取於封包上，
+    載荷版本改變時才重新序列化
     """
     header: SIC_Header
     payload: Dict               # SIT State JSON
@@ -110,6 +346,56 @@ class SIC_Packet:
     valid: bool = True
     error: Optional[SIC_PKT_Error] = None
     
+    # 標準化編碼快取（對應的載荷版本）
+    _encoding: Optional[CanonicalEncoding] = field(default=None, init=False, repr=False, compare=False)
+    _encoded_version: int = field(default=-1, init=False, repr=False, compare=False)
+    _encoded_json_size: int = field(default=-1, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "payload":
+            value = SIC_Payload.wrap(value)
+            object.__setattr__(self, "_encoding", None)
+        object.__setattr__(self, name, value)
+    
+    @property
+    def encoding(self) -> CanonicalEncoding:
+        """載荷的標準化編碼（快取；載荷修改後重新編碼）"""
+        if not isinstance(self.payload, SIC_Payload) or not self.payload.tracked:
+            return encode(self.payload)
+        encoding = self._cached_encoding()
+        if encoding is None:
+            encoding = encode(self.payload)
+            self._cache_encoding(encoding)
+        return encoding
+    
+    @property
+    def shv(self) -> str:
+        """依目前載荷計算的 SHV（快取）"""
+        return self.encoding.hexdigest
+    
+    def _cached_encoding(self) -> Optional[CanonicalEncoding]:
+        """目前載荷版本的快取編碼（未快取時回傳 None，不觸發序列化）"""
+        if self._encoding is None or self._encoded_version != getattr(self.payload, "version", None):
+            return None
+        if not self.payload.tracked:
+            return None
+        return self._encoding
+    
+    def _cache_encoding(self, encoding: CanonicalEncoding) -> None:
+        if not self.payload.tracked:
+            return
+        object.__setattr__(self, "_encoding", encoding)
+        object.__setattr__(self, "_encoded_version", self.payload.version)
+        object.__setattr__(self, "_encoded_json_size", -1)
+    
+    def _json_size(self, data: bytes) -> int:
+        """載荷的 json.dumps 長度（對快取的編碼只計算一次）"""
+        if self._encoding is None or data is not self._encoding.data:
+            return _json_ascii_size(data)
+        if self._encoded_json_size < 0:
+            object.__setattr__(self, "_encoded_json_size", _json_ascii_size(data))
+        return self._encoded_json_size
+    
     def to_dict(self) -> Dict:
         return {
             "header": self.header.to_dict(),
@@ -117,7 +403,11 @@ class SIC_Packet:
         }
     
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), ensure_ascii=False)
+        if not isinstance(self.payload, dict):
+            return json.dumps(self.to_dict(), ensure_ascii=False)
+        # 直接嵌入快取的標準化載荷，不再序列化載荷
+        header = json.dumps(self.header.to_dict(), ensure_ascii=False)
+        return f'{{"header": {header}, "payload": {self.encoding.text}}}'
     
     @classmethod
     def from_dict(cls, data: Dict) -> "SIC_Packet":
@@ -127,10 +417,317 @@ class SIC_Packet:
     
     @classmethod
     def from_json(cls, json_str: str) -> "SIC_Packet":
-        data = json.loads(json_str)
+        # 解析時直接建立追蹤容器，載荷不需再轉換
+        data = SIC_Payload.from_json(json_str)
         return cls.from_dict(data)
 
 
+# ========== 二進位訊框 ==========
+#
+# 格式（所有整數皆為 little-endian）:
+#
+#   ┌───────┬─────┬───────┬──────┬─────┬─────┬─────────┬────────┬────────┬──────────┐
+#   │ "SPK" │ ver │ flags │ type │ TTL │ hop │ VER 3×u8 │ SHV 32 │ SID 16 │ ts i64 µs │
+#   ├───────┴─────┴───────┴──────┴─────┴─────┴─────────┴────────┴────────┴──────────┤
+#   │ u8 src 長度 │ u8 dst 長度 │ u32 載荷長度 │ src │ dst │ [原始欄位] │ 載荷        │
+#   └──────────────────────────────────────────────────────────────────────────────┘
+#
+# 載荷為 payload 的標準化 JSON 位元組（core.canonical），SHV 即其 SHA-256。
+# 無法以固定欄位無損表示的 SHV / SID / VER / timestamp 改以 u8 長度 + UTF-8
+# 附在 dst 之後，並在 flags 標記。
+
+SIC_FRAME_MAGIC = b"SPK"
+SIC_FRAME_VERSION = 1
+
+FRAME_RAW_SHV = 0x01        # SHV 非 64 位十六進位（例如空字串）
+FRAME_RAW_SID = 0x02        # SID 非標準 UUID 字串
+FRAME_RAW_VERSION = 0x04    # VER 非 x.y.z（各 ≤ 255）
+FRAME_RAW_TIMESTAMP = 0x08  # timestamp 無法無損轉為 epoch 微秒
+
+# magic, 訊框版本, flags, type, TTL, hop, VER, SHV, SID, timestamp, src 長度, dst 長度, 載荷長度
+_FRAME_HEADER = struct.Struct("<3sBBBBB3B32s16sqBBI")
+
+_PKT_TYPES = list(SIC_PKT_Type)
+_EPOCH = datetime(1970, 1, 1)
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+
+def _timestamp_micros(timestamp: str) -> Optional[int]:
+    """ISO 時間戳 → epoch 微秒（無法無損還原時回傳 None）"""
+    if not timestamp.endswith("Z"):
+        return None
+    try:
+        dt = datetime.fromisoformat(timestamp[:-1])
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        return None
+    delta = dt - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return micros if _micros_timestamp(micros) == timestamp else None
+
+
+def _micros_timestamp(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat() + "Z"
+
+
+def _version_bytes(version: str) -> Optional[Tuple[int, int, int]]:
+    parts = version.split(".")
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        return None
+    numbers = tuple(int(p) for p in parts)
+    if max(numbers) > 255 or ".".join(map(str, numbers)) != version:
+        return None
+    return numbers
+
+
+def _short_bytes(value: str, name: str) -> bytes:
+    data = value.encode("utf-8")
+    if len(data) > 0xFF:
+        raise ValueError(f"{name} 過長（上限 255 位元組）: {len(data)}")
+    return data
+
+
+def _u8(value: int, name: str) -> int:
+    if not 0 <= value <= 0xFF:
+        raise ValueError(f"{name} 超出 u8 範圍: {value}")
+    return value
+
+
+def encode_frame_header(header: SIC_Header, payload_length: int) -> bytes:
+    """
+    編碼訊框標頭（不含載荷）
+
+    Raises:
+        ValueError: TTL / hop_count 超出 u8、模型識別碼過長
+    """
+    flags = 0
+    raw = bytearray()
+
+    shv = b"\x00" * 32
+    try:
+        digest = bytes.fromhex(header.SHV)
+    except ValueError:
+        digest = b""
+    if len(digest) == 32 and digest.hex() == header.SHV:
+        shv = digest
+    else:
+        flags |= FRAME_RAW_SHV
+
+    sid = b"\x00" * 16
+    try:
+        parsed_sid = uuid.UUID(header.SID)
+    except ValueError:
+        parsed_sid = None
+    if parsed_sid is not None and str(parsed_sid) == header.SID:
+        sid = parsed_sid.bytes
+    else:
+        flags |= FRAME_RAW_SID
+
+    version = _version_bytes(header.VER)
+    if version is None:
+        flags |= FRAME_RAW_VERSION
+        version = (0, 0, 0)
+
+    micros = _timestamp_micros(header.timestamp)
+    if micros is None:
+        flags |= FRAME_RAW_TIMESTAMP
+        micros = 0
+
+    for flag, value, name in (
+        (FRAME_RAW_SHV, header.SHV, "SHV"),
+        (FRAME_RAW_SID, header.SID, "SID"),
+        (FRAME_RAW_VERSION, header.VER, "VER"),
+        (FRAME_RAW_TIMESTAMP, header.timestamp, "timestamp"),
+    ):
+        if flags & flag:
+            data = _short_bytes(value, name)
+            raw.append(len(data))
+            raw += data
+
+    src = _short_bytes(header.src_model, "src_model")
+    dst = _short_bytes(header.dst_model, "dst_model")
+    out = bytearray(_FRAME_HEADER.pack(
+        SIC_FRAME_MAGIC, SIC_FRAME_VERSION, flags, _PKT_TYPES.index(header.pkt_type),
+        _u8(header.TTL, "TTL"), _u8(header.hop_count, "hop_count"), *version,
+        shv, sid, micros, len(src), len(dst), payload_length
+    ))
+    out += src
+    out += dst
+    out += raw
+    return bytes(out)
+
+
+def encode_frame(pkt: SIC_Packet) -> bytes:
+    """將封包編碼為二進位訊框（載荷為標準化 JSON 位元組）"""
+    payload = pkt.encoding.data
+    return encode_frame_header(pkt.header, len(payload)) + payload
+
+
+@dataclass
+class SIC_Frame:
+    """
+    已解析標頭的二進位訊框
+
+    載荷保持為輸入緩衝區的 memoryview（未複製、未解碼）
+    """
+    header: SIC_Header
+    payload: memoryview         # 標準化 JSON 位元組
+    size: int                   # 訊框總長度（位元組）
+
+    @property
+    def payload_size(self) -> int:
+        return len(self.payload)
+
+    def digest_matches(self) -> bool:
+        """載荷位元組的 SHA-256 是否等於 SHV"""
+        return hashlib.sha256(self.payload).hexdigest() == self.header.SHV
+
+    def decode_payload(self) -> Dict:
+        return SIC_Payload.from_json(str(self.payload, "utf-8"))
+
+    def to_packet(self) -> SIC_Packet:
+        """解碼載荷，還原為 SIC_Packet（以訊框載荷位元組作為編碼快取）"""
+        data = bytes(self.payload)
+        pkt = SIC_Packet(header=self.header, payload=SIC_Payload.from_json(data))
+        pkt._cache_encoding(CanonicalEncoding(data=data, digest=hashlib.sha256(data).digest()))
+        return pkt
+
+
+def decode_frame(data: BufferLike, offset: int = 0) -> SIC_Frame:
+    """
+    從緩衝區指定位置解析訊框標頭
+
+    只讀取固定標頭與模型識別碼；載荷以 memoryview 切片回傳，不複製也不解碼
+
+    Raises:
+        ValueError: 魔數、版本不符或資料截斷
+    """
+    mv = memoryview(data)
+    if mv.ndim != 1 or mv.itemsize != 1:
+        mv = mv.cast("B")
+    try:
+        (magic, frame_version, flags, type_index, ttl, hop, major, minor, patch,
+         shv, sid, micros, src_len, dst_len, payload_len) = _FRAME_HEADER.unpack_from(mv, offset)
+    except struct.error:
+        raise ValueError("訊框標頭截斷")
+    if magic != SIC_FRAME_MAGIC:
+        raise ValueError(f"無效的魔數，預期 {SIC_FRAME_MAGIC!r}")
+    if frame_version != SIC_FRAME_VERSION:
+        raise ValueError(f"不支援的訊框版本: {frame_version}")
+    if type_index >= len(_PKT_TYPES):
+        raise ValueError(f"未知的封包類型: {type_index}")
+
+    pos = offset + _FRAME_HEADER.size
+    fields = []
+    try:
+        for length in (src_len, dst_len):
+            end = pos + length
+            if end > len(mv):
+                raise ValueError("模型識別碼截斷")
+            fields.append(str(mv[pos:end], "utf-8"))
+            pos = end
+        raw = {}
+        for flag in (FRAME_RAW_SHV, FRAME_RAW_SID, FRAME_RAW_VERSION, FRAME_RAW_TIMESTAMP):
+            if flags & flag:
+                length = mv[pos]
+                end = pos + 1 + length
+                if end > len(mv):
+                    raise ValueError("原始欄位截斷")
+                raw[flag] = str(mv[pos + 1:end], "utf-8")
+                pos = end
+    except (IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"訊框資料損壞: {e}")
+
+    end = pos + payload_len
+    if end > len(mv):
+        raise ValueError("載荷截斷")
+
+    header = SIC_Header(
+        SHV=raw[FRAME_RAW_SHV] if flags & FRAME_RAW_SHV else shv.hex(),
+        SID=raw[FRAME_RAW_SID] if flags & FRAME_RAW_SID else str(uuid.UUID(bytes=sid)),
+        TTL=ttl,
+        VER=raw[FRAME_RAW_VERSION] if flags & FRAME_RAW_VERSION else f"{major}.{minor}.{patch}",
+        src_model=fields[0],
+        dst_model=fields[1],
+        hop_count=hop,
+        pkt_type=_PKT_TYPES[type_index],
+        timestamp=raw[FRAME_RAW_TIMESTAMP] if flags & FRAME_RAW_TIMESTAMP else _micros_timestamp(micros)
+    )
+    return SIC_Frame(header=header, payload=mv[pos:end], size=end - offset)
+
+
+# ========== 載荷大小 ==========
+#
+# MAX_PAYLOAD_SIZE 沿用原本的量法：len(json.dumps(payload))，即非 ASCII
+# 字元以 \uXXXX 跳脫後的長度（BMP 字元 6、補充平面字元 12、DEL 6）。
+# 由標準化 UTF-8 位元組直接換算，不需重新序列化；鍵排序不影響長度。
+
+# 位元組分類：ASCII 0、續位元組 1、2/3 位元組字元前導 2、4 位元組字元前導 3、DEL 4
+_UTF8_CLASSES = bytes(
+    4 if b == 0x7F else 0 if b < 0x80 else 1 if b < 0xC0 else 2 if b < 0xF0 else 3
+    for b in range(256)
+)
+
+
+def _json_ascii_size(data: BufferLike) -> int:
+    """標準化 UTF-8 JSON 位元組 → 等價 json.dumps（ensure_ascii=True）的長度"""
+    data = bytes(data)
+    deletes = data.count(b"\x7f")
+    if data.isascii():
+        return len(data) + 5 * deletes
+    classes = data.translate(_UTF8_CLASSES)
+    continuation, bmp, astral = classes.count(1), classes.count(2), classes.count(3)
+    return len(data) - continuation - bmp - astral + 5 * deletes + 6 * bmp + 12 * astral
+
+
+def _exceeds_json_size(data: BufferLike, limit: int,
+                       measure: Optional[Callable[[BufferLike], int]] = None) -> bool:
+    """
+    json.dumps 長度是否超過 limit
+
+    跳脫後每個 UTF-8 位元組至少 1、至多 3 字元（DEL 為 6），
+    只有落在上下界之間時才逐位元組計算（measure，預設 _json_ascii_size）
+    """
+    size = len(data)
+    if size > limit:
+        return True
+    if 6 * size <= limit:
+        return False
+    if measure is None:
+        if 3 * (size + bytes(data).count(b"\x7f")) <= limit:
+            return False
+        measure = _json_ascii_size
+    return measure(data) > limit
+
+
+# ========== 批次 SHV 計算 ==========
+#
+# hashlib 對 ≥ 2 KiB 的緩衝區釋放 GIL，大載荷可在執行緒池平行雜湊；
+# 小載荷分派的成本高於雜湊本身，直接在呼叫端執行緒計算
+
+_HASH_WORKERS = min(8, os.cpu_count() or 1)
+_hash_pool: Optional[ThreadPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _hash_executor() -> ThreadPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(max_workers=_HASH_WORKERS, thread_name_prefix="sic-shv")
+        return _hash_pool
+
+
+def _sha256(data: BufferLike) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def _measure(item: Union[SIC_Packet, SIC_Frame]) -> Optional[Callable[[BufferLike], int]]:
+    return item._json_size if isinstance(item, SIC_Packet) else None
+
+
 class SIC_PKT_Handler:
     """
     SIC 封包處理器
@@ -141,6 +738,7 @@ class SIC_PKT_Handler:
     # 配置
     MAX_PAYLOAD_SIZE = 1024 * 1024  # 1MB
     SUPPORTED_VERSIONS = ["1.0.0", "1.0.1"]
+    PARALLEL_HASH_MIN_BYTES = 64 * 1024  # 批次驗證時交給執行緒池雜湊的最小載荷
     
     def __init__(self, model_id: str):
         """
@@ -171,7 +769,8 @@ class SIC_PKT_Handler:
             SIC_Packet
         """
         # 計算 SHV (Semantic-Hash-Vector)
-        shv = self._compute_shv(payload)
+        encoding = encode(payload)
+        shv = encoding.hexdigest
         
         # 生成 SID
         sid = str(uuid.uuid4())
@@ -185,7 +784,10 @@ class SIC_PKT_Handler:
             pkt_type=pkt_type
         )
         
-        return SIC_Packet(header=header, payload=payload)
+        # 載荷快照自標準化編碼，與 SHV 一致；驗證時直接使用快取的編碼
+        pkt = SIC_Packet(header=header, payload=SIC_Payload.from_json(encoding.data))
+        pkt._cache_encoding(encoding)
+        return pkt
     
     def parse_packet(self, data: Any) -> Tuple[Optional[SIC_Packet], Optional[SIC_PKT_Error]]:
         """
@@ -229,26 +831,152 @@ class SIC_PKT_Handler:
         if not header.SHV or not header.SID:
             return False, SIC_PKT_Error.MISSING_HEADER
         
-        # 驗證 SHV
-        expected_shv = self._compute_shv(pkt.payload)
-        if header.SHV != expected_shv:
-            return False, SIC_PKT_Error.INVALID_SHV
+        # 驗證 SHV、TTL、版本與載荷大小（json.dumps 跳脫後的長度）
+        # 快取的標準化編碼同時用於大小檢查；載荷未修改時不需序列化
+        encoding = pkt.encoding
+        return self._check_fields(header, encoding.hexdigest, encoding.data, pkt._json_size)
+    
+    def validate_many(
+        self,
+        items: Sequence[Union[SIC_Packet, SIC_Frame]]
+    ) -> List[Tuple[bool, Optional[SIC_PKT_Error]]]:
+        """
+        批次驗證封包 / 訊框
+        
+        結果依輸入順序，與逐一呼叫 validate_packet / validate_frame 相同。
+        尚無快取編碼的封包在呼叫端執行緒序列化（並快取結果）；
+        ≥ PARALLEL_HASH_MIN_BYTES 的載荷收集後於執行緒池平行雜湊，
+        其餘當場計算
+        
+        Args:
+            items: SIC_Packet 與 SIC_Frame 的序列（可混合）
+        
+        Returns:
+            [(True, None) 或 (False, error), ...]
+        """
+        results: List[Optional[Tuple[bool, Optional[SIC_PKT_Error]]]] = []
+        deferred: List[Tuple[int, Union[SIC_Packet, SIC_Frame], BufferLike]] = []
+        parallel_min = self.PARALLEL_HASH_MIN_BYTES if _HASH_WORKERS > 1 else None
+        
+        for item in items:
+            header = item.header
+            if not header.SHV or not header.SID:
+                results.append((False, SIC_PKT_Error.MISSING_HEADER))
+                continue
+            if isinstance(item, SIC_Frame):
+                data = item.payload
+            else:
+                encoding = item._cached_encoding()
+                if encoding is None and not isinstance(item.payload, SIC_Payload):
+                    encoding = encode(item.payload)
+                if encoding is not None:
+                    results.append(self._check_fields(header, encoding.hexdigest, encoding.data, item._json_size))
+                    continue
+                data = canonical_bytes(item.payload)
+            if parallel_min is not None and len(data) >= parallel_min:
+                deferred.append((len(results), item, data))
+                results.append(None)
+                continue
+            digest = hashlib.sha256(data).digest()
+            if isinstance(item, SIC_Packet):
+                item._cache_encoding(CanonicalEncoding(data=data, digest=digest))
+            results.append(self._check_fields(header, digest.hex(), data, _measure(item)))
         
-        # 檢查 TTL
+        if deferred:
+            executor = _hash_executor()
+            futures = [executor.submit(_sha256, data) for _, _, data in deferred]
+            for (i, item, data), future in zip(deferred, futures):
+                digest = future.result()
+                if isinstance(item, SIC_Packet):
+                    item._cache_encoding(CanonicalEncoding(data=data, digest=digest))
+                results[i] = self._check_fields(item.header, digest.hex(), data, _measure(item))
+        return results
+    
+    def _check_fields(
+        self,
+        header: SIC_Header,
+        hexdigest: str,
+        data: BufferLike,
+        measure: Optional[Callable[[BufferLike], int]] = None
+    ) -> Tuple[bool, Optional[SIC_PKT_Error]]:
+        """
+        必要欄位以外的檢查（依 validate_packet 的順序）
+        
+        data 為標準化載荷位元組；大小以 json.dumps 跳脫後的長度計算
+        （見 _exceeds_json_size；measure 為封包快取的計算）
+        """
+        if header.SHV != hexdigest:
+            return False, SIC_PKT_Error.INVALID_SHV
         if header.TTL <= 0:
             return False, SIC_PKT_Error.TTL_EXPIRED
-        
-        # 檢查版本
         if header.VER not in self.SUPPORTED_VERSIONS:
             return False, SIC_PKT_Error.VERSION_MISMATCH
-        
-        # 檢查載荷大小
-        payload_size = len(json.dumps(pkt.payload))
-        if payload_size > self.MAX_PAYLOAD_SIZE:
+        if _exceeds_json_size(data, self.MAX_PAYLOAD_SIZE, measure):
             return False, SIC_PKT_Error.PAYLOAD_TOO_LARGE
-        
         return True, None
     
+    # ========== 二進位訊框 ==========
+    
+    def encode_frame(self, pkt: SIC_Packet) -> bytes:
+        """將封包編碼為二進位訊框"""
+        return encode_frame(pkt)
+    
+    def parse_frame(self, data: BufferLike) -> Tuple[Optional[SIC_Frame], Optional[SIC_PKT_Error]]:
+        """
+        解析訊框標頭（載荷不解碼，供轉發者路由）
+        
+        Args:
+            data: bytes / bytearray / memoryview（不會被複製）
+        
+        Returns:
+            (SIC_Frame, None) 成功
+            (None, error) 失敗
+        """
+        try:
+            return decode_frame(data), None
+        except ValueError:
+            return None, SIC_PKT_Error.INVALID_FORMAT
+    
+    def validate_frame(self, frame: SIC_Frame) -> Tuple[bool, Optional[SIC_PKT_Error]]:
+        """
+        驗證訊框（SHV 直接對載荷位元組計算，不需解碼 JSON）
+        """
+        header = frame.header
+        if not header.SHV or not header.SID:
+            return False, SIC_PKT_Error.MISSING_HEADER
+        return self._check_fields(header, hashlib.sha256(frame.payload).hexdigest(), frame.payload)
+    
+    def forward_frame(self, frame: SIC_Frame, next_model: str) -> bytes:
+        """
+        轉發訊框（減少 TTL、增加跳躍計數、更新目標），載荷原樣複製
+        
+        TTL 已為 0 的訊框不可再轉發；呼叫端可改以 create_error_packet
+        回覆 TTL_EXPIRED
+        
+        Returns:
+            新的訊框位元組
+        
+        Raises:
+            ValueError: TTL 已耗盡（訊息以 SIC_PKT_Error.TTL_EXPIRED 的錯誤碼開頭）
+        """
+        header = frame.header
+        if header.TTL <= 0:
+            raise ValueError(f"{SIC_PKT_Error.TTL_EXPIRED.value}: TTL 已耗盡，無法轉發")
+        forwarded = SIC_Header(
+            SHV=header.SHV,
+            SID=header.SID,
+            TTL=header.TTL - 1,
+            VER=header.VER,
+            src_model=header.src_model,
+            dst_model=next_model,
+            hop_count=header.hop_count + 1,
+            pkt_type=header.pkt_type,
+            timestamp=header.timestamp
+        )
+        out = bytearray(encode_frame_header(forwarded, frame.payload_size))
+        out += frame.payload
+        return bytes(out)
+    
     def forward_packet(self, pkt: SIC_Packet, next_model: str) -> SIC_Packet:
         """
         轉發封包（減少 TTL，更新路由資訊）
@@ -307,11 +1035,8 @@ class SIC_PKT_Handler:
         這是語義內容的唯一識別碼，類似於 IP 封包的校驗碼
         但這裡雜湊的是「語義內容」而非「位元組」
         """
-        # 正規化 JSON
-        normalized = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-        
-        # 計算 SHA-256
-        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        # 正規化 JSON 並計算 SHA-256
+        return encode(payload).hexdigest
     
     def compute_semantic_distance(self, pkt1: SIC_Packet, pkt2: SIC_Packet) -> float:
         """
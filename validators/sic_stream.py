@@ -0,0 +1,342 @@
+"""
+SIC-Stream — SIC 封包串流讀寫
+
+USCA 協議棧位置: L2 (Network Layer，擷取檔 / 串流 I/O)
+類比: pcap 讀寫
+
+以固定上限的緩衝區逐筆解析封包擷取檔，記憶體用量與檔案大小無關:
+
+- NDJSON: 每行一個 SIC_Packet.to_json()
+- FRAMED: u32 little-endian 長度前綴 + 二進位訊框（sic_pkt.encode_frame）
+
+iter_packets 自動辨識格式（FRAMED 記錄的第 5～7 位元組為訊框魔數），
+可選擇串接驗證階段（validate_stream），只輸出通過驗證的封包。
+
+版本: 1.0.0
+"""
+
+import struct
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Union
+
+from .sic_pkt import (
+    SIC_FRAME_MAGIC,
+    SIC_Frame,
+    SIC_Packet,
+    SIC_PKT_Handler,
+    decode_frame,
+    encode_frame,
+    encode_frame_header,
+)
+
+
+class SIC_StreamFormat(Enum):
+    """串流記錄格式"""
+    NDJSON = "ndjson"           # 每行一個 JSON 封包
+    FRAMED = "framed"           # u32 長度前綴 + 二進位訊框
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# 載荷上限加上標頭 / JSON 外殼的餘裕
+DEFAULT_MAX_RECORD_SIZE = SIC_PKT_Handler.MAX_PAYLOAD_SIZE + 64 * 1024
+
+RECORD_LENGTH = struct.Struct("<I")  # FRAMED 記錄的長度前綴（sic_transport 共用）
+
+StreamItem = Union[SIC_Packet, SIC_Frame]
+
+
+@dataclass
+class SIC_StreamStats:
+    """串流處理指標"""
+    records: int = 0            # 讀取的記錄數（含無效記錄）
+    bytes: int = 0              # 消耗的位元組
+    malformed: int = 0          # 無法解析或超過上限（非嚴格模式下略過）
+    rejected: Dict[str, int] = field(default_factory=dict)  # 驗證失敗，依錯誤碼
+
+    def to_dict(self) -> Dict:
+        return {
+            "records": self.records,
+            "bytes": self.bytes,
+            "malformed": self.malformed,
+            "rejected": dict(self.rejected)
+        }
+
+
+class _ChunkReader:
+    """有界讀取緩衝區：只保留尚未消耗的位元組"""
+
+    def __init__(self, fileobj: BinaryIO, chunk_size: int):
+        self._read = fileobj.read
+        self._chunk_size = chunk_size
+        self.buf = bytearray()
+        self.pos = 0
+        self.offset = 0             # buf[0] 在串流中的位移
+        self.eof = False
+
+    @property
+    def available(self) -> int:
+        return len(self.buf) - self.pos
+
+    @property
+    def position(self) -> int:
+        """目前讀取位置在串流中的位移"""
+        return self.offset + self.pos
+
+    def fill(self, size: int) -> bool:
+        """確保緩衝區至少有 size 位元組未消耗（檔案結束前不足時回傳 False）"""
+        while self.available < size:
+            if self.eof:
+                return False
+            if self.pos:
+                del self.buf[:self.pos]
+                self.offset += self.pos
+                self.pos = 0
+            chunk = self._read(max(self._chunk_size, size - self.available))
+            if not chunk:
+                self.eof = True
+            elif isinstance(chunk, str):
+                raise ValueError("串流須以二進位模式開啟")
+            else:
+                self.buf += chunk
+        return True
+
+    def take(self, size: int) -> bytes:
+        with memoryview(self.buf) as view:
+            data = bytes(view[self.pos:self.pos + size])
+        self.pos += size
+        return data
+
+    def skip(self, size: int) -> int:
+        """丟棄最多 size 位元組（不為其保留緩衝區），回傳實際丟棄數"""
+        skipped = 0
+        while skipped < size:
+            if not self.available and not self.fill(1):
+                break
+            step = min(size - skipped, self.available)
+            self.pos += step
+            skipped += step
+        return skipped
+
+
+def _ndjson_records(reader: _ChunkReader, max_record_size: int, stats: SIC_StreamStats,
+                    strict: bool) -> Iterator[bytes]:
+    scanned = 0                     # 目前這行已確認不含換行的位元組數
+    while True:
+        newline = reader.buf.find(b"\n", reader.pos + scanned)
+        if newline < 0:
+            scanned = reader.available
+            if scanned > max_record_size:
+                stats.records += 1
+                stats.malformed += 1
+                if strict:
+                    raise ValueError(f"位移 {reader.position} 的記錄超過上限 {max_record_size} 位元組")
+                # 丟棄到下一個換行
+                while reader.buf.find(b"\n", reader.pos) < 0:
+                    stats.bytes += reader.skip(reader.available)
+                    if not reader.fill(1):
+                        return
+                newline = reader.buf.find(b"\n", reader.pos)
+                stats.bytes += newline + 1 - reader.pos
+                reader.pos = newline + 1
+                scanned = 0
+                continue
+            if reader.fill(scanned + 1):
+                continue
+            if not scanned:
+                return
+            newline = len(reader.buf)   # 最後一行沒有換行
+        if newline - reader.pos > max_record_size:
+            # 換行已在緩衝區內（同一區塊讀入），仍須檢查行長
+            stats.records += 1
+            stats.malformed += 1
+            if strict:
+                raise ValueError(f"位移 {reader.position} 的記錄超過上限 {max_record_size} 位元組")
+            stats.bytes += min(newline + 1, len(reader.buf)) - reader.pos
+            reader.pos = min(newline + 1, len(reader.buf))
+            scanned = 0
+            continue
+        line = reader.take(newline - reader.pos)
+        stats.bytes += len(line)
+        if newline < len(reader.buf):
+            reader.pos += 1
+            stats.bytes += 1
+        scanned = 0
+        if line.strip():
+            yield line
+
+
+def _framed_records(reader: _ChunkReader, max_record_size: int, stats: SIC_StreamStats,
+                    strict: bool) -> Iterator[bytes]:
+    while reader.fill(RECORD_LENGTH.size):
+        start = reader.position
+        (size,) = RECORD_LENGTH.unpack_from(reader.buf, reader.pos)
+        reader.pos += RECORD_LENGTH.size
+        stats.bytes += RECORD_LENGTH.size
+        if size > max_record_size:
+            stats.records += 1
+            stats.malformed += 1
+            if strict:
+                raise ValueError(f"位移 {start} 的記錄超過上限 {max_record_size} 位元組: {size}")
+            # 長度已知，略過後即可重新同步
+            stats.bytes += reader.skip(size)
+            continue
+        if not reader.fill(size):
+            stats.records += 1
+            stats.malformed += 1
+            stats.bytes += reader.available
+            if strict:
+                raise ValueError(f"位移 {start} 的記錄截斷")
+            return
+        stats.bytes += size
+        yield reader.take(size)
+
+
+def _detect_format(reader: _ChunkReader) -> SIC_StreamFormat:
+    head = RECORD_LENGTH.size + len(SIC_FRAME_MAGIC)
+    reader.fill(head)
+    if bytes(reader.buf[reader.pos + RECORD_LENGTH.size:reader.pos + head]) == SIC_FRAME_MAGIC:
+        return SIC_StreamFormat.FRAMED
+    return SIC_StreamFormat.NDJSON
+
+
+def _parse_record(record: bytes, fmt: SIC_StreamFormat, decode: bool) -> StreamItem:
+    if fmt is SIC_StreamFormat.NDJSON:
+        return SIC_Packet.from_json(record)
+    frame = decode_frame(record)
+    if frame.size != len(record):
+        raise ValueError(f"訊框長度 {frame.size} 與記錄長度 {len(record)} 不符")
+    return frame.to_packet() if decode else frame
+
+
+def _iter_records(fileobj: BinaryIO, fmt: Optional[SIC_StreamFormat], decode: bool,
+                  stats: SIC_StreamStats, strict: bool, chunk_size: int,
+                  max_record_size: int) -> Iterator[StreamItem]:
+    reader = _ChunkReader(fileobj, chunk_size)
+    if fmt is None:
+        fmt = _detect_format(reader)
+    if fmt is SIC_StreamFormat.NDJSON and not decode:
+        raise ValueError("NDJSON 串流無法輸出未解碼的訊框")
+    split = _ndjson_records if fmt is SIC_StreamFormat.NDJSON else _framed_records
+
+    for record in split(reader, max_record_size, stats, strict):
+        stats.records += 1
+        try:
+            item = _parse_record(record, fmt, decode)
+        except Exception as e:
+            stats.malformed += 1
+            if strict:
+                raise ValueError(f"第 {stats.records} 筆記錄無法解析: {e}") from e
+            continue
+        yield item
+
+
+def iter_packets(
+    fileobj: BinaryIO,
+    fmt: Optional[SIC_StreamFormat] = None,
+    *,
+    handler: Optional[SIC_PKT_Handler] = None,
+    decode: bool = True,
+    stats: Optional[SIC_StreamStats] = None,
+    strict: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_record_size: int = DEFAULT_MAX_RECORD_SIZE
+) -> Iterator[StreamItem]:
+    """
+    逐筆讀取封包串流
+
+    緩衝區最多保留 max_record_size + chunk_size 位元組，與串流長度無關
+
+    Args:
+        fileobj: 二進位檔案物件（只需 read）
+        fmt: 記錄格式；None 時依開頭自動辨識
+        handler: 提供時串接驗證階段，只輸出通過驗證的封包
+        decode: False 時 FRAMED 串流輸出 SIC_Frame（不解碼載荷）
+        stats: 累計指標（就地更新）
+        strict: True 時遇到無效記錄拋出 ValueError；False 時計數後略過
+        chunk_size: 每次讀取的位元組數
+        max_record_size: 單筆記錄上限
+
+    Raises:
+        ValueError: 嚴格模式下記錄無法解析、截斷或超過上限；
+            NDJSON 串流指定 decode=False
+    """
+    if chunk_size <= 0 or max_record_size <= 0:
+        raise ValueError("chunk_size 與 max_record_size 必須為正數")
+    stats = stats if stats is not None else SIC_StreamStats()
+    items = _iter_records(fileobj, fmt, decode, stats, strict, chunk_size, max_record_size)
+    if handler is not None:
+        items = validate_stream(items, handler, stats)
+    return items
+
+
+def validate_stream(
+    items: Iterable[StreamItem],
+    handler: SIC_PKT_Handler,
+    stats: Optional[SIC_StreamStats] = None
+) -> Iterator[StreamItem]:
+    """
+    驗證階段：只輸出通過驗證的封包 / 訊框，失敗依錯誤碼計入 stats.rejected
+
+    訊框以 validate_frame 驗證（SHV 直接對載荷位元組計算）
+    """
+    for item in items:
+        if isinstance(item, SIC_Frame):
+            valid, error = handler.validate_frame(item)
+        else:
+            valid, error = handler.validate_packet(item)
+        if valid:
+            yield item
+        elif stats is not None:
+            stats.rejected[error.value] = stats.rejected.get(error.value, 0) + 1
+
+
+def encode_record(item: StreamItem, fmt: SIC_StreamFormat) -> bytes:
+    """將封包 / 訊框編碼為一筆記錄（NDJSON 一行，或長度前綴 + 訊框）"""
+    if fmt is SIC_StreamFormat.NDJSON:
+        if isinstance(item, SIC_Frame):
+            item = item.to_packet()
+        return item.to_json().encode("utf-8") + b"\n"
+    if isinstance(item, SIC_Frame):
+        data = encode_frame_header(item.header, item.payload_size) + item.payload
+    else:
+        data = encode_frame(item)
+    return RECORD_LENGTH.pack(len(data)) + data
+
+
+def write_packets(
+    fileobj: BinaryIO,
+    packets: Iterable[StreamItem],
+    fmt: SIC_StreamFormat = SIC_StreamFormat.NDJSON,
+    *,
+    buffer_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """
+    逐筆寫出封包串流
+
+    編碼後的記錄累積至 buffer_size 才寫入；超過緩衝區的記錄直接寫入
+
+    Args:
+        fileobj: 二進位檔案物件（只需 write）
+        packets: SIC_Packet 或 SIC_Frame 的可迭代物件（可為產生器）
+        fmt: 記錄格式
+        buffer_size: 寫入緩衝區大小
+
+    Returns:
+        寫出的記錄數
+    """
+    out = bytearray()
+    count = 0
+    for item in packets:
+        record = encode_record(item, fmt)
+        count += 1
+        if len(out) + len(record) > buffer_size and out:
+            fileobj.write(out)
+            out.clear()
+        if len(record) >= buffer_size:
+            fileobj.write(record)
+        else:
+            out += record
+    if out:
+        fileobj.write(out)
+    return count
@@ -0,0 +1,471 @@
+"""
+SIC-Transport — SIC 封包的 asyncio 傳輸層
+
+USCA 協議棧位置: L2 (Network Layer，行程間傳輸)
+類比: TCP 上的 HTTP/1.1 管線化
+
+線路格式與 sic_stream 的 FRAMED 相同：u32 little-endian 長度前綴 + 二進位訊框。
+每個請求訊框恰有一個回應訊框，同一連線上依送出順序回應，因此用戶端
+可不等回應連續送出（管線化）。
+
+- SIC_Server: TCP / Unix socket 伺服器，每條連線一個 SIC_PKT_Handler，
+  驗證失敗回 ERROR 封包，通過驗證的訊框交給 on_packet 產生回應
+- SIC_Client: 連線池（依未完成請求數選連線，不足時新增至 pool_size）
+
+背壓（high / low watermark）:
+
+- 寫入緩衝區超過 high_watermark 時 drain() 暫停，降到 low_watermark 才繼續
+  （transport.set_write_buffer_limits）；伺服器暫停期間不讀取，TCP 流量控制
+  再把壓力傳回用戶端
+- 用戶端每條連線未確認的位元組達 high_watermark（或請求數達 max_in_flight）
+  時暫停送出，降到 low_watermark 才恢復
+
+版本: 1.0.0
+"""
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from core.canonical import encoding_scope
+
+from .sic_pkt import (
+    SIC_Frame,
+    SIC_Header,
+    SIC_Packet,
+    SIC_PKT_Error,
+    SIC_PKT_Handler,
+    SIC_PKT_Type,
+    decode_frame,
+)
+from .sic_stream import DEFAULT_MAX_RECORD_SIZE, RECORD_LENGTH, SIC_StreamFormat, encode_record
+
+Reply = Union[SIC_Packet, SIC_Frame, None]
+PacketCallback = Callable[[SIC_Frame, SIC_PKT_Handler], Union[Reply, Awaitable[Reply]]]
+
+
+@dataclass
+class SIC_TransportConfig:
+    """傳輸設定"""
+    high_watermark: int = 1024 * 1024       # 暫停寫入 / 送出的門檻（位元組）
+    low_watermark: int = 256 * 1024         # 恢復的門檻（位元組）
+    max_frame_size: int = DEFAULT_MAX_RECORD_SIZE
+    max_in_flight: int = 128                # 每條連線未完成的請求數上限
+    pool_size: int = 4                      # 用戶端連線池大小
+
+    def __post_init__(self):
+        if not 0 <= self.low_watermark <= self.high_watermark:
+            raise ValueError("需滿足 0 ≤ low_watermark ≤ high_watermark")
+        if self.max_frame_size <= 0 or self.max_in_flight <= 0 or self.pool_size <= 0:
+            raise ValueError("max_frame_size、max_in_flight 與 pool_size 必須為正數")
+
+
+@dataclass
+class SIC_TransportStats:
+    """傳輸指標"""
+    connections: int = 0        # 建立過的連線數
+    frames_in: int = 0
+    frames_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    pauses: int = 0             # 因背壓暫停的次數
+    protocol_errors: int = 0    # 訊框超過上限、回應無效或連線中途截斷
+    rejected: Dict[str, int] = field(default_factory=dict)  # ERROR 回應，依錯誤碼
+
+    def to_dict(self) -> Dict:
+        return {
+            "connections": self.connections,
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "pauses": self.pauses,
+            "protocol_errors": self.protocol_errors,
+            "rejected": dict(self.rejected)
+        }
+
+
+async def _read_frame(reader: asyncio.StreamReader, max_frame_size: int) -> Optional[bytes]:
+    """
+    讀取一個長度前綴記錄（對方在記錄邊界關閉時回傳 None）
+
+    Raises:
+        asyncio.IncompleteReadError: 記錄中途截斷
+        ValueError: 記錄超過上限
+    """
+    try:
+        prefix = await reader.readexactly(RECORD_LENGTH.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise
+        return None
+    (size,) = RECORD_LENGTH.unpack(prefix)
+    if size > max_frame_size:
+        raise ValueError(f"訊框超過上限 {max_frame_size} 位元組: {size}")
+    return await reader.readexactly(size)
+
+
+class SIC_Server:
+    """
+    SIC 封包伺服器
+
+    每條連線循序處理請求：解析訊框 → handler.validate_frame →
+    on_packet(frame, handler) → 寫回應 → drain()（超過 high watermark 時等待）
+
+    on_packet 可為一般函式或協程，回傳 SIC_Packet / SIC_Frame；
+    回傳 None 或未提供時回覆 RESPONSE 封包 {"ack": 請求 SID}。
+    on_packet 拋出例外（或回應無法編碼）時回覆 HANDLER_ERROR 的 ERROR 封包
+
+    每個請求的 on_packet 在 encoding_scope() 內執行：FW / SIG / compliance
+    等階段對同一個 payload 物件只序列化一次。因此 on_packet 不可就地修改
+    已交給這些階段的 payload（需修改時建立新物件）
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        on_packet: Optional[PacketCallback] = None,
+        config: Optional[SIC_TransportConfig] = None,
+        handler_factory: Optional[Callable[[], SIC_PKT_Handler]] = None
+    ):
+        self.model_id = model_id
+        self.config = config or SIC_TransportConfig()
+        self.stats = SIC_TransportStats()
+        self._on_packet = on_packet
+        self._handler_factory = handler_factory or (lambda: SIC_PKT_Handler(model_id))
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> "SIC_Server":
+        """開始監聽 TCP（port=0 時由系統指定，見 address）"""
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self
+
+    async def start_unix(self, path: str) -> "SIC_Server":
+        """開始監聽 Unix socket"""
+        self._server = await asyncio.start_unix_server(self._serve, path)
+        return self
+
+    @property
+    def address(self) -> Any:
+        """監聽位址：TCP 為 (host, port)，Unix socket 為路徑"""
+        if self._server is None or not self._server.sockets:
+            raise RuntimeError("伺服器尚未啟動")
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise RuntimeError("伺服器尚未啟動")
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """停止監聽並關閉所有連線"""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*self._connections.values(), return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "SIC_Server":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        config = self.config
+        writer.transport.set_write_buffer_limits(high=config.high_watermark, low=config.low_watermark)
+        handler = self._handler_factory()
+        self.stats.connections += 1
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    data = await _read_frame(reader, config.max_frame_size)
+                except (asyncio.IncompleteReadError, ValueError):
+                    self.stats.protocol_errors += 1
+                    break
+                if data is None:
+                    break
+                self.stats.frames_in += 1
+                self.stats.bytes_in += RECORD_LENGTH.size + len(data)
+
+                reply = await self._process(handler, data)
+                writer.write(reply)
+                self.stats.frames_out += 1
+                self.stats.bytes_out += len(reply)
+                if writer.transport.get_write_buffer_size() > config.high_watermark:
+                    self.stats.pauses += 1
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _process(self, handler: SIC_PKT_Handler, data: bytes) -> bytes:
+        """處理一個請求，回傳編碼後的回應記錄（每個請求恰好一個回應）"""
+        try:
+            frame = decode_frame(data)
+            if frame.size != len(data):
+                raise ValueError(f"訊框長度 {frame.size} 與記錄長度 {len(data)} 不符")
+        except ValueError as e:
+            return self._reject(handler, SIC_Packet(header=SIC_Header(SHV="", SID=""), payload={}),
+                                SIC_PKT_Error.INVALID_FORMAT, str(e))
+
+        valid, error = handler.validate_frame(frame)
+        if not valid:
+            return self._reject(handler, frame, error)
+
+        # on_packet 或其回應的例外轉為 ERROR 回應，不中斷連線上其餘管線化的請求
+        try:
+            with encoding_scope():
+                reply = self._on_packet(frame, handler) if self._on_packet is not None else None
+                if inspect.isawaitable(reply):
+                    reply = await reply
+                if reply is None:
+                    reply = handler.create_packet(
+                        {"ack": frame.header.SID},
+                        dst_model=frame.header.src_model,
+                        pkt_type=SIC_PKT_Type.RESPONSE
+                    )
+                return encode_record(reply, SIC_StreamFormat.FRAMED)
+        except Exception as e:
+            return self._reject(handler, frame, SIC_PKT_Error.HANDLER_ERROR, f"{type(e).__name__}: {e}")
+
+    def _reject(self, handler: SIC_PKT_Handler, original: Union[SIC_Packet, SIC_Frame],
+                error: SIC_PKT_Error, message: str = "") -> bytes:
+        self.stats.rejected[error.value] = self.stats.rejected.get(error.value, 0) + 1
+        return encode_record(handler.create_error_packet(original, error, message), SIC_StreamFormat.FRAMED)
+
+
+class _Connection:
+    """用戶端連線：管線化的請求以 FIFO 對應回應"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 config: SIC_TransportConfig, stats: SIC_TransportStats):
+        self.reader = reader
+        self.writer = writer
+        self.config = config
+        self.stats = stats
+        self.pending: Deque[Tuple[asyncio.Future, int]] = deque()
+        self.in_flight_bytes = 0
+        self.closed = False
+        self._writable = asyncio.Event()
+        self._writable.set()
+        writer.transport.set_write_buffer_limits(high=config.high_watermark, low=config.low_watermark)
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_replies())
+
+    def _saturated(self) -> bool:
+        return (self.in_flight_bytes >= self.config.high_watermark
+                or len(self.pending) >= self.config.max_in_flight)
+
+    async def request(self, data: bytes) -> SIC_Frame:
+        if self.closed:
+            raise ConnectionError("連線已關閉")
+        while self._saturated():
+            self._writable.clear()
+            self.stats.pauses += 1
+            await self._writable.wait()
+            if self.closed:
+                raise ConnectionError("連線已關閉")
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((future, len(data)))
+        self.in_flight_bytes += len(data)
+        self.writer.write(data)
+        self.stats.frames_out += 1
+        self.stats.bytes_out += len(data)
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass                # 讀取端關閉連線時會以例外完成 future
+        return await future
+
+    async def _read_replies(self) -> None:
+        error: BaseException = ConnectionError("伺服器關閉連線")
+        try:
+            while True:
+                data = await _read_frame(self.reader, self.config.max_frame_size)
+                if data is None:
+                    break
+                self.stats.frames_in += 1
+                self.stats.bytes_in += RECORD_LENGTH.size + len(data)
+                if not self.pending:
+                    self.stats.protocol_errors += 1
+                    error = ConnectionError("收到未對應請求的回應")
+                    break
+                # 先解碼再取出 future：回應無效時該請求與其餘請求一同以例外完成
+                frame = decode_frame(data)
+                if frame.size != len(data):
+                    raise ValueError(f"訊框長度 {frame.size} 與記錄長度 {len(data)} 不符")
+                future, size = self.pending.popleft()
+                self.in_flight_bytes -= size
+                if not future.done():
+                    future.set_result(frame)
+                if (self.in_flight_bytes <= self.config.low_watermark
+                        and len(self.pending) < self.config.max_in_flight):
+                    self._writable.set()
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            self.stats.protocol_errors += 1
+            error = ConnectionError(f"回應訊框無效: {e}")
+        except ConnectionError as e:
+            error = ConnectionError(f"連線中斷: {e}")
+        finally:
+            self._shutdown(error)
+
+    def _shutdown(self, error: BaseException) -> None:
+        self.closed = True
+        while self.pending:
+            future, _ = self.pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+        self.in_flight_bytes = 0
+        self._writable.set()
+        self.writer.close()
+
+    async def close(self) -> None:
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class SIC_Client:
+    """
+    SIC 封包用戶端（連線池 + 管線化）
+
+    send() 可並行呼叫：請求送往未完成請求最少的連線，所有連線都忙碌且
+    未達 pool_size 時新增連線；同一連線上的請求不等回應即送出
+
+    用法:
+        async with SIC_Client(port=port) as client:
+            reply = await client.send(pkt)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        *,
+        path: Optional[str] = None,
+        config: Optional[SIC_TransportConfig] = None
+    ):
+        if (port is None) == (path is None):
+            raise ValueError("需指定 port（TCP）或 path（Unix socket）其中之一")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.config = config or SIC_TransportConfig()
+        self.stats = SIC_TransportStats()
+        self._connections: List[_Connection] = []
+        self._lock = asyncio.Lock()
+
+    async def send(self, item: Union[SIC_Packet, SIC_Frame]) -> SIC_Frame:
+        """
+        送出封包 / 訊框，回傳伺服器的回應訊框
+
+        驗證失敗時回應為 ERROR 類型封包（header.pkt_type）
+
+        Raises:
+            ConnectionError: 連線在回應前中斷
+        """
+        data = encode_record(item, SIC_StreamFormat.FRAMED)
+        connection = await self._acquire()
+        return await connection.request(data)
+
+    async def send_many(self, items: List[Union[SIC_Packet, SIC_Frame]]) -> List[SIC_Frame]:
+        """並行送出多個封包，回應依輸入順序"""
+        return list(await asyncio.gather(*(self.send(item) for item in items)))
+
+    async def close(self) -> None:
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            connection._shutdown(ConnectionError("用戶端已關閉"))
+        for connection in connections:
+            await connection.close()
+
+    async def __aenter__(self) -> "SIC_Client":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _acquire(self) -> _Connection:
+        async with self._lock:
+            self._connections = [c for c in self._connections if not c.closed]
+            best = min(self._connections, key=lambda c: len(c.pending), default=None)
+            if best is None or (best.pending and len(self._connections) < self.config.pool_size):
+                best = await self._open()
+                self._connections.append(best)
+            return best
+
+    async def _open(self) -> _Connection:
+        if self.path is not None:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.stats.connections += 1
+        return _Connection(reader, writer, self.config, self.stats)
+
+
+def latency_percentiles(samples: List[float], percentiles=(50, 90, 99)) -> Dict[str, float]:
+    """延遲樣本（秒）的百分位數，單位毫秒"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{p}": 0.0 for p in percentiles}
+    return {
+        f"p{p}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1e3
+        for p in percentiles
+    }
+
+
+async def run_load(
+    client: SIC_Client,
+    packets: List[SIC_Packet],
+    concurrency: int = 64
+) -> Dict:
+    """
+    迴路負載產生器：以 concurrency 個並行送出者送完 packets
+
+    Returns:
+        {"packets", "seconds", "packets_per_sec", "errors", "latency_ms": {p50, p90, p99}}
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency 必須為正數")
+    queue = iter(packets)
+    latencies: List[float] = []
+    errors = 0
+
+    async def sender():
+        nonlocal errors
+        for pkt in queue:
+            start = time.perf_counter()
+            reply = await client.send(pkt)
+            latencies.append(time.perf_counter() - start)
+            errors += reply.header.pkt_type is SIC_PKT_Type.ERROR
+
+    start = time.perf_counter()
+    await asyncio.gather(*(sender() for _ in range(min(concurrency, len(packets)))))
+    elapsed = time.perf_counter() - start
+    return {
+        "packets": len(latencies),
+        "seconds": elapsed,
+        "packets_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "latency_ms": latency_percentiles(latencies)
+    }